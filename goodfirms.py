@@ -10,63 +10,2467 @@ This version fixes:
 Requirements:
 pip install playwright pandas openpyxl
 playwright install chromium
+
+Optional (Parquet export):
+pip install pyarrow
+
+Optional (HTTP-first fetching of company profiles):
+pip install "httpx[http2]" selectolax
+
+Optional (smaller, faster raw-HTML snapshot archive):
+pip install zstandard
+
+Optional (browser memory in the RSS watchdog; without it only this process is watched):
+pip install psutil
 """
 
 import asyncio
+import hashlib
 import json
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
 import time
 import re
+import sys
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Set, Tuple
+from itertools import islice
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
 
+import numpy as np
 import pandas as pd
 from playwright.async_api import async_playwright, Page, Locator
 
+try:
+    import httpx
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # HTTP-first fetching is optional; the browser path still works without it
+    httpx = None
+    HTMLParser = None
+
+try:
+    import zstandard
+except ImportError:  # Snapshots fall back to zlib, which is slower and larger
+    zstandard = None
+
+try:
+    import psutil
+except ImportError:  # The memory watchdog then only sees this process, via /proc
+    psutil = None
+
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'ref', 'source', 'src'}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so the same page always maps to one key"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.lower().rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'https', parts.netloc.lower(), path, urlencode(query), ''))
+
+
+# Resource types and URL patterns the extraction JS never needs
+DEFAULT_BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    r'google-analytics\.com', r'googletagmanager\.com', r'doubleclick\.net',
+    r'googlesyndication\.com', r'adservice\.google', r'facebook\.(net|com)/tr',
+    r'connect\.facebook\.net', r'hotjar\.com', r'clarity\.ms', r'linkedin\.com/px',
+    r'snap\.licdn\.com', r'bing\.com/bat', r'intercom(cdn)?\.io', r'hs-scripts\.com',
+]
+# Blocked requests are never downloaded, so savings are estimated from typical sizes
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 40_000, 'media': 250_000, 'font': 35_000, 'stylesheet': 30_000,
+    'script': 60_000, 'xhr': 5_000, 'fetch': 5_000,
+}
+
+
+class ResourceBlocker:
+    """Abort requests for resources the extraction never reads, with per-page savings"""
+
+    def __init__(self, resource_types: Optional[Set[str]] = None, url_patterns: Optional[List[str]] = None):
+        self.resource_types = set(DEFAULT_BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.url_patterns = [re.compile(p) for p in (DEFAULT_BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns)]
+        self.page_stats: Dict[int, Dict[str, int]] = {}
+        self.total_requests = 0
+        self.total_bytes = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        return resource_type in self.resource_types or any(p.search(url) for p in self.url_patterns)
+
+    async def attach(self, page: Page):
+        """Route every request of this page through the deny-list"""
+        stats = self.page_stats.setdefault(id(page), {'requests': 0, 'bytes': 0})
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                saved = ESTIMATED_RESOURCE_BYTES.get(request.resource_type, 10_000)
+                stats['requests'] += 1
+                stats['bytes'] += saved
+                self.total_requests += 1
+                self.total_bytes += saved
+                await route.abort()
+            else:
+                await route.fallback()  # Let other handlers (e.g. the page cache) see it
+
+        await page.route("**/*", handle)
+
+    def take_page_stats(self, page: Page) -> Dict[str, int]:
+        """Return and reset what was blocked on this page since the last call"""
+        stats = self.page_stats.get(id(page), {'requests': 0, 'bytes': 0})
+        taken = dict(stats)
+        stats['requests'] = stats['bytes'] = 0
+        return taken
+
+    def detach(self, page: Page):
+        self.page_stats.pop(id(page), None)
+
+
+# Something that only exists once review/listing content has rendered
+REVIEW_CONTAINER_SELECTOR = '[class*="review"], [class*="testimonial"], [class*="feedback"]'
+LISTING_CONTAINER_SELECTOR = 'a[href*="/company/"]'
+
+# Resolves once the DOM has gone quietMs without mutations, or after maxMs regardless
+MUTATION_QUIET_JS = """
+    ([quietMs, maxMs]) => new Promise(resolve => {
+        let quietTimer = null;
+        let hardTimer = null;
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => done('quiet'), quietMs);
+        });
+        const done = (reason) => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(hardTimer);
+            resolve(reason);
+        };
+        observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        quietTimer = setTimeout(() => done('quiet'), quietMs);
+        hardTimer = setTimeout(() => done('timeout'), maxMs);
+    })
+"""
+
+
+# Step through the page a screen at a time, giving IntersectionObserver-driven lazy loading a
+# couple of frames (and a short pause) at each stop, then end at the bottom like the original scroll
+INCREMENTAL_SCROLL_JS = """
+    async () => {
+        const frames = () => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+        const pause = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+        const step = Math.max(300, Math.floor(window.innerHeight * 0.8));
+        for (let y = 0, stops = 0; y < document.body.scrollHeight && stops < 40; y += step, stops++) {
+            window.scrollTo(0, y);
+            await frames();
+            await pause(50);
+        }
+        window.scrollTo(0, document.body.scrollHeight);
+        await frames();
+    }
+"""
+
+
+# Company profile links on a listing page (any host, so saved fixtures work too): only /company/<slug>,
+# without query or fragment, so review/portfolio sub-pages and ?tab= variants don't queue the same
+# company twice; plus whether a link to the next page exists
+LISTING_LINKS_JS = """
+    (nextPage) => {
+        const links = new Set();
+        const host = location.hostname.replace(/^www\\./, '');
+        const profilePath = /^\\/company\\/[^\\/]+\\/?$/;
+        document.querySelectorAll('a').forEach(a => {
+            if (a.href && a.hostname.replace(/^www\\./, '') === host && profilePath.test(a.pathname)) {
+                links.add(a.origin + a.pathname);
+            }
+        });
+        
+        const hasNext = !!document.querySelector('a[rel="next"]') ||
+            Array.from(document.querySelectorAll('a[href*="page="]'))
+                .some(a => new URL(a.href).searchParams.get('page') === String(nextPage));
+        
+        return {links: Array.from(links), hasNext: hasNext};
+    }
+"""
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+EMPLOYEE_SIZE_PATTERN = re.compile(r'\d+\s*-\s*\d+|\d+\+|<\s*\d+|>\s*\d+')
+RATING_PATTERN = re.compile(r'\d+\.?\d*')
+DATE_PATTERN = re.compile(r'\d{4}|\d{1,2}/\d{1,2}/\d{2,4}|[A-Z][a-z]+\s+\d{4}')
+REVIEW_COUNT_PATTERN = re.compile(r'(\d[\d,]*)\s+reviews?\b', re.IGNORECASE)
+BUDGET_PATTERN = re.compile(r'\$[\d,]+\s*-?\s*\$?[\d,]*|\$[\d,]+\+?')
+
+
+def parse_reviewer_info(text: str) -> Dict[str, str]:
+    """Split "Name, Position at Company" style reviewer text (same rules as the page JS)"""
+    result = {'name': '', 'position': '', 'company': ''}
+    if not text:
+        return result
+    text = text.strip()
+    
+    # Pattern 1: "John Doe, CEO at Company Name"
+    match = re.match(r'^([^,]+),\s*(.+?)\s+at\s+(.+)$', text, re.IGNORECASE | re.DOTALL)
+    if match:
+        result['name'], result['position'], result['company'] = (g.strip() for g in match.groups())
+        return result
+    
+    # Pattern 2: "John Doe | CEO | Company Name"
+    parts = [p.strip() for p in text.split('|') if p.strip()]
+    if len(parts) >= 3:
+        result['name'], result['position'], result['company'] = parts[:3]
+        return result
+    
+    # Pattern 3: "John Doe, CEO, Company Name"
+    comma_parts = [p.strip() for p in text.split(',') if p.strip()]
+    for key, value in zip(('name', 'position', 'company'), comma_parts[:3]):
+        result[key] = value
+    if not comma_parts:
+        result['name'] = text
+    return result
+
+
+def node_text(node) -> str:
+    """Approximate innerText: one line per text node, trimmed"""
+    if node is None:
+        return ''
+    return node.text(separator='\n', strip=True).strip()
+
+
+def css_first(root, selector: str):
+    """css_first that treats selectors the parser can't handle as no match"""
+    try:
+        return root.css_first(selector)
+    except Exception:
+        return None
+
+
+def css_all(root, selector: str) -> list:
+    try:
+        return root.css(selector)
+    except Exception:
+        return []
+
+
+REVIEWER_SELECTORS = ('[class*="reviewer-name"]', '[class*="client-name"]', '[class*="author"]',
+                      'h3', 'h4', '.name', 'strong')
+
+
+def any_class(*parts):
+    return lambda tag, cls: any(part in cls for part in parts)
+
+
+def is_tag(name):
+    return lambda tag, cls: tag == name
+
+
+def has_token(token):
+    return lambda tag, cls: token in cls.split()
+
+
+# Field rules in fallback order within each field (same as the page JS cardRules)
+CARD_RULES = {
+    'reviewer': [any_class('reviewer-name'), any_class('client-name'), any_class('author'),
+                 is_tag('h3'), is_tag('h4'), has_token('name'), is_tag('strong')],
+    'location': [any_class('location', 'country')],
+    'industry': [any_class('industry', 'sector')],
+    'reviewText': [any_class('review-text'), any_class('review-content'), any_class('feedback-text'),
+                   is_tag('p'), has_token('content')],
+    'rating': [any_class('rating', 'star', 'score')],
+    'service': [any_class('service', 'category')],
+    'projectSummary': [any_class('project', 'summary')],
+    'startDate': [any_class('date', 'time')],
+    'budget': [any_class('budget', 'cost', 'price')],
+}
+
+
+def reviewer_name_of(node) -> str:
+    """First usable reviewer text inside a node, using the reviewer selector fallbacks"""
+    for selector in REVIEWER_SELECTORS:
+        text = node_text(css_first(node, selector))
+        if 2 < len(text) < 200:
+            return text
+    return ''
+
+
+def find_review_cards(tree) -> List[Tuple[Any, Dict[str, str]]]:
+    """
+    Outermost review candidates that hold exactly one distinct reviewer, with their parsed review.
+    A candidate with several reviewers is split into its inner candidates, or kept as one card
+    if none of them parses as a review.
+    """
+    candidates = css_all(tree, REVIEW_CONTAINER_SELECTOR)
+    positions = {node.mem_id: i for i, node in enumerate(candidates)}
+    children: List[List[int]] = [[] for _ in candidates]
+    roots = []
+    for i, node in enumerate(candidates):
+        parent = node.parent
+        while parent is not None and parent.mem_id not in positions:
+            parent = parent.parent
+        (children[positions[parent.mem_id]] if parent is not None else roots).append(i)
+    
+    # Distinct reviewer names within each candidate, capped at 2 (one card vs. a list of cards)
+    names_within: List[Set[str]] = [set() for _ in candidates]
+    for i in range(len(candidates) - 1, -1, -1):
+        names = names_within[i]
+        own = reviewer_name_of(candidates[i])
+        if own:
+            names.add(own)
+        for child in children[i]:
+            for name in names_within[child]:
+                if len(names) < 2:
+                    names.add(name)
+    
+    cards = []
+    
+    def take(i) -> bool:
+        review = parse_review_node(candidates[i])
+        if review is not None:
+            cards.append((candidates[i], review))
+        return review is not None
+    
+    def pick(i) -> bool:
+        if len(names_within[i]) == 1:
+            return take(i)
+        if len(names_within[i]) > 1:
+            found = [pick(child) for child in children[i]]
+            return any(found) or take(i)
+        return False
+    
+    for root in roots:
+        pick(root)
+    return cards
+
+
+def parse_review_node(review_el) -> Optional[Dict[str, str]]:
+    """Pull every review field out of one review card in a single walk, or None when it has no reviewer"""
+    first = {field: [None] * len(rules) for field, rules in CARD_RULES.items()}
+    for el in review_el.css('*'):
+        tag = el.tag
+        cls = el.attributes.get('class') or ''
+        for field, rules in CARD_RULES.items():
+            matched = first[field]
+            for rank, rule in enumerate(rules):
+                if matched[rank] is None and rule(tag, cls):
+                    matched[rank] = el
+    
+    def first_valid(elements, is_valid) -> str:
+        for el in elements:
+            text = node_text(el)
+            if is_valid(text):
+                return text
+        return ''
+    
+    def first_match(el, pattern) -> str:
+        match = pattern.search(node_text(el))
+        return match.group(0) if match else ''
+    
+    parsed = parse_reviewer_info(first_valid(first['reviewer'], lambda text: 2 < len(text) < 200))
+    if not parsed['name']:
+        return None
+    
+    return {
+        'reviewerName': parsed['name'],
+        'reviewerPosition': parsed['position'],
+        'reviewerCompany': parsed['company'],
+        'reviewerLocation': node_text(first['location'][0]),
+        'reviewerIndustry': node_text(first['industry'][0]),
+        'reviewText': first_valid(first['reviewText'], lambda text: len(text) > 20),
+        'rating': first_match(first['rating'][0], RATING_PATTERN),
+        'service': node_text(first['service'][0]),
+        'projectSummary': node_text(first['projectSummary'][0]),
+        'startDate': first_match(first['startDate'][0], DATE_PATTERN),
+        'budget': first_match(first['budget'][0], BUDGET_PATTERN),
+    }
+
+
+def parse_company_html(html: str, url: str) -> Dict[str, Any]:
+    """Python port of the extract_company_details page JS, for server-rendered HTML"""
+    tree = HTMLParser(html)
+    data = {
+        'companyName': '',
+        'website': '',
+        'location': '',
+        'employeeSize': '',
+        'services': [],
+        'reviews': [],
+        'companyUrl': url,
+    }
+    
+    for selector in ('h1.profile-header__title', 'h1[class*="company-name"]', 'h1[class*="profile"]',
+                     '.company-profile h1', 'h1'):
+        name = node_text(css_first(tree, selector))
+        if name:
+            data['companyName'] = name
+            break
+    
+    website_link = css_first(tree, 'a[href*="http"][target="_blank"]') or css_first(tree, 'a[class*="website"]')
+    if website_link is not None:
+        data['website'] = urljoin(url, website_link.attributes.get('href') or '')
+    
+    for selector in ('[class*="location"]', '[class*="address"]'):
+        text = node_text(css_first(tree, selector))
+        if 2 < len(text) < 100:
+            data['location'] = text
+            break
+    
+    for selector in ('[class*="employee"]', '[class*="team-size"]'):
+        match = EMPLOYEE_SIZE_PATTERN.search(node_text(css_first(tree, selector)))
+        if match:
+            data['employeeSize'] = match.group(0)
+            break
+    
+    services = {}
+    for el in css_all(tree, '[class*="service"], [class*="expertise"], .tag, .badge'):
+        text = node_text(el)
+        if 2 < len(text) < 100 and 'View' not in text and 'More' not in text:
+            services[text] = None
+    data['services'] = list(services)
+    
+    processed_reviews = set()
+    for _, review in find_review_cards(tree):
+        review_key = (review['reviewerName'], review['reviewText'][:50], review['rating'])
+        if review_key not in processed_reviews:
+            processed_reviews.add(review_key)
+            data['reviews'].append(review)
+    
+    # Review pagination: total review count and links to further review pages
+    for el in css_all(tree, '[class*="review-count"], [class*="reviews-count"], [class*="total-review"], h2, h3'):
+        match = REVIEW_COUNT_PATTERN.search(node_text(el))
+        if match:
+            data['reviewCount'] = int(match.group(1).replace(',', ''))
+            break
+    page_links = {}
+    for el in css_all(tree, 'a[href*="page="], [data-url*="page="], [data-href*="page="]'):
+        href = el.attributes.get('href') or el.attributes.get('data-url') or el.attributes.get('data-href')
+        if href:
+            page_links[urljoin(url, href)] = None
+    data['reviewPageUrls'] = list(page_links)
+    
+    return data
+
+
+def plan_review_page_urls(company_data: Dict[str, Any], max_pages: int = 50) -> List[str]:
+    """URLs of the review pages after the first, from pagination links and the total review count"""
+    company_url = company_data.get('companyUrl', '')
+    company_path = urlsplit(company_url).path.rstrip('/')
+    
+    # Only pagination that belongs to this company's profile/reviews, not site-wide listings
+    numbered = {}
+    for link in company_data.get('reviewPageUrls') or []:
+        parts = urlsplit(link)
+        path = parts.path.rstrip('/')
+        if path != company_path and not path.startswith(company_path + '/'):
+            continue  # e.g. /company/acme-two is not /company/acme
+        page_number = dict(parse_qsl(parts.query)).get('page', '')
+        if page_number.isdigit():
+            numbered[int(page_number)] = link
+    if not numbered:
+        return []
+    
+    last_page = max(numbered)
+    per_page = len(company_data.get('reviews') or [])
+    if company_data.get('reviewCount') and per_page:
+        last_page = max(last_page, math.ceil(company_data['reviewCount'] / per_page))
+    last_page = min(last_page, max_pages)
+    
+    # Pages beyond the visible links follow the same URL scheme with a different page number
+    template = urlsplit(numbered[max(numbered)])
+    urls = []
+    for page_number in range(2, last_page + 1):
+        if page_number in numbered:
+            urls.append(numbered[page_number])
+            continue
+        query = [(k, v) for k, v in parse_qsl(template.query) if k != 'page'] + [('page', str(page_number))]
+        urls.append(urlunsplit((template.scheme, template.netloc, template.path, urlencode(query), '')))
+    return urls
+
+
+def is_complete_company_data(company_data: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether HTTP-parsed data has everything the browser path would have found: a name, and
+    reviews unless the page itself says there are none (so such profiles aren't fetched twice)
+    """
+    if not company_data or not company_data.get('companyName'):
+        return False
+    return bool(company_data.get('reviews')) or company_data.get('reviewCount') == 0
+
+
+class PageCache:
+    """Compressed SQLite page cache keyed by canonical URL, with TTL, revalidation and LRU eviction"""
+
+    def __init__(self, path: str = 'goodfirms_cache.sqlite', ttl_seconds: float = 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path, timeout=30)  # Shard processes may share one cache file
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+    def is_fresh(self, url: str) -> bool:
+        row = self.conn.execute("SELECT fetched_at FROM pages WHERE key = ?", (self.key(url),)).fetchone()
+        return bool(row) and time.time() - row[0] < self.ttl_seconds
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry (fresh or stale) for a URL, marking it recently used"""
+        key = self.key(url)
+        row = self.conn.execute(
+            "SELECT body, content_type, etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            self.misses += 1
+            return None
+        self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        fresh = time.time() - row[4] < self.ttl_seconds
+        if fresh:
+            self.hits += 1
+        return {
+            'body': zlib.decompress(row[0]),
+            'content_type': row[1] or 'text/html; charset=utf-8',
+            'etag': row[2],
+            'last_modified': row[3],
+            'fresh': fresh,
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, body: bytes, headers: Dict[str, str]):
+        key = self.key(url)
+        headers = {k.lower(): v for k, v in headers.items()}
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        old = self.conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, canonicalize_url(url), compressed, len(compressed), headers.get('content-type'),
+             headers.get('etag'), headers.get('last-modified'), now, now)
+        )
+        self.conn.commit()
+        self.total_bytes += len(compressed) - (old[0] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def refresh(self, url: str):
+        """A 304 revalidation succeeded: restart the entry's TTL"""
+        self.revalidated += 1
+        self.conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                          (time.time(), time.time(), self.key(url)))
+        self.conn.commit()
+
+    def evict(self):
+        """Drop least recently used pages until the cache is back under 90% of its cap"""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM pages WHERE key = ?", doomed)
+        self.conn.commit()
+
+    async def attach(self, page: Page):
+        """Serve document navigations of this page from the cache, revalidating stale entries"""
+        async def handle(route):
+            request = route.request
+            if request.resource_type != 'document' or request.method != 'GET':
+                await route.fallback()
+                return
+            
+            entry = self.get(request.url)
+            if entry and entry['fresh']:
+                await route.fulfill(status=200, body=entry['body'], content_type=entry['content_type'])
+                return
+            
+            try:
+                response = await route.fetch(headers={**request.headers, **self.conditional_headers(entry)})
+            except Exception:
+                await route.fallback()
+                return
+            
+            if response.status == 304 and entry:
+                self.refresh(request.url)
+                await route.fulfill(status=200, body=entry['body'], content_type=entry['content_type'])
+                return
+            if response.status == 200:
+                self.put(request.url, await response.body(), response.headers)
+            await route.fulfill(response=response)
+
+        await page.route("**/*", handle)
+
+    def close(self):
+        self.conn.close()
+
+
+class ScrapeJournal:
+    """Append-only JSONL record of finished companies and their rows, for crash-safe resume"""
+
+    def __init__(self, path: str = 'goodfirms_journal.jsonl'):
+        self.path = path
+        self.file = None
+
+    def load(self) -> Dict[str, List[Dict[str, str]]]:
+        """Read completed companies back, ignoring a line torn by a crash mid-write"""
+        completed: Dict[str, List[Dict[str, str]]] = {}
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                completed[entry['url']] = entry['rows']
+        return completed
+
+    def open(self, resume: bool):
+        """Start appending; a fresh (non-resume) run starts a new journal"""
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def record(self, url: str, rows: List[Dict[str, str]]):
+        """Durably append one finished company before moving on"""
+        entry = {'url': canonicalize_url(url), 'rows': rows, 'at': datetime.now().isoformat(timespec='seconds')}
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class SnapshotArchive:
+    """Permanent compressed archive of every fetched company page, for re-extraction without re-crawling"""
+
+    def __init__(self, path: str = 'goodfirms_snapshots.sqlite', level: int = 10):
+        self.path = path
+        # Shard processes share one archive: WAL plus one short transaction per page keeps writers from blocking
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                company_url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                UNIQUE (url, digest)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS snapshots_company ON snapshots (company_url)")
+        self.conn.commit()
+        self.compressor = zstandard.ZstdCompressor(level=level) if zstandard else None
+        self.added = 0
+
+    def add(self, url: str, html: str, company_url: str, source: str):
+        """Store one page; an unchanged page that is already archived is not stored again"""
+        body = html.encode('utf-8')
+        compressed = self.compressor.compress(body) if self.compressor else zlib.compress(body, 6)
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO snapshots (url, company_url, source, codec, body, size, digest, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (canonicalize_url(url), canonicalize_url(company_url), source, 'zstd' if self.compressor else 'zlib',
+             compressed, len(body), hashlib.sha256(body).hexdigest(), time.time()),
+        )
+        self.conn.commit()  # Never hold the write lock across pages
+        self.added += cursor.rowcount
+
+    @staticmethod
+    def decompress(codec: str, body: bytes) -> str:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("this snapshot is zstd-compressed - pip install zstandard")
+            return zstandard.ZstdDecompressor().decompress(body).decode('utf-8')
+        return zlib.decompress(body).decode('utf-8')
+
+    def latest_ids(self) -> List[int]:
+        """Newest snapshot of every URL, grouped by company"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT MAX(id) FROM snapshots GROUP BY url ORDER BY company_url, MIN(id)"
+        )]
+
+    def load(self, ids: List[int]) -> Iterator[Tuple[int, str, str, str]]:
+        """(id, url, company_url, html) for the given snapshot ids"""
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, url, company_url, codec, body FROM snapshots WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for snapshot_id, url, company_url, codec, body in rows:
+                yield snapshot_id, url, company_url, self.decompress(codec, body)
+
+    def close(self):
+        self.conn.close()
+
+
+class HttpFetcher:
+    """Pooled keep-alive HTTP client for pages that don't need a browser"""
+
+    def __init__(self, max_connections: int = 10, timeout: float = 30.0,
+                 cache: Optional[PageCache] = None, rate_limiter: Optional['HostRateLimiter'] = None):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        options = dict(
+            limits=limits,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'text/html,application/xhtml+xml'},
+        )
+        try:
+            self.client = httpx.AsyncClient(http2=True, **options)
+        except ImportError:  # h2 not installed, HTTP/1.1 keep-alive still helps
+            self.client = httpx.AsyncClient(**options)
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """GET a page, returning its status, body and headers; fresh cache hits skip the network"""
+        entry = self.cache.get(url) if self.cache else None
+        if entry and entry['fresh']:
+            return {'status': 200, 'html': entry['body'].decode('utf-8', errors='replace'), 'headers': {}, 'cached': True}
+        
+        if self.rate_limiter:
+            await self.rate_limiter.wait(url)
+        response = await self.client.get(url, headers=PageCache.conditional_headers(entry))
+        
+        if response.status_code == 304 and entry:
+            self.cache.refresh(url)
+            return {'status': 200, 'html': entry['body'].decode('utf-8', errors='replace'), 'headers': {}, 'cached': True}
+        if response.status_code == 200 and self.cache:
+            self.cache.put(url, response.content, dict(response.headers))
+        return {'status': response.status_code, 'html': response.text, 'headers': dict(response.headers), 'cached': False}
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def normalize_review_text(text: str) -> str:
+    """Lowercase and collapse whitespace so formatting differences don't defeat dedupe"""
+    return ' '.join((text or '').lower().split())
+
+
+def simhash64(text: str) -> int:
+    """64-bit SimHash over character 4-grams; small edits flip only a few bits"""
+    shingles = [text[i:i + 4] for i in range(max(1, len(text) - 3))]
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def to_sqlite_int(value: int) -> int:
+    """SQLite integers are signed 64-bit"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class ReviewDedupeIndex:
+    """
+    Persistent review dedupe: fixed-size fingerprints in SQLite behind an in-memory Bloom filter.
+    Reviews seen during a run are only staged; commit() persists them once their rows have been
+    exported, so a crash or failed export never hides reviews from the next run.
+    """
+
+    SIMHASH_BANDS = 8  # 8 x 8-bit bands: reviews within 7 bits share at least one band
+
+    def __init__(self, path: Optional[str] = None, expected_items: int = 1_000_000,
+                 false_positive_rate: float = 0.01, near_duplicates: bool = False,
+                 max_hamming_distance: int = 6):
+        self.path = path or ':memory:'
+        self.persistent = path is not None
+        self.near_duplicates = near_duplicates
+        self.max_hamming_distance = max_hamming_distance
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (fp BLOB PRIMARY KEY) WITHOUT ROWID")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS simhash_bands (
+                scope INTEGER NOT NULL, band INTEGER NOT NULL, value INTEGER NOT NULL, simhash INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS simhash_lookup ON simhash_bands (scope, band, value)")
+        self.conn.commit()
+        self.near_duplicate_count = 0
+        # Seen this run but not yet committed
+        self.staged: Set[bytes] = set()
+        self.staged_bands: Dict[Tuple[int, int, int], List[int]] = {}
+        
+        # Bloom filter sized for the expected volume: ~10 bits per review at a 1% false positive rate
+        self.bloom_bits = max(1024, int(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.bloom_hashes = max(1, round(self.bloom_bits / expected_items * math.log(2)))
+        self.bloom = bytearray((self.bloom_bits + 7) // 8)
+        for (fp,) in self.conn.execute("SELECT fp FROM fingerprints"):
+            self.bloom_add(fp)
+
+    @staticmethod
+    def fingerprint(company_name: str, reviewer_name: str, review_text: str) -> bytes:
+        """16-byte key from company, reviewer and the first 100 chars of normalized review text"""
+        key = '\x1f'.join((
+            normalize_review_text(company_name),
+            normalize_review_text(reviewer_name),
+            normalize_review_text(review_text)[:100],
+        ))
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+    def bloom_positions(self, fp: bytes) -> Iterator[int]:
+        h1 = int.from_bytes(fp[:8], 'big')
+        h2 = int.from_bytes(fp[8:], 'big') | 1
+        return ((h1 + i * h2) % self.bloom_bits for i in range(self.bloom_hashes))
+
+    def bloom_add(self, fp: bytes):
+        for position in self.bloom_positions(fp):
+            self.bloom[position >> 3] |= 1 << (position & 7)
+
+    def bloom_contains(self, fp: bytes) -> bool:
+        return all(self.bloom[position >> 3] & 1 << (position & 7) for position in self.bloom_positions(fp))
+
+    def is_near_duplicate(self, company_name: str, review_text: str) -> bool:
+        """Whether this company already has a review within a few SimHash bits of this one"""
+        scope, simhash, bands = self.simhash_bands(company_name, review_text)
+        for band, value in enumerate(bands):
+            for candidate in self.staged_bands.get((scope, band, value), ()):
+                if bin(candidate ^ simhash).count('1') <= self.max_hamming_distance:
+                    return True
+            for (candidate,) in self.conn.execute(
+                "SELECT simhash FROM simhash_bands WHERE scope = ? AND band = ? AND value = ?", (scope, band, value)
+            ):
+                if bin((candidate & 0xFFFFFFFFFFFFFFFF) ^ simhash).count('1') <= self.max_hamming_distance:
+                    return True
+        return False
+
+    def simhash_bands(self, company_name: str, review_text: str) -> Tuple[int, int, List[int]]:
+        scope = to_sqlite_int(int.from_bytes(
+            hashlib.blake2b(normalize_review_text(company_name).encode('utf-8'), digest_size=8).digest(), 'big'))
+        simhash = simhash64(normalize_review_text(review_text))
+        width = 64 // self.SIMHASH_BANDS
+        bands = [simhash >> (band * width) & ((1 << width) - 1) for band in range(self.SIMHASH_BANDS)]
+        return scope, simhash, bands
+
+    def check_and_add(self, company_name: str, reviewer_name: str, review_text: str) -> bool:
+        """Return True for a review seen before (in this or an earlier run), else remember it"""
+        fp = self.fingerprint(company_name, reviewer_name, review_text)
+        
+        # Bloom miss means definitely new; only a Bloom hit needs the staged set or SQLite lookup
+        if self.bloom_contains(fp) and (
+            fp in self.staged or self.conn.execute("SELECT 1 FROM fingerprints WHERE fp = ?", (fp,)).fetchone()
+        ):
+            return True
+        
+        if self.near_duplicates and len(review_text) > 20 and self.is_near_duplicate(company_name, review_text):
+            self.near_duplicate_count += 1
+            return True
+        
+        self.staged.add(fp)
+        if self.near_duplicates and len(review_text) > 20:
+            scope, simhash, bands = self.simhash_bands(company_name, review_text)
+            for band, value in enumerate(bands):
+                self.staged_bands.setdefault((scope, band, value), []).append(simhash)
+        self.bloom_add(fp)
+        return False
+
+    def commit(self):
+        """Persist the reviews staged this run; call once their rows are safely exported"""
+        if not self.staged and not self.staged_bands:
+            return
+        self.conn.executemany("INSERT OR IGNORE INTO fingerprints VALUES (?)", ((fp,) for fp in self.staged))
+        self.conn.executemany(
+            "INSERT INTO simhash_bands VALUES (?, ?, ?, ?)",
+            [(scope, band, value, to_sqlite_int(simhash))
+             for (scope, band, value), simhashes in self.staged_bands.items() for simhash in simhashes]
+        )
+        self.conn.commit()
+        self.staged.clear()
+        self.staged_bands.clear()
+
+    def close(self):
+        """Close without committing: anything still staged was never exported"""
+        self.conn.close()
+
+
+# Runs in the company profile page and returns company fields plus one object per review card
+COMPANY_EXTRACTION_JS = """
+    () => {
+        // Helper function to get clean text
+        const getCleanText = (element) => {
+            if (!element) return '';
+            return element.innerText?.trim() || element.textContent?.trim() || '';
+        };
+        
+        // Helper to parse "Name, Position at Company" into separate fields
+        const parseReviewerInfo = (text) => {
+            const result = {
+                name: '',
+                position: '',
+                company: ''
+            };
+            
+            if (!text) return result;
+            
+            // Clean the text first
+            text = text.trim();
+            
+            // Pattern 1: "John Doe, CEO at Company Name"
+            const atPattern = /^([^,]+),\\s*(.+?)\\s+at\\s+(.+)$/i;
+            let match = text.match(atPattern);
+            if (match) {
+                result.name = match[1].trim();
+                result.position = match[2].trim();
+                result.company = match[3].trim();
+                return result;
+            }
+            
+            // Pattern 2: "John Doe | CEO | Company Name"
+            const parts = text.split('|').map(p => p.trim()).filter(p => p);
+            if (parts.length >= 3) {
+                result.name = parts[0];
+                result.position = parts[1];
+                result.company = parts[2];
+                return result;
+            }
+            
+            // Pattern 3: "John Doe, CEO, Company Name"
+            const commaParts = text.split(',').map(p => p.trim()).filter(p => p);
+            if (commaParts.length >= 3) {
+                result.name = commaParts[0];
+                result.position = commaParts[1];
+                result.company = commaParts[2];
+                return result;
+            } else if (commaParts.length === 2) {
+                result.name = commaParts[0];
+                result.position = commaParts[1];
+                return result;
+            } else if (commaParts.length === 1) {
+                result.name = commaParts[0];
+                return result;
+            }
+            
+            // Pattern 4: Try newline separation
+            const linePattern = /\\r?\\n/;
+            const lineParts = text.split(linePattern).map(p => p.trim()).filter(p => p);
+            if (lineParts.length >= 3) {
+                result.name = lineParts[0];
+                result.position = lineParts[1];
+                result.company = lineParts[2];
+                return result;
+            } else if (lineParts.length === 2) {
+                result.name = lineParts[0];
+                result.position = lineParts[1];
+                return result;
+            } else if (lineParts.length === 1) {
+                result.name = lineParts[0];
+                return result;
+            }
+            
+            // Default: just use as name
+            result.name = text;
+            return result;
+        };
+        
+        const data = {
+            companyName: '',
+            website: '',
+            location: '',
+            employeeSize: '',
+            services: [],
+            reviews: []
+        };
+        
+        // Extract company name
+        const nameSelectors = [
+            'h1.profile-header__title',
+            'h1[class*="company-name"]',
+            'h1[class*="profile"]',
+            '.company-profile h1',
+            'h1'
+        ];
+        
+        for (const selector of nameSelectors) {
+            const element = document.querySelector(selector);
+            if (element && getCleanText(element)) {
+                data.companyName = getCleanText(element);
+                break;
+            }
+        }
+        
+        // Extract website
+        const websiteLink = document.querySelector('a[href*="http"][target="_blank"]') ||
+                          document.querySelector('a[class*="website"]');
+        if (websiteLink) {
+            data.website = websiteLink.href || '';
+        }
+        
+        // Extract location
+        const locationSelectors = [
+            '[class*="location"]',
+            '[class*="address"]',
+            'span:has(svg[class*="location"])',
+            'div:has(svg[class*="map"])'
+        ];
+        
+        for (const selector of locationSelectors) {
+            const element = document.querySelector(selector);
+            if (element) {
+                const text = getCleanText(element);
+                if (text && text.length > 2 && text.length < 100) {
+                    data.location = text;
+                    break;
+                }
+            }
+        }
+        
+        // Extract employee size
+        const employeeSizeSelectors = [
+            '[class*="employee"]',
+            '[class*="team-size"]',
+            'span:has-text("Employees")',
+            'div:has-text("Team Size")'
+        ];
+        
+        for (const selector of employeeSizeSelectors) {
+            const element = document.querySelector(selector);
+            if (element) {
+                const text = getCleanText(element);
+                const sizePattern = /\d+\s*-\s*\d+|\d+\+|<\s*\d+|>\s*\d+/;
+                if (sizePattern.test(text)) {
+                    data.employeeSize = text.match(sizePattern)[0];
+                    break;
+                }
+            }
+        }
+        
+        // Extract services
+        const serviceElements = document.querySelectorAll('[class*="service"], [class*="expertise"], .tag, .badge');
+        const services = new Set();
+        serviceElements.forEach(el => {
+            const text = getCleanText(el);
+            if (text && text.length > 2 && text.length < 100 && !text.includes('View') && !text.includes('More')) {
+                services.add(text);
+            }
+        });
+        data.services = Array.from(services);
+        
+        // Extract reviews - pick the outermost distinct review cards first,
+        // so wrappers and their children don't each produce a (duplicate) review
+        const reviewerSelectors = [
+            '[class*="reviewer-name"]',
+            '[class*="client-name"]',
+            '[class*="author"]',
+            'h3',
+            'h4',
+            '.name',
+            'strong'
+        ];
+        const reviewerNameOf = (el) => {
+            for (const selector of reviewerSelectors) {
+                const reviewerEl = el.querySelector(selector);
+                if (reviewerEl) {
+                    const text = (reviewerEl.textContent || '').trim();
+                    if (text.length > 2 && text.length < 200) return text;
+                }
+            }
+            return '';
+        };
+        
+        // Nest the candidates by containment (querySelectorAll is in document order)
+        const candidates = Array.from(document.querySelectorAll('[class*="review"], [class*="testimonial"], [class*="feedback"]'));
+        const childCandidates = new Map(candidates.map(el => [el, []]));
+        const rootCandidates = [];
+        const stack = [];
+        for (const el of candidates) {
+            while (stack.length && !stack[stack.length - 1].contains(el)) stack.pop();
+            (stack.length ? childCandidates.get(stack[stack.length - 1]) : rootCandidates).push(el);
+            stack.push(el);
+        }
+        
+        // Distinct reviewer names inside each candidate, capped at 2 (one card vs. a list of cards)
+        const namesWithin = new Map();
+        for (let i = candidates.length - 1; i >= 0; i--) {
+            const names = new Set();
+            const own = reviewerNameOf(candidates[i]);
+            if (own) names.add(own);
+            for (const child of childCandidates.get(candidates[i])) {
+                for (const name of namesWithin.get(child)) {
+                    if (names.size < 2) names.add(name);
+                }
+            }
+            namesWithin.set(candidates[i], names);
+        }
+        
+        // Field rules, in fallback order within each field (mirrors the old per-field querySelectors)
+        const classOf = (el) => (typeof el.className === 'string' ? el.className : el.getAttribute('class')) || '';
+        const anyClass = (...parts) => (el, cls) => parts.some(part => cls.includes(part));
+        const isTag = (tag) => (el) => el.tagName === tag;
+        const hasToken = (token) => (el) => el.classList.contains(token);
+        const cardRules = {
+            reviewer: [anyClass('reviewer-name'), anyClass('client-name'), anyClass('author'),
+                       isTag('H3'), isTag('H4'), hasToken('name'), isTag('STRONG')],
+            location: [anyClass('location', 'country')],
+            industry: [anyClass('industry', 'sector')],
+            reviewText: [anyClass('review-text'), anyClass('review-content'), anyClass('feedback-text'),
+                         isTag('P'), hasToken('content')],
+            rating: [anyClass('rating', 'star', 'score')],
+            service: [anyClass('service', 'category')],
+            projectSummary: [anyClass('project', 'summary')],
+            startDate: [anyClass('date', 'time')],
+            budget: [anyClass('budget', 'cost', 'price')]
+        };
+        
+        // One walk over the card records the first element matching every rule
+        const scanCard = (card) => {
+            const first = {};
+            for (const field in cardRules) first[field] = [];
+            for (const el of card.querySelectorAll('*')) {
+                const cls = classOf(el);
+                for (const field in cardRules) {
+                    const rules = cardRules[field];
+                    for (let rank = 0; rank < rules.length; rank++) {
+                        if (!first[field][rank] && rules[rank](el, cls)) first[field][rank] = el;
+                    }
+                }
+            }
+            return first;
+        };
+        const firstValid = (elements, isValid) => {
+            for (const el of elements) {
+                const text = getCleanText(el);
+                if (el && isValid(text)) return text;
+            }
+            return '';
+        };
+        const firstMatch = (el, pattern) => {
+            const match = getCleanText(el).match(pattern);
+            return match ? match[0] : '';
+        };
+        
+        // One card's review, or null when it has no reviewer name
+        const parseCard = (card) => {
+            const first = scanCard(card);
+            const reviewerText = firstValid(first.reviewer, text => text.length > 2 && text.length < 200);
+            const parsed = parseReviewerInfo(reviewerText);
+            if (!parsed.name) {
+                return null;
+            }
+            
+            return {
+                reviewerName: parsed.name,
+                reviewerPosition: parsed.position,
+                reviewerCompany: parsed.company,
+                reviewerLocation: getCleanText(first.location[0]),
+                reviewerIndustry: getCleanText(first.industry[0]),
+                reviewText: firstValid(first.reviewText, text => text.length > 20),
+                rating: firstMatch(first.rating[0], /\\d+\\.?\\d*/),
+                service: getCleanText(first.service[0]),
+                projectSummary: getCleanText(first.projectSummary[0]),
+                startDate: firstMatch(first.startDate[0], /\\d{4}|\\d{1,2}\\/\\d{1,2}\\/\\d{2,4}|[A-Z][a-z]+\\s+\\d{4}/),
+                budget: firstMatch(first.budget[0], /\\$[\\d,]+\\s*-?\\s*\\$?[\\d,]*|\\$[\\d,]+\\+?/)
+            };
+        };
+        
+        // A card is the outermost candidate holding exactly one reviewer; a candidate with several
+        // reviewers is split into its inner candidates, or kept whole if none of them parses
+        const cardReviews = [];
+        const take = (el) => {
+            const review = parseCard(el);
+            if (review) cardReviews.push(review);
+            return !!review;
+        };
+        const pickCards = (el) => {
+            const names = namesWithin.get(el);
+            if (names.size === 1) return take(el);
+            if (names.size > 1) {
+                const found = childCandidates.get(el).map(pickCards);
+                return found.some(Boolean) || take(el);
+            }
+            return false;
+        };
+        rootCandidates.forEach(pickCards);
+        
+        const processedReviews = new Set(); // Track unique reviews
+        
+        cardReviews.forEach(review => {
+            // Create unique identifier for this review
+            const reviewKey = `${review.reviewerName}|${review.reviewText.substring(0, 50)}|${review.rating}`;
+            
+            if (!processedReviews.has(reviewKey)) {
+                processedReviews.add(reviewKey);
+                data.reviews.push(review);
+            }
+        });
+        
+        // Review pagination: total review count and links to further review pages
+        const countPattern = /(\\d[\\d,]*)\\s+reviews?\\b/i;
+        const countEl = Array.from(document.querySelectorAll('[class*="review-count"], [class*="reviews-count"], [class*="total-review"], h2, h3'))
+            .find(el => countPattern.test(getCleanText(el)));
+        const countMatch = countEl ? getCleanText(countEl).match(countPattern) : null;
+        data.reviewCount = countMatch ? parseInt(countMatch[1].replace(/,/g, ''), 10) : 0;
+        
+        const pageLinks = new Set();
+        document.querySelectorAll('a[href*="page="], [data-url*="page="], [data-href*="page="]').forEach(el => {
+            const href = el.getAttribute('href') || el.getAttribute('data-url') || el.getAttribute('data-href');
+            try {
+                pageLinks.add(new URL(href, location.href).href);
+            } catch (e) {}
+        });
+        data.reviewPageUrls = Array.from(pageLinks);
+        
+        return data;
+    }
+"""
+
+
+class HostRateLimiter:
+    """Space out navigations to the same host so concurrent workers stay polite"""
+
+    def __init__(self, requests_per_second: float = 1.0):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.next_slot: Dict[str, float] = {}
+
+    async def wait(self, url: str):
+        """Sleep until this host's next free slot, then reserve the one after it"""
+        host = urlparse(url).netloc.lower()
+        now = time.monotonic()
+        slot = max(now, self.next_slot.get(host, 0.0))
+        self.next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, url: str, seconds: float):
+        """Hold every navigation to this host for the given time (e.g. a Retry-After)"""
+        host = urlparse(url).netloc.lower()
+        self.next_slot[host] = max(self.next_slot.get(host, 0.0), time.monotonic() + seconds)
+
+
+THROTTLE_STATUSES = {429, 502, 503, 504}
+# Page titles of bot-check / block interstitials (Cloudflare and friends)
+CHALLENGE_TITLES = ('just a moment', 'attention required', 'access denied', 'are you a robot',
+                    'security check', 'please verify you are a human')
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def is_challenge_title(title: str) -> bool:
+    title = (title or '').strip().lower()
+    return any(title.startswith(marker) for marker in CHALLENGE_TITLES)
+
+
+def looks_like_challenge(html: str) -> bool:
+    """Whether fetched HTML is a bot-check page rather than the page asked for"""
+    match = TITLE_PATTERN.search((html or '')[:20000])
+    return bool(match) and is_challenge_title(match.group(1))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After in seconds (only the delta-seconds form is honoured)"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+# Statuses that will not change on retry; anything else failing is worth another attempt
+PERMANENT_STATUSES = {400, 401, 404, 405, 410, 451}
+
+
+class PageStatusError(Exception):
+    """A page answered with an error status instead of its content"""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.permanent = status in PERMANENT_STATUSES
+
+
+class ChallengePageError(Exception):
+    """A bot-check interstitial was served instead of the page"""
+
+
+class RetryQueue:
+    """
+    Dead-letter queue of companies whose extraction failed, keyed by canonical URL.
+    Each entry keeps the error class and message of every attempt, so the retry pass
+    can skip permanent failures and the report can group what never recovered.
+    """
+
+    def __init__(self, max_attempts: int = 4):
+        self.max_attempts = max_attempts  # Including the first, main-pass attempt
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.recovered: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, url: str, error: BaseException, index: int):
+        entry = self.entries.setdefault(canonicalize_url(url), {
+            'url': url, 'index': index, 'attempts': 0, 'errors': [],
+        })
+        entry['attempts'] += 1
+        entry['error'] = type(error).__name__
+        entry['message'] = str(error)[:200]
+        entry['permanent'] = bool(getattr(error, 'permanent', False))
+        entry['errors'].append({'error': entry['error'], 'message': entry['message'],
+                                'at': datetime.now().isoformat(timespec='seconds')})
+
+    def resolve(self, url: str):
+        """Drop a company that succeeded on retry"""
+        if self.entries.pop(canonicalize_url(url), None) is not None:
+            self.recovered.append(url)
+
+    def retryable(self) -> List[Dict[str, Any]]:
+        """Entries still worth another attempt, in discovery order"""
+        return sorted((entry for entry in self.entries.values()
+                       if not entry['permanent'] and entry['attempts'] < self.max_attempts),
+                      key=lambda entry: entry['index'])
+
+    def failures(self) -> List[Dict[str, Any]]:
+        """Everything left once retries are over, in discovery order"""
+        return sorted(self.entries.values(), key=lambda entry: entry['index'])
+
+    def by_error(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry['error']] = counts.get(entry['error'], 0) + 1
+        return counts
+
+    def write(self, path: str, listing_pages: Optional[List[Dict[str, Any]]] = None):
+        """Write the permanent failures (and listing pages that never loaded) as JSON for a later run or a human"""
+        report: Dict[str, Any] = {'recovered': self.recovered, 'failed': self.failures()}
+        if listing_pages:
+            report['failed_listing_pages'] = listing_pages
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+class AdaptiveRateController:
+    """
+    AIMD politeness: while responses stay fast and clean, add a worker, shorten the
+    per-company pause and raise the per-host request rate one step at a time; on a
+    throttling status, a challenge page, a latency spike or a run of failed requests
+    (timeouts, resets, server errors), halve the workers and the request rate and
+    double the pause. The configured requests_per_second is the starting rate, which
+    may grow to max_rate_factor times itself. Every decision is logged.
+    """
+
+    def __init__(self, max_concurrency: int = 4, delay: float = 2.0, adaptive: bool = True,
+                 min_delay: float = 0.25, max_delay: float = 60.0, delay_step: float = 0.25,
+                 backoff: float = 0.5, latency_factor: float = 3.0, cooldown: float = 10.0,
+                 rate_limiter: Optional[HostRateLimiter] = None, metrics: Optional['RunMetrics'] = None,
+                 max_rate_factor: float = 4.0, min_rate_factor: float = 1 / 16, error_limit: int = 3):
+        self.adaptive = adaptive
+        self.max_concurrency = max(1, max_concurrency)
+        # Start at half speed and earn the rest; a fixed controller just runs at the configured values
+        self.limit = max(1, self.max_concurrency // 2) if adaptive else self.max_concurrency
+        self.delay = delay
+        self.min_delay = min(min_delay, delay)
+        self.max_delay = max(max_delay, delay)
+        self.delay_step = delay_step
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.rate_limiter = rate_limiter
+        # Per-host requests/second the limiter is driven at (None: the limiter is unlimited and left alone)
+        base_rate = 1.0 / rate_limiter.min_interval if rate_limiter and rate_limiter.min_interval else None
+        self.rate = base_rate
+        self.rate_step = base_rate * 0.25 if base_rate else 0.0
+        self.max_rate = base_rate * max_rate_factor if base_rate else None
+        self.min_rate = base_rate * min_rate_factor if base_rate else None
+        self.metrics = metrics
+        self.active = 0
+        self.waiters: List[asyncio.Future] = []
+        self.healthy_streak = 0
+        self.error_streak = 0
+        self.error_limit = max(1, error_limit)  # Failed requests in a row that count as a throttling signal
+        self.samples = 0
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.last_decrease = -math.inf
+        self.ceiling = self.max_concurrency  # Lowered by the memory watchdog while memory runs high
+        self.decisions: List[Dict[str, Any]] = []
+
+    async def acquire(self):
+        """Wait for one of the currently allowed worker slots"""
+        if self.active < self.limit:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter  # The slot is handed over by wake(), already counted
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Cancelled just after being handed a slot: give it back
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            raise
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now and nobody is queued for it"""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        return False
+
+    @property
+    def over_limit(self) -> bool:
+        """More slots are held than allowed, e.g. just after a decrease"""
+        return self.active > self.limit
+
+    def release(self):
+        self.active -= 1
+        self.wake()
+
+    def wake(self):
+        while self.waiters and self.active < self.limit:
+            waiter = self.waiters.pop(0)
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+    def observe(self, url: str, status: int, seconds: float, challenge: bool = False,
+                retry_after: Optional[float] = None):
+        """Feed one network response (status 0 for a timeout/connection error) into the controller"""
+        if status in THROTTLE_STATUSES or challenge:
+            if self.metrics:
+                self.metrics.count('throttled')
+            if retry_after and self.rate_limiter:
+                self.rate_limiter.pause(url, retry_after)
+            self.error_streak = 0
+            self.decrease(url, 'challenge page' if challenge else f'HTTP {status}')
+            return
+        
+        if status == 0 or status >= 500:
+            # A timeout, reset or server error is never a healthy sample, however fast it came back
+            self.healthy_streak = 0
+            self.error_streak += 1
+            if self.error_streak >= self.error_limit:
+                streak, self.error_streak = self.error_streak, 0
+                self.decrease(url, f'{streak} failed requests in a row')
+            return
+        self.error_streak = 0
+        
+        self.samples += 1
+        self.latency_ewma = seconds if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * seconds
+        if self.samples >= 5:
+            self.latency_baseline = min(self.latency_baseline or self.latency_ewma, self.latency_ewma)
+        if (self.latency_baseline and self.latency_ewma > 1.0
+                and self.latency_ewma > self.latency_factor * self.latency_baseline):
+            self.decrease(url, f'latency {self.latency_ewma:.2f}s vs {self.latency_baseline:.2f}s baseline')
+            return
+        
+        self.healthy_streak += 1
+        if self.healthy_streak >= 2 * self.limit:
+            self.increase(url)
+
+    def increase(self, url: str):
+        streak, self.healthy_streak = self.healthy_streak, 0
+        ceiling = min(self.max_concurrency, self.ceiling)
+        at_max_rate = self.rate is None or self.rate >= self.max_rate
+        if not self.adaptive or (self.limit >= ceiling and self.delay <= self.min_delay and at_max_rate):
+            return
+        self.limit = min(ceiling, self.limit + 1)
+        self.delay = max(self.min_delay, self.delay - self.delay_step)
+        if not at_max_rate:
+            self.set_rate(min(self.max_rate, self.rate + self.rate_step))
+        self.log('increase', f'{streak} healthy responses', url)
+        self.wake()
+
+    def set_rate(self, rate: float):
+        """Drive the host rate limiter's spacing from the controller's current rate"""
+        self.rate = rate
+        self.rate_limiter.min_interval = 1.0 / rate
+
+    def decrease(self, url: str, reason: str):
+        self.healthy_streak = 0
+        now = time.monotonic()
+        if not self.adaptive or now - self.last_decrease < self.cooldown:
+            return  # Requests already in flight went out at the old rate; don't punish them twice
+        self.last_decrease = now
+        self.limit = max(1, int(self.limit * self.backoff))
+        self.delay = min(self.max_delay, max(self.delay / self.backoff, 4 * self.delay_step))
+        if self.rate is not None:
+            self.set_rate(max(self.min_rate, self.rate * self.backoff))
+        self.log('decrease', reason, url)
+
+    def shed(self, reason: str):
+        """Memory pressure: halve the workers and keep them capped there until relieved"""
+        if self.limit <= 1:
+            return
+        self.ceiling = max(1, self.limit // 2)
+        self.limit = self.ceiling
+        self.log('shed', reason, '')
+
+    def relieve(self, reason: str):
+        """Memory is back down: lift the cap (an adaptive controller then earns the workers back)"""
+        if self.ceiling >= self.max_concurrency:
+            return
+        self.ceiling = self.max_concurrency
+        if not self.adaptive:
+            self.limit = self.max_concurrency
+            self.wake()
+        self.log('relieve', reason, '')
+
+    def log(self, action: str, reason: str, url: str):
+        decision = {'action': action, 'reason': reason, 'url': url, 'concurrency': self.limit,
+                    'delay': round(self.delay, 2), 'requests_per_second': round(self.rate, 3) if self.rate else None,
+                    'latency_ewma': round(self.latency_ewma or 0.0, 3)}
+        self.decisions.append(decision)
+        if self.metrics:
+            self.metrics.event('rate', **decision)
+        rate = f", {self.rate:.2f} req/s" if self.rate else ''
+        print(f"   🚦 Rate {action} ({reason}): {self.limit} worker(s), {self.delay:.2f}s pause{rate}")
+
+
+class RunMetrics:
+    """Timing spans and counters for one run, summarized as percentiles in JSON and Prometheus text"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        # (phase, url, offset from run start, seconds, status) - the url ties every span to a company
+        self.spans: List[Tuple[str, str, float, float, str]] = []
+        self.counters: Dict[str, int] = {}
+        self.events: List[Dict[str, Any]] = []  # Point-in-time decisions, e.g. rate controller changes
+
+    @contextmanager
+    def span(self, phase: str, url: str = ''):
+        """Time the enclosed block as one span of a phase"""
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            self.record(phase, time.perf_counter() - start, url, status, start)
+
+    def record(self, phase: str, seconds: float, url: str = '', status: str = 'ok', start: Optional[float] = None):
+        """Add a span that was timed elsewhere"""
+        if start is None:
+            start = time.perf_counter() - seconds
+        self.spans.append((phase, url or '', start - self.start, seconds, status))
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def event(self, kind: str, **fields):
+        self.events.append(dict(kind=kind, offset=round(time.perf_counter() - self.start, 4), **fields))
+
+    def durations(self) -> Dict[str, np.ndarray]:
+        by_phase: Dict[str, List[float]] = {}
+        for phase, _, _, seconds, _ in self.spans:
+            by_phase.setdefault(phase, []).append(seconds)
+        return {phase: np.array(seconds) for phase, seconds in by_phase.items()}
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        """Count, sum, mean, max and p50/p95/p99 seconds per phase"""
+        errors: Dict[str, int] = {}
+        for phase, _, _, _, status in self.spans:
+            if status == 'error':
+                errors[phase] = errors.get(phase, 0) + 1
+        
+        histograms = {}
+        for phase, seconds in sorted(self.durations().items()):
+            histogram = {
+                'count': int(seconds.size),
+                'sum': round(float(seconds.sum()), 4),
+                'mean': round(float(seconds.mean()), 4),
+                'max': round(float(seconds.max()), 4),
+                'errors': errors.get(phase, 0),
+            }
+            for quantile, value in zip(self.QUANTILES, np.quantile(seconds, self.QUANTILES)):
+                histogram[f'p{int(quantile * 100)}'] = round(float(value), 4)
+            histograms[phase] = histogram
+        return histograms
+
+    def by_url(self) -> Dict[str, Dict[str, float]]:
+        """Seconds per phase for every URL, in first-seen order"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for phase, url, _, seconds, _ in self.spans:
+            if url:
+                phases = totals.setdefault(url, {})
+                phases[phase] = round(phases.get(phase, 0.0) + seconds, 4)
+        return totals
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'elapsed_seconds': round(time.perf_counter() - self.start, 3),
+            'counters': dict(sorted(self.counters.items())),
+            'phases': self.histograms(),
+            'urls': self.by_url(),
+            'events': self.events,
+            'spans': [
+                {'phase': phase, 'url': url, 'offset': round(offset, 4), 'seconds': round(seconds, 4), 'status': status}
+                for phase, url, offset, seconds, status in self.spans
+            ],
+        }
+
+    def write_report(self, path: str):
+        """Write the JSON run report"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str, prefix: str = 'goodfirms'):
+        """Write Prometheus text format (e.g. for node_exporter's textfile collector)"""
+        lines = [
+            f'# HELP {prefix}_phase_seconds Time spent in each scraper phase',
+            f'# TYPE {prefix}_phase_seconds summary',
+        ]
+        for phase, histogram in self.histograms().items():
+            for quantile in self.QUANTILES:
+                lines.append(f'{prefix}_phase_seconds{{phase="{phase}",quantile="{quantile}"}} {histogram[f"p{int(quantile * 100)}"]}')
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}')
+        for name, value in sorted(self.counters.items()):
+            metric = f'{prefix}_{re.sub(r"[^a-zA-Z0-9_]", "_", name)}_total'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+        lines += [
+            f'# TYPE {prefix}_run_seconds gauge',
+            f'{prefix}_run_seconds {time.perf_counter() - self.start:.3f}',
+        ]
+        
+        # Write-then-rename so a scraper of the file never sees half of it
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+
+# Define columns in exact order needed
+EXPORT_COLUMNS = [
+    'Company',
+    'Service Provider',
+    'Service',
+    'Project Summary',
+    'Start Date',
+    'Budget',
+    'Rating',
+    'Review',
+    'Reviewer Name',
+    'Reviewer Position',
+    'Reviewer Company',
+    'Company Outsourced Industry',
+    'Person LinkedIn URL',
+    'Company URL',
+    'Reviewer Location',
+    'Employee Size',
+    'Job Change',
+]
+
+# Typed columns derived from Budget, Rating, Start Date and Employee Size
+NORMALIZED_COLUMNS = [
+    'Budget Min',
+    'Budget Max',
+    'Rating Value',
+    'Start Date Value',
+    'Employee Size Min',
+    'Employee Size Max',
+]
+
+# In normalized exports the typed columns take the place of the raw string they are parsed from
+TYPED_COLUMNS = {
+    'Start Date': ['Start Date Value'],
+    'Budget': ['Budget Min', 'Budget Max'],
+    'Rating': ['Rating Value'],
+    'Employee Size': ['Employee Size Min', 'Employee Size Max'],
+}
+
+EXCEL_COLUMN_WIDTHS = {
+    'Company': 25, 'Service Provider': 25, 'Service': 20, 'Project Summary': 40, 'Start Date': 15, 'Budget': 15,
+    'Rating': 10, 'Review': 60, 'Reviewer Name': 25, 'Reviewer Position': 30, 'Reviewer Company': 30,
+    'Company Outsourced Industry': 20, 'Person LinkedIn URL': 30, 'Company URL': 50, 'Reviewer Location': 25,
+    'Employee Size': 15, 'Job Change': 15, 'Budget Min': 12, 'Budget Max': 12, 'Rating Value': 12,
+    'Start Date Value': 15, 'Employee Size Min': 12, 'Employee Size Max': 12,
+}
+
+# Formats a raw Start Date match can take (see DATE_PATTERN), tried in order
+START_DATE_FORMATS = ('%b %Y', '%B %Y', '%m/%d/%Y', '%m/%d/%y', '%Y')
+
+EXPORT_FORMATS = {'.xlsx': 'xlsx', '.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+
+# Company-level fields repeat on every review row, so they are stored once per company
+COMPANY_COLUMNS = ('Company', 'Service Provider', 'Company URL', 'Employee Size')
+# Low-cardinality review fields that are worth interning
+INTERNED_COLUMNS = {
+    'Service', 'Start Date', 'Budget', 'Rating', 'Reviewer Position', 'Reviewer Company',
+    'Company Outsourced Industry', 'Person LinkedIn URL', 'Reviewer Location', 'Job Change',
+}
+
+
+class ContextRecycler:
+    """
+    Stands in for a browser context on long crawls, where Chromium's memory grows with
+    every heavy page. Pages are opened from the current context until it has served
+    context_navigations navigations or context_mb of responses; then new pages come from a
+    fresh context and the old one closes with its last page. A page is likewise worn after
+    page_navigations / page_mb, and its owner should close it and open a new one.
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[Any]], page_navigations: int = 50, page_mb: Optional[float] = 200,
+                 context_navigations: int = 400, context_mb: Optional[float] = 1500,
+                 metrics: Optional['RunMetrics'] = None):
+        self.factory = factory
+        self.page_navigations = page_navigations
+        self.page_bytes = page_mb * 1024 * 1024 if page_mb else math.inf
+        self.context_navigations = context_navigations
+        self.context_bytes = context_mb * 1024 * 1024 if context_mb else math.inf
+        self.metrics = metrics
+        self.context = None
+        self.usage: Dict[int, Dict[str, Any]] = {}  # id(context) -> navigations, bytes, open pages
+        self.page_usage: Dict[int, Dict[str, Any]] = {}  # id(page) -> navigations, bytes, its context's id
+        self.retired: Set[int] = set()
+        self.recycled_pages = 0
+        self.recycled_contexts = 0
+
+    def worn(self, usage: Dict[str, Any], navigations: int, limit_bytes: float) -> bool:
+        return usage['navigations'] >= navigations or usage['bytes'] >= limit_bytes
+
+    async def current(self):
+        """The context new pages come from, replacing it first if it has served its share"""
+        if self.context is not None:
+            usage = self.usage[id(self.context)]
+            if id(self.context) not in self.retired:
+                if not self.worn(usage, self.context_navigations, self.context_bytes):
+                    return self.context
+                self.retire()
+            if not usage['pages']:
+                await self.close_context(self.context)
+        self.context = await self.factory()
+        self.usage[id(self.context)] = {'context': self.context, 'navigations': 0, 'bytes': 0, 'pages': set()}
+        return self.context
+
+    def retire(self):
+        """Send every later page to a fresh context (the current one closes with its last page)"""
+        if self.context is not None and id(self.context) not in self.retired:
+            self.retired.add(id(self.context))
+            self.recycled_contexts += 1
+            if self.metrics:
+                self.metrics.count('recycled_contexts')
+
+    async def close_context(self, context):
+        self.usage.pop(id(context), None)
+        self.retired.discard(id(context))
+        try:
+            await context.close()
+        except Exception:
+            pass  # Already gone with the browser
+
+    async def new_page(self) -> Page:
+        context = await self.current()
+        page = await context.new_page()
+        context_usage = self.usage[id(context)]
+        usage = {'navigations': 0, 'bytes': 0, 'context': id(context)}
+        self.page_usage[id(page)] = usage
+        context_usage['pages'].add(id(page))
+
+        def on_navigated(frame):
+            if frame == page.main_frame:
+                usage['navigations'] += 1
+                context_usage['navigations'] += 1
+
+        async def on_response(response):
+            length = response.headers.get('content-length')
+            if length and length.isdigit():
+                size = int(length)
+            elif response.request.resource_type == 'document':
+                # Chunked HTML is the bulk of what we load: ask for its body size once it has finished.
+                # Other chunked responses are skipped rather than paying a round-trip each.
+                try:
+                    size = (await response.request.sizes())['responseBodySize']
+                except Exception:
+                    return
+            else:
+                return
+            usage['bytes'] += size
+            context_usage['bytes'] += size
+
+        async def on_close(_):
+            self.page_usage.pop(id(page), None)
+            context_usage['pages'].discard(id(page))
+            if usage['context'] in self.retired and not context_usage['pages']:
+                await self.close_context(context)
+
+        page.on('framenavigated', on_navigated)
+        if self.page_bytes != math.inf or self.context_bytes != math.inf:
+            page.on('response', on_response)  # Byte accounting only when a byte limit is set
+        page.on('close', on_close)
+        return page
+
+    def is_worn(self, page: Page) -> bool:
+        """Whether this page (or the context it came from) should be replaced"""
+        usage = self.page_usage.get(id(page))
+        if usage is None:
+            return False
+        context_usage = self.usage.get(usage['context'])
+        return (usage['context'] in self.retired or self.worn(usage, self.page_navigations, self.page_bytes)
+                or (context_usage is not None
+                    and self.worn(context_usage, self.context_navigations, self.context_bytes)))
+
+    async def close(self):
+        for usage in list(self.usage.values()):
+            await self.close_context(usage['context'])
+        self.context = None
+
+
+def process_rss(pid: Optional[int] = None) -> int:
+    """Resident memory of a process in bytes (this one by default); 0 when it can't be read"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def browser_rss() -> int:
+    """Resident memory of the driver and browser processes this one started (needs psutil)"""
+    if psutil is None:
+        return 0
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass  # Exited between listing and sampling
+    return total
+
+
+class MemoryWatchdog:
+    """
+    Sample Python and browser RSS every few seconds. Above limit_mb, halve the workers and
+    retire the browser contexts (shedding again each cooldown while still high); once back
+    under the low-water mark, lift the cap.
+    """
+
+    def __init__(self, rate_controller: AdaptiveRateController, limit_mb: float, low_water: float = 0.8,
+                 interval: float = 5.0, cooldown: float = 30.0, recyclers: Iterable[ContextRecycler] = (),
+                 metrics: Optional[RunMetrics] = None):
+        self.rate_controller = rate_controller
+        self.limit = limit_mb * 1024 * 1024
+        self.low = self.limit * low_water
+        self.interval = interval
+        self.cooldown = cooldown
+        self.recyclers = list(recyclers)
+        self.metrics = metrics
+        self.peak_python = 0
+        self.peak_browser = 0
+        self.last_shed = -math.inf
+        self.shedding = False
+        self.task: Optional[asyncio.Task] = None
+
+    def sample(self) -> Tuple[int, int]:
+        python, browser = process_rss(), browser_rss()
+        self.peak_python = max(self.peak_python, python)
+        self.peak_browser = max(self.peak_browser, browser)
+        return python, browser
+
+    def check(self):
+        python, browser = self.sample()
+        total = python + browser
+        reason = f'RSS {total / 1024 / 1024:.0f} MB (python {python / 1024 / 1024:.0f}, browser {browser / 1024 / 1024:.0f})'
+        now = time.monotonic()
+        if total >= self.limit and now - self.last_shed >= self.cooldown:
+            self.last_shed = now
+            self.shedding = True
+            if self.metrics:
+                self.metrics.event('memory', action='shed', python=python, browser=browser)
+            self.rate_controller.shed(reason)
+            for recycler in self.recyclers:
+                recycler.retire()
+        elif self.shedding and total < self.low:
+            self.shedding = False
+            if self.metrics:
+                self.metrics.event('memory', action='relieve', python=python, browser=browser)
+            self.rate_controller.relieve(reason)
+
+    async def run(self):
+        while True:
+            self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.sample()
+
+
+class ReviewRowStore:
+    """Columnar store for review rows with dictionary-encoded company fields and interned strings"""
+
+    def __init__(self, rows: Iterable[Dict[str, str]] = ()):
+        self.review_columns = [c for c in EXPORT_COLUMNS if c not in COMPANY_COLUMNS]
+        self.columns: Dict[str, List[str]] = {c: [] for c in self.review_columns}
+        self.company_ids = array('I')
+        self.companies: List[Tuple[str, ...]] = []
+        self.company_index: Dict[Tuple[str, ...], int] = {}
+        self.extend(rows)
+
+    def append(self, row: Dict[str, str]):
+        company = tuple(str(row.get(c) or '') for c in COMPANY_COLUMNS)
+        company_id = self.company_index.get(company)
+        if company_id is None:
+            company_id = self.company_index[company] = len(self.companies)
+            self.companies.append(company)
+        self.company_ids.append(company_id)
+        
+        for column in self.review_columns:
+            value = str(row.get(column) or '')
+            self.columns[column].append(sys.intern(value) if column in INTERNED_COLUMNS else value)
+
+    def extend(self, rows: Iterable[Dict[str, str]]):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.company_ids)
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        """Rebuild one row as a dict in export column order"""
+        index = range(len(self))[index]
+        company = dict(zip(COMPANY_COLUMNS, self.companies[self.company_ids[index]]))
+        return {c: company[c] if c in company else self.columns[c][index] for c in EXPORT_COLUMNS}
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> List[str]:
+        """All values of one column, without building row dicts"""
+        if name in COMPANY_COLUMNS:
+            position = COMPANY_COLUMNS.index(name)
+            values = [company[position] for company in self.companies]
+            return [values[company_id] for company_id in self.company_ids]
+        return self.columns[name]
+
+    def iter_frames(self, chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        """Yield record batches as DataFrames in EXPORT_COLUMNS order"""
+        company_values = {
+            name: np.array([company[position] for company in self.companies] or [''], dtype=object)
+            for position, name in enumerate(COMPANY_COLUMNS)
+        }
+        all_ids = np.frombuffer(self.company_ids, dtype=np.uint32) if len(self) else np.zeros(0, dtype=np.uint32)
+        for start in range(0, len(self), chunk_size):
+            ids = all_ids[start:start + chunk_size]
+            yield pd.DataFrame({
+                c: company_values[c][ids] if c in company_values else self.columns[c][start:start + chunk_size]
+                for c in EXPORT_COLUMNS
+            })
+
+
+def clean_export_chunk(df: pd.DataFrame, seen_hashes: Set[int]) -> pd.DataFrame:
+    """Vectorized cleanup: drop all-empty rows and rows already written in any earlier chunk"""
+    df = df.fillna('').astype(str)
+    
+    # Remove rows where all fields are empty
+    non_empty = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        non_empty |= df[column].str.strip().ne('').to_numpy()
+    df = df[non_empty]
+    
+    # Remove exact duplicate rows, within this chunk and across chunks
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    keep = ~hashes.duplicated() & ~hashes.isin(seen_hashes)
+    seen_hashes.update(hashes[keep].tolist())
+    return df[keep.to_numpy()]
+
+
+def export_columns(normalize: bool = True, keep_raw: bool = False) -> List[str]:
+    """Output columns: raw strings only, or typed values in their place (next to the raw text with keep_raw)"""
+    if not normalize:
+        return list(EXPORT_COLUMNS)
+    columns = []
+    for column in EXPORT_COLUMNS:
+        if column in TYPED_COLUMNS:
+            columns.extend(([column] if keep_raw else []) + TYPED_COLUMNS[column])
+        else:
+            columns.append(column)
+    return columns
+
+
+def normalize_review_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Add typed NORMALIZED_COLUMNS parsed from the raw strings, using vectorized string ops"""
+    df = df.copy()
+    
+    # "$10,000 - $49,999" -> 10000, 49999; "$200,000+" -> 200000, <NA>; "$5,000" -> 5000, 5000
+    budget = df['Budget'].astype(str).str.replace(',', '', regex=False).str.extract(
+        r'\$(?P<low>\d+)\s*(?:-\s*\$?(?P<high>\d+))?\s*(?P<open>\+)?'
+    )
+    low = pd.to_numeric(budget['low'], errors='coerce').astype('Int64')
+    high = pd.to_numeric(budget['high'], errors='coerce').astype('Int64')
+    single = high.isna() & budget['open'].isna()
+    df['Budget Min'] = low
+    df['Budget Max'] = high.mask(single, low)
+    
+    df['Rating Value'] = pd.to_numeric(df['Rating'], errors='coerce').astype('float64')
+    
+    dates = df['Start Date'].astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    for date_format in START_DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed = parsed.fillna(pd.to_datetime(dates[missing], format=date_format, errors='coerce'))
+    df['Start Date Value'] = parsed
+    
+    # "50 - 249" -> 50, 249; "1000+" / "> 1000" -> 1000, <NA>; "< 10" -> 1, 10
+    size = df['Employee Size'].astype(str).str.replace(',', '', regex=False).str.extract(
+        r'(?P<low>\d+)\s*-\s*(?P<high>\d+)|(?P<plus>\d+)\s*\+|>\s*(?P<above>\d+)|<\s*(?P<below>\d+)'
+    ).apply(pd.to_numeric, errors='coerce').astype('Int64')
+    df['Employee Size Min'] = size['low'].fillna(size['plus']).fillna(size['above']).mask(size['below'].notna(), 1)
+    df['Employee Size Max'] = size['high'].fillna(size['below'])
+    return df
+
+
+class ExportSink:
+    """Incremental writer for one output format; rows arrive as DataFrame chunks"""
+
+    def __init__(self, filename: str, fmt: str, columns: List[str] = EXPORT_COLUMNS):
+        self.filename = filename
+        self.fmt = fmt
+        self.started = False
+        if fmt == 'xlsx':
+            from openpyxl import Workbook
+            from openpyxl.utils import get_column_letter
+            # Write-only mode streams rows to disk instead of holding every cell in memory
+            self.workbook = Workbook(write_only=True)
+            self.worksheet = self.workbook.create_sheet('Companies & Reviews')
+            for index, column in enumerate(columns, 1):
+                self.worksheet.column_dimensions[get_column_letter(index)].width = EXCEL_COLUMN_WIDTHS.get(column, 15)
+            self.worksheet.append(columns)
+        elif fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self.pa = pa
+            types = {
+                'Budget Min': pa.int64(), 'Budget Max': pa.int64(), 'Rating Value': pa.float64(),
+                'Start Date Value': pa.timestamp('ns'), 'Employee Size Min': pa.int64(), 'Employee Size Max': pa.int64(),
+            }
+            self.schema = pa.schema([(c, types.get(c, pa.string())) for c in columns])
+            self.writer = pq.ParquetWriter(filename, self.schema)
+        elif fmt in ('csv', 'jsonl'):
+            self.file = open(filename, 'w', encoding='utf-8', newline='')
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == 'xlsx':
+            # Missing typed values (<NA>, NaN, NaT) become empty cells
+            df = df.astype(object).where(df.notna(), None)
+            for row in df.itertuples(index=False, name=None):
+                self.worksheet.append(row)
+        elif self.fmt == 'parquet':
+            self.writer.write_table(self.pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        elif self.fmt == 'csv':
+            df.to_csv(self.file, header=not self.started, index=False)
+        elif self.fmt == 'jsonl' and len(df):
+            text = df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+            self.file.write(text if text.endswith('\n') else text + '\n')  # pandas < 1.5 omits the final newline
+        self.started = True
+
+    def close(self):
+        if self.fmt == 'xlsx':
+            self.workbook.save(self.filename)
+        elif self.fmt == 'parquet':
+            self.writer.close()
+        else:
+            self.file.close()
+
+
+def iter_row_frames(rows: Iterable[Dict[str, str]], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Group row dicts into DataFrame chunks"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield pd.DataFrame(chunk, columns=EXPORT_COLUMNS)
+
+
+def export_rows(rows: Iterable[Dict[str, str]], filename: str, fmt: Optional[str] = None,
+                chunk_size: int = 10_000, normalize: bool = True, keep_raw: bool = False) -> Dict[str, Any]:
+    """
+    Clean rows and write them chunk by chunk, returning row/company/fill counts. With normalize,
+    Budget, Rating, Start Date and Employee Size are written as typed values instead of their raw
+    text (keep_raw writes both); text that doesn't parse becomes an empty value.
+    """
+    fmt = fmt or EXPORT_FORMATS.get(os.path.splitext(filename)[1].lower(), 'xlsx')
+    stats = {'format': fmt, 'rows': 0, 'companies': 0, 'filled': dict.fromkeys(EXPORT_COLUMNS, 0)}
+    seen_hashes: Set[int] = set()
+    companies: Set[str] = set()
+    
+    if isinstance(rows, ReviewRowStore):
+        frames = rows.iter_frames(chunk_size)
+    else:
+        frames = iter_row_frames(rows, chunk_size)
+    
+    columns = export_columns(normalize, keep_raw)
+    sink = ExportSink(filename, fmt, columns)
+    try:
+        for frame in frames:
+            df = clean_export_chunk(frame, seen_hashes)
+            
+            stats['rows'] += len(df)
+            companies.update(df['Company'].unique())
+            for column, filled in df.ne('').sum().items():
+                stats['filled'][column] += int(filled)
+            
+            sink.write(normalize_review_frame(df)[columns] if normalize else df)
+    finally:
+        sink.close()
+    
+    stats['companies'] = len(companies)
+    return stats
+
 
 class HumanLikeGoodFirmsScraper:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, concurrency: int = 4, requests_per_second: float = 1.0,
+                 block_resources: bool = False, resource_blocker: Optional[ResourceBlocker] = None,
+                 http_first: bool = False, cache_path: Optional[str] = None,
+                 cache_ttl_seconds: float = 24 * 3600, journal_path: Optional[str] = None,
+                 resume: bool = False, dedupe_index_path: Optional[str] = None,
+                 near_duplicates: bool = False, max_review_pages: int = 50,
+                 metrics_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                 snapshot_path: Optional[str] = None, delay: float = 2.0, adaptive_rate: bool = True,
+                 max_retries: int = 3, retry_concurrency: int = 1, retry_base_delay: float = 5.0,
+                 dead_letter_path: Optional[str] = None, recycle_page_after: Optional[int] = 50,
+                 recycle_context_after: Optional[int] = 400, recycle_page_mb: Optional[float] = 200,
+                 recycle_context_mb: Optional[float] = 1500, memory_limit_mb: Optional[float] = None):
         self.base_url = base_url
-        self.data = []
-        self.delay = 2
-        self.seen_reviews: Set[Tuple[str, str, str]] = set()  # Track unique reviews
+        self.data = ReviewRowStore()
+        self.concurrency = max(1, concurrency)  # Most pages working in parallel
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        # Opt-in: skip images, fonts, CSS and trackers the extraction never reads
+        self.resource_blocker = resource_blocker or (ResourceBlocker() if block_resources else None)
+        self.max_review_pages = max_review_pages  # Per company, including the profile page itself
+        # Try plain HTTP + HTML parsing before rendering a profile in Chromium
+        self.http_first = http_first and httpx is not None
+        if http_first and httpx is None:
+            print("⚠️  httpx/selectolax not installed - HTTP-first fetching disabled")
+        self.http_fetcher: Optional[HttpFetcher] = None
+        # Re-runs serve listing and company pages from disk instead of the network
+        self.page_cache = PageCache(cache_path, ttl_seconds=cache_ttl_seconds) if cache_path else None
+        # Raw HTML of every company/review page, so extraction changes can be backfilled offline
+        self.snapshots = SnapshotArchive(snapshot_path) if snapshot_path else None
+        self.http_hits = 0
+        self.browser_fallbacks = 0
+        # Track unique reviews; with a path the index persists, so re-crawls only emit new reviews
+        self.seen_reviews = ReviewDedupeIndex(dedupe_index_path, near_duplicates=near_duplicates)
+        # Every finished company is journaled so a crashed run can resume where it stopped
+        self.journal = ScrapeJournal(journal_path) if journal_path else None
+        self.resume = resume
+        self.completed_urls: Set[str] = set()
+        # Called with (company_url, rows) as each company is merged, e.g. to stream rows to a daemon client
+        self.on_company: Optional[Callable[[str, List[Dict[str, str]]], None]] = None
+        # Timing spans (goto, waits, scroll, evaluate, dedupe, export) and counters for the run report
+        self.metrics = RunMetrics()
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        # Decides how many workers run and how long each pauses after a company (AIMD unless adaptive_rate=False)
+        self.rate_controller = AdaptiveRateController(
+            self.concurrency, delay, adaptive=adaptive_rate, rate_limiter=self.rate_limiter, metrics=self.metrics,
+        )
+        # Failed companies are retried after the main pass, slowly and with backoff; what never recovers is reported
+        self.retry_queue = RetryQueue(max_attempts=1 + max(0, max_retries))
+        # Listing pages are retried in place with the same backoff; ones that never load are dead-lettered too
+        self.listing_failures = RetryQueue(max_attempts=1 + max(0, max_retries))
+        self.retry_concurrency = max(1, retry_concurrency)
+        self.retry_base_delay = retry_base_delay
+        self.dead_letter_path = dead_letter_path
+        # Long crawls swap worker pages and browser contexts as they age, so Chromium memory stays flat
+        self.recycle_limits = None if recycle_page_after is None and recycle_context_after is None else dict(
+            page_navigations=recycle_page_after or math.inf, page_mb=recycle_page_mb,
+            context_navigations=recycle_context_after or math.inf, context_mb=recycle_context_mb,
+        )
+        # Above this much Python + browser RSS, workers are shed until memory comes back down
+        self.memory_limit_mb = memory_limit_mb
+        self.memory_watchdog: Optional[MemoryWatchdog] = None
+        # The listing page run_stream hands to the URL source, renewed as it wears out
+        self.listing_page: Optional[Page] = None
+        self.listing_context = None
         
-    async def extract_company_urls(self, page: Page, max_companies: int = 10) -> List[str]:
-        """Extract company URLs from listing page"""
-        print(f"🔍 Loading: {self.base_url}\n")
+    async def wait_until_settled(self, page: Page, label: str, selector: Optional[str] = None,
+                                 quiet_ms: int = 300, network_idle: bool = True,
+                                 timeout: float = 10.0) -> str:
+        """Wait until the selector appears, the DOM goes quiet or the network idles, whichever is first"""
+        start = time.monotonic()
+        signals = {
+            asyncio.ensure_future(page.evaluate(MUTATION_QUIET_JS, [quiet_ms, int(timeout * 1000)])): 'dom-quiet',
+        }
+        if selector:
+            signals[asyncio.ensure_future(page.wait_for_selector(selector, state='attached', timeout=timeout * 1000))] = 'selector'
+        if network_idle:
+            signals[asyncio.ensure_future(page.wait_for_load_state('networkidle', timeout=timeout * 1000))] = 'network-idle'
+        
+        reason = 'timeout'
+        pending = set(signals)
+        try:
+            while pending:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                # A signal that errored (e.g. selector timeout) doesn't count; keep waiting on the others
+                settled = [task for task in done if not task.exception() and task.result() != 'timeout']
+                if settled:
+                    reason = signals[settled[0]]
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in signals:
+                if task.done() and not task.cancelled():
+                    task.exception()  # Mark retrieved so asyncio doesn't warn
+        
+        # The span status is why the wait ended
+        self.metrics.record(f'wait.{label}', time.monotonic() - start, page.url, reason)
+        return reason
+    
+    def print_phase_summary(self):
+        """Print median and tail time per phase"""
+        for phase, histogram in self.metrics.histograms().items():
+            print(f"  ⏳ {phase}: p50 {histogram['p50']:.2f}s, p95 {histogram['p95']:.2f}s, "
+                  f"p99 {histogram['p99']:.2f}s over {histogram['count']}")
+    
+    def write_metrics(self):
+        """Write the JSON run report and Prometheus text file, when their paths are set"""
+        if self.metrics_path:
+            self.metrics.write_report(self.metrics_path)
+            print(f"📈 Run report: {self.metrics_path}")
+        if self.prometheus_path:
+            self.metrics.write_prometheus(self.prometheus_path)
+            print(f"📈 Prometheus metrics: {self.prometheus_path}")
+    
+    async def throttle(self, url: str):
+        """Rate-limit a navigation unless the page cache will answer it"""
+        if self.page_cache and self.page_cache.is_fresh(url):
+            return
+        with self.metrics.span('throttle', url):
+            await self.rate_limiter.wait(url)
+    
+    async def navigate(self, page: Page, url: str):
+        """page.goto with its timing span, and the response fed to the rate controller"""
+        cached = bool(self.page_cache and self.page_cache.is_fresh(url))
+        start = time.perf_counter()
+        try:
+            with self.metrics.span('goto', url):
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except Exception:
+            self.rate_controller.observe(url, 0, time.perf_counter() - start)
+            raise
+        self.metrics.count('pages')
+        
+        if not cached:
+            try:
+                title = await page.title()
+            except Exception:
+                title = ''
+            self.rate_controller.observe(
+                url, response.status if response else 0, time.perf_counter() - start,
+                challenge=is_challenge_title(title),
+                retry_after=parse_retry_after(response.headers.get('retry-after')) if response else None,
+            )
+        return response
+    
+    async def fetch_http(self, url: str) -> Dict[str, Any]:
+        """HttpFetcher.fetch with its timing span, and the response fed to the rate controller"""
+        start = time.perf_counter()
+        try:
+            with self.metrics.span('http_fetch', url):
+                response = await self.http_fetcher.fetch(url)
+        except Exception:
+            self.rate_controller.observe(url, 0, time.perf_counter() - start)
+            raise
+        
+        if not response.get('cached'):
+            self.rate_controller.observe(
+                url, response['status'], time.perf_counter() - start,
+                challenge=looks_like_challenge(response['html']),
+                retry_after=parse_retry_after(response['headers'].get('retry-after')),
+            )
+        return response
+    
+    async def new_page(self, context) -> Page:
+        """Open a page, with the page cache and resource blocking attached when enabled"""
+        page = await context.new_page()
+        if self.page_cache:
+            await self.page_cache.attach(page)
+        if self.resource_blocker:
+            await self.resource_blocker.attach(page)
+        return page
+    
+    async def close_page(self, page: Page):
+        if self.resource_blocker:
+            self.resource_blocker.detach(page)
+        await page.close()
+    
+    def report_blocked(self, page: Page):
+        """Print how many requests and bytes resource blocking saved on this page"""
+        if not self.resource_blocker:
+            return
+        stats = self.resource_blocker.take_page_stats(page)
+        if stats['requests']:
+            print(f"   🚫 Blocked {stats['requests']} request(s), ~{stats['bytes'] / 1024:.0f} KB saved")
+    
+    def listing_page_url(self, page_number: int, base_url: Optional[str] = None) -> str:
+        """Build the URL of a listing page using GoodFirms' ?page=N pagination"""
+        base_url = base_url or self.base_url
+        if page_number <= 1:
+            return base_url
+        parts = urlsplit(base_url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != 'page']
+        query.append(('page', str(page_number)))
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+    
+    async def iter_company_urls(self, page: Page, max_companies: Optional[int] = None,
+                                max_pages: Optional[int] = None, base_url: Optional[str] = None) -> AsyncIterator[str]:
+        """Walk every listing page and yield each new canonical company URL as soon as it is seen"""
+        seen: Set[str] = set()
+        yielded = 0
+        page_number = 1
+        failed_pages = 0  # In a row, after their retries
         
-        await page.goto(self.base_url, wait_until="networkidle", timeout=60000)
-        await asyncio.sleep(3)
+        while max_pages is None or page_number <= max_pages:
+            listing_url = self.listing_page_url(page_number, base_url)
+            print(f"🔍 Loading listing page {page_number}: {listing_url}")
+            
+            listing = None
+            while listing is None:
+                try:
+                    page = await self.renew_listing_page(page)
+                    listing = await self.load_listing_page(page, listing_url, page_number)
+                except Exception as e:
+                    self.metrics.count('failures')
+                    self.listing_failures.record(listing_url, e, page_number)
+                    entry = self.listing_failures.entries[canonicalize_url(listing_url)]
+                    print(f"   ❌ Listing page {page_number} failed (attempt {entry['attempts']}): "
+                          f"{type(e).__name__}: {str(e)[:80]}")
+                    if entry['permanent'] or entry['attempts'] >= self.listing_failures.max_attempts:
+                        break
+                    await asyncio.sleep(self.retry_backoff(entry['attempts']))
+            
+            if listing is None:
+                failed_pages += 1
+                if self.listing_failures.entries[canonicalize_url(listing_url)]['permanent']:
+                    return  # e.g. a 404: there is no such page, so the pagination ends here
+                if failed_pages >= 3:
+                    print(f"   ❌ {failed_pages} listing pages in a row failed - giving up on this listing")
+                    return
+                page_number += 1  # Dead-lettered; the pages after it are still worth a try
+                continue
+            failed_pages = 0
+            self.listing_failures.resolve(listing_url)
+            
+            self.report_blocked(page)
+            
+            new_on_page = 0
+            for href in listing['links']:
+                company_url = canonicalize_url(urljoin(href, urlsplit(href).path))  # Query and fragment dropped
+                if company_url in seen:
+                    continue
+                seen.add(company_url)
+                new_on_page += 1
+                yield company_url
+                yielded += 1
+                if max_companies is not None and yielded >= max_companies:
+                    return
+            
+            print(f"   📋 Page {page_number}: {new_on_page} new compan(ies), {yielded} total")
+            
+            # Stop when the site runs out of pages or starts repeating itself
+            if not listing['hasNext'] or new_on_page == 0:
+                return
+            page_number += 1
+    
+    async def load_listing_page(self, page: Page, listing_url: str, page_number: int) -> Dict[str, Any]:
+        """Load one listing page and return its company links and whether a next page exists"""
+        await self.throttle(listing_url)
+        response = await self.navigate(page, listing_url)
+        if response and response.status >= 400:
+            raise PageStatusError(response.status)
+        if is_challenge_title(await page.title()):
+            raise ChallengePageError(f"challenge page at {listing_url}")
+        self.metrics.count('listing_pages')
+        await self.wait_until_settled(page, 'listing', selector=LISTING_CONTAINER_SELECTOR)
         
         # Scroll to load all companies
-        for i in range(3):
-            await page.evaluate("window.scrollBy(0, 800)")
-            await asyncio.sleep(1)
+        await self.human_like_scroll(page)
         
-        print("📋 Extracting company URLs...\n")
-        
-        # Get all company profile links
-        company_links = await page.evaluate("""
-            () => {
-                const links = new Set();
-                
-                // Look for company profile links
-                document.querySelectorAll('a').forEach(a => {
-                    const href = a.href;
-                    if (href && 
-                        href.includes('goodfirms.co/company/') && 
-                        !href.includes('#') && 
-                        !href.includes('?')) {
-                        links.add(href);
-                    }
-                });
-                
-                return Array.from(links);
-            }
-        """)
+        # Get all company profile links plus whether a next page exists
+        with self.metrics.span('evaluate', listing_url):
+            return await page.evaluate(LISTING_LINKS_JS, page_number + 1)
+    
+    async def extract_company_urls(self, page: Page, max_companies: Optional[int] = 10,
+                                   max_pages: Optional[int] = None) -> List[str]:
+        """Extract company URLs from the listing pages"""
+        print(f"🔍 Loading: {self.base_url}\n")
         
-        company_links = list(company_links)[:max_companies]
+        company_links = [url async for url in self.iter_company_urls(page, max_companies, max_pages)]
         
-        print(f"✅ Found {len(company_links)} companies to scrape\n")
+        print(f"\n✅ Found {len(company_links)} companies to scrape\n")
         
         for i, url in enumerate(company_links[:5], 1):
             print(f"   {i}. {url.split('/')[-1]}")
@@ -77,19 +2481,12 @@ class HumanLikeGoodFirmsScraper:
         return company_links
     
     async def human_like_scroll(self, page: Page):
-        """Scroll page like a human to load all content"""
-        # Scroll down gradually
-        for i in range(5):
-            await page.evaluate(f"window.scrollBy(0, {300 + i * 100})")
-            await asyncio.sleep(0.5)
+        """Scroll down the page in steps so lazy content along the way renders, then wait for it to settle"""
+        with self.metrics.span('scroll', page.url):
+            await page.evaluate(INCREMENTAL_SCROLL_JS)
         
-        # Scroll back up
-        await page.evaluate("window.scrollTo(0, 0)")
-        await asyncio.sleep(1)
-        
-        # Final scroll to bottom
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await asyncio.sleep(2)
+        # Network idle was already reached before scrolling, so only DOM quiet means anything here
+        await self.wait_until_settled(page, 'scroll', network_idle=False, timeout=5.0)
     
     async def extract_text_safely(self, page: Page, selector: str, multiple: bool = False) -> Any:
         """Extract text using multiple fallback strategies"""
@@ -105,552 +2502,1178 @@ class HumanLikeGoodFirmsScraper:
             pass
         return [] if multiple else ''
     
-    async def extract_company_details(self, page: Page, url: str, index: int, total: int) -> Dict[str, Any]:
+    async def extract_company_details(self, page: Page, url: str, index: int, total: Optional[int]) -> Dict[str, Any]:
         """Extract company details with human-like behavior"""
-        print(f"[{index}/{total}] 🏢 {url.split('/')[-1][:50]}")
+        print(f"[{index}/{total or '?'}] 🏢 {url.split('/')[-1][:50]}")
         
         try:
             # Navigate like a human
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await asyncio.sleep(2)
+            response = await self.navigate(page, url)
+            if response and response.status >= 400:
+                raise PageStatusError(response.status)
+            if is_challenge_title(await page.title()):
+                raise ChallengePageError(f"challenge page at {url}")
+            await self.wait_until_settled(page, 'company', selector=REVIEW_CONTAINER_SELECTOR)
             
             # Scroll to load content
             await self.human_like_scroll(page)
             
-            # Wait for content to load
-            await asyncio.sleep(2)
-            
             # Extract all visible text content in structured way
-            company_data = await page.evaluate("""
-                () => {
-                    // Helper function to get clean text
-                    const getCleanText = (element) => {
-                        if (!element) return '';
-                        return element.innerText?.trim() || element.textContent?.trim() || '';
-                    };
-                    
-                    // Helper to parse "Name, Position at Company" into separate fields
-                    const parseReviewerInfo = (text) => {
-                        const result = {
-                            name: '',
-                            position: '',
-                            company: ''
-                        };
-                        
-                        if (!text) return result;
-                        
-                        // Clean the text first
-                        text = text.trim();
-                        
-                        // Pattern 1: "John Doe, CEO at Company Name"
-                        const atPattern = /^([^,]+),\\s*(.+?)\\s+at\\s+(.+)$/i;
-                        let match = text.match(atPattern);
-                        if (match) {
-                            result.name = match[1].trim();
-                            result.position = match[2].trim();
-                            result.company = match[3].trim();
-                            return result;
-                        }
-                        
-                        // Pattern 2: "John Doe | CEO | Company Name"
-                        const parts = text.split('|').map(p => p.trim()).filter(p => p);
-                        if (parts.length >= 3) {
-                            result.name = parts[0];
-                            result.position = parts[1];
-                            result.company = parts[2];
-                            return result;
-                        }
-                        
-                        // Pattern 3: "John Doe, CEO, Company Name"
-                        const commaParts = text.split(',').map(p => p.trim()).filter(p => p);
-                        if (commaParts.length >= 3) {
-                            result.name = commaParts[0];
-                            result.position = commaParts[1];
-                            result.company = commaParts[2];
-                            return result;
-                        } else if (commaParts.length === 2) {
-                            result.name = commaParts[0];
-                            result.position = commaParts[1];
-                            return result;
-                        } else if (commaParts.length === 1) {
-                            result.name = commaParts[0];
-                            return result;
-                        }
-                        
-                        // Pattern 4: Try newline separation
-                        const linePattern = /\\r?\\n/;
-                        const lineParts = text.split(linePattern).map(p => p.trim()).filter(p => p);
-                        if (lineParts.length >= 3) {
-                            result.name = lineParts[0];
-                            result.position = lineParts[1];
-                            result.company = lineParts[2];
-                            return result;
-                        } else if (lineParts.length === 2) {
-                            result.name = lineParts[0];
-                            result.position = lineParts[1];
-                            return result;
-                        } else if (lineParts.length === 1) {
-                            result.name = lineParts[0];
-                            return result;
-                        }
-                        
-                        // Default: just use as name
-                        result.name = text;
-                        return result;
-                    };
-                    
-                    const data = {
-                        companyName: '',
-                        website: '',
-                        location: '',
-                        employeeSize: '',
-                        services: [],
-                        reviews: []
-                    };
-                    
-                    // Extract company name
-                    const nameSelectors = [
-                        'h1.profile-header__title',
-                        'h1[class*="company-name"]',
-                        'h1[class*="profile"]',
-                        '.company-profile h1',
-                        'h1'
-                    ];
-                    
-                    for (const selector of nameSelectors) {
-                        const element = document.querySelector(selector);
-                        if (element && getCleanText(element)) {
-                            data.companyName = getCleanText(element);
-                            break;
-                        }
-                    }
-                    
-                    // Extract website
-                    const websiteLink = document.querySelector('a[href*="http"][target="_blank"]') ||
-                                      document.querySelector('a[class*="website"]');
-                    if (websiteLink) {
-                        data.website = websiteLink.href || '';
-                    }
-                    
-                    // Extract location
-                    const locationSelectors = [
-                        '[class*="location"]',
-                        '[class*="address"]',
-                        'span:has(svg[class*="location"])',
-                        'div:has(svg[class*="map"])'
-                    ];
-                    
-                    for (const selector of locationSelectors) {
-                        const element = document.querySelector(selector);
-                        if (element) {
-                            const text = getCleanText(element);
-                            if (text && text.length > 2 && text.length < 100) {
-                                data.location = text;
-                                break;
-                            }
-                        }
-                    }
-                    
-                    // Extract employee size
-                    const employeeSizeSelectors = [
-                        '[class*="employee"]',
-                        '[class*="team-size"]',
-                        'span:has-text("Employees")',
-                        'div:has-text("Team Size")'
-                    ];
-                    
-                    for (const selector of employeeSizeSelectors) {
-                        const element = document.querySelector(selector);
-                        if (element) {
-                            const text = getCleanText(element);
-                            const sizePattern = /\d+\s*-\s*\d+|\d+\+|<\s*\d+|>\s*\d+/;
-                            if (sizePattern.test(text)) {
-                                data.employeeSize = text.match(sizePattern)[0];
-                                break;
-                            }
-                        }
-                    }
-                    
-                    // Extract services
-                    const serviceElements = document.querySelectorAll('[class*="service"], [class*="expertise"], .tag, .badge');
-                    const services = new Set();
-                    serviceElements.forEach(el => {
-                        const text = getCleanText(el);
-                        if (text && text.length > 2 && text.length < 100 && !text.includes('View') && !text.includes('More')) {
-                            services.add(text);
-                        }
-                    });
-                    data.services = Array.from(services);
-                    
-                    // Extract reviews - IMPROVED EXTRACTION
-                    const reviewElements = document.querySelectorAll('[class*="review"], [class*="testimonial"], [class*="feedback"]');
-                    const processedReviews = new Set(); // Track unique reviews
-                    
-                    reviewElements.forEach(reviewEl => {
-                        const review = {
-                            reviewerName: '',
-                            reviewerPosition: '',
-                            reviewerCompany: '',
-                            reviewerLocation: '',
-                            reviewerIndustry: '',
-                            reviewText: '',
-                            rating: '',
-                            service: '',
-                            projectSummary: '',
-                            startDate: '',
-                            budget: ''
-                        };
-                        
-                        // Extract reviewer information - multiple strategies
-                        const reviewerSelectors = [
-                            '[class*="reviewer-name"]',
-                            '[class*="client-name"]',
-                            '[class*="author"]',
-                            'h3',
-                            'h4',
-                            '.name',
-                            'strong'
-                        ];
-                        
-                        let reviewerFound = false;
-                        for (const selector of reviewerSelectors) {
-                            const reviewerEl = reviewEl.querySelector(selector);
-                            if (reviewerEl) {
-                                const reviewerText = getCleanText(reviewerEl);
-                                if (reviewerText && reviewerText.length > 2 && reviewerText.length < 200) {
-                                    const parsed = parseReviewerInfo(reviewerText);
-                                    review.reviewerName = parsed.name;
-                                    review.reviewerPosition = parsed.position;
-                                    review.reviewerCompany = parsed.company;
-                                    reviewerFound = true;
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        // Skip if no reviewer name found
-                        if (!reviewerFound || !review.reviewerName) {
-                            return;
-                        }
-                        
-                        // Extract location
-                        const locationEl = reviewEl.querySelector('[class*="location"], [class*="country"]');
-                        if (locationEl) {
-                            review.reviewerLocation = getCleanText(locationEl);
-                        }
-                        
-                        // Extract industry
-                        const industryEl = reviewEl.querySelector('[class*="industry"], [class*="sector"]');
-                        if (industryEl) {
-                            review.reviewerIndustry = getCleanText(industryEl);
-                        }
-                        
-                        // Extract review text
-                        const reviewTextSelectors = [
-                            '[class*="review-text"]',
-                            '[class*="review-content"]',
-                            '[class*="feedback-text"]',
-                            'p',
-                            '.content'
-                        ];
-                        
-                        for (const selector of reviewTextSelectors) {
-                            const textEl = reviewEl.querySelector(selector);
-                            if (textEl) {
-                                const text = getCleanText(textEl);
-                                if (text && text.length > 20) {
-                                    review.reviewText = text;
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        // Extract rating
-                        const ratingEl = reviewEl.querySelector('[class*="rating"], [class*="star"], [class*="score"]');
-                        if (ratingEl) {
-                            const ratingText = getCleanText(ratingEl);
-                            const ratingPattern = /\d+\.?\d*/;
-                            const ratingMatch = ratingText.match(ratingPattern);
-                            if (ratingMatch) {
-                                review.rating = ratingMatch[0];
-                            }
-                        }
-                        
-                        // Extract service
-                        const serviceEl = reviewEl.querySelector('[class*="service"], [class*="category"]');
-                        if (serviceEl) {
-                            review.service = getCleanText(serviceEl);
-                        }
-                        
-                        // Extract project summary
-                        const summaryEl = reviewEl.querySelector('[class*="project"], [class*="summary"]');
-                        if (summaryEl) {
-                            review.projectSummary = getCleanText(summaryEl);
-                        }
-                        
-                        // Extract start date
-                        const dateEl = reviewEl.querySelector('[class*="date"], [class*="time"]');
-                        if (dateEl) {
-                            const dateText = getCleanText(dateEl);
-                            const datePattern = /\d{4}|\d{1,2}\/\d{1,2}\/\d{2,4}|[A-Z][a-z]+\s+\d{4}/;
-                            const dateMatch = dateText.match(datePattern);
-                            if (dateMatch) {
-                                review.startDate = dateMatch[0];
-                            }
-                        }
-                        
-                        // Extract budget
-                        const budgetEl = reviewEl.querySelector('[class*="budget"], [class*="cost"], [class*="price"]');
-                        if (budgetEl) {
-                            const budgetText = getCleanText(budgetEl);
-                            const budgetPattern = /\$[\d,]+\s*-?\s*\$?[\d,]*|\$[\d,]+\+?/;
-                            const budgetMatch = budgetText.match(budgetPattern);
-                            if (budgetMatch) {
-                                review.budget = budgetMatch[0];
-                            }
-                        }
-                        
-                        // Create unique identifier for this review
-                        const reviewKey = `${review.reviewerName}|${review.reviewText.substring(0, 50)}|${review.rating}`;
-                        
-                        // Only add if we have a name and haven't seen this review before
-                        if (review.reviewerName && !processedReviews.has(reviewKey)) {
-                            processedReviews.add(reviewKey);
-                            data.reviews.push(review);
-                        }
-                    });
-                    
-                    return data;
-                }
-            """)
+            with self.metrics.span('evaluate', url):
+                company_data = await page.evaluate(COMPANY_EXTRACTION_JS)
+            if self.snapshots:  # Skip the page.content() round trip when not archiving
+                self.archive_page(url, await page.content(), url, 'browser')
             
             # Add URL to data
             company_data['companyUrl'] = url
+            self.report_blocked(page)
             
-            # Print summary with debugging info
-            review_count = len(company_data['reviews'])
-            
-            if review_count > 0:
-                print(f"   ✅ Found {review_count} unique named review(s)")
-                # Show first reviewer name for verification
-                if company_data['reviews']:
-                    first_name = company_data['reviews'][0].get('reviewerName', 'N/A')
-                    print(f"      Example: {first_name[:50]}")
-            else:
-                print(f"   ℹ️  No valid named reviews found")
-            
+            self.print_company_summary(company_data)
             return company_data
             
         except Exception as e:
-            print(f"   ❌ Error: {str(e)[:80]}")
+            self.metrics.count('failures')
+            self.retry_queue.record(url, e, index)
+            print(f"   ❌ {type(e).__name__}: {str(e)[:80]}")
             return None
     
+    def archive_page(self, url: str, html: str, company_url: str, source: str):
+        """Keep a snapshot of a fetched page; a failing archive never costs the company its data"""
+        if not self.snapshots:
+            return
+        try:
+            self.snapshots.add(url, html, company_url, source)
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Snapshot not archived: {url} ({str(e)[:60]})")
+    
+    def print_company_summary(self, company_data: Dict[str, Any]):
+        """Print summary with debugging info"""
+        review_count = len(company_data['reviews'])
+        
+        if review_count > 0:
+            print(f"   ✅ Found {review_count} unique named review(s)")
+            # Show first reviewer name for verification
+            first_name = company_data['reviews'][0].get('reviewerName', 'N/A')
+            print(f"      Example: {first_name[:50]}")
+        else:
+            print(f"   ℹ️  No valid named reviews found")
+    
+    async def extract_company_details_http(self, url: str, index: int, total: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and parse a profile without a browser; None when the page came back but needs the browser.
+        A failed fetch, an error status or a challenge page raises instead, so the company goes to the
+        retry queue (with its backoff) rather than straight back to the same host in Chromium.
+        """
+        response = await self.fetch_http(url)
+        if response['status'] != 200:
+            raise PageStatusError(response['status'])
+        if looks_like_challenge(response['html']):
+            raise ChallengePageError(f"challenge page at {url}")
+        
+        self.metrics.count('pages')
+        self.archive_page(url, response['html'], url, 'http')
+        with self.metrics.span('parse', url):
+            company_data = parse_company_html(response['html'], url)
+        if not is_complete_company_data(company_data):
+            return None
+        
+        print(f"[{index}/{total or '?'}] ⚡ {url.split('/')[-1][:50]} (HTTP)")
+        self.print_company_summary(company_data)
+        return company_data
+    
+    async def extract_review_pages(self, context, company_data: Dict[str, Any], page: Optional[Page] = None):
+        """
+        Fetch a company's remaining review pages and append their reviews in page order.
+        The caller's worker slot (and page, if it has one) fetches them one after another; helpers
+        join in only for rate controller slots that are free right now, and stop after a decrease,
+        so the review fan-out never takes the crawl past its allowed concurrency.
+        """
+        page_urls = plan_review_page_urls(company_data, self.max_review_pages)
+        if not page_urls:
+            return
+        
+        results: List[List[Dict[str, str]]] = [[] for _ in page_urls]
+        pending = list(enumerate(page_urls))
+        
+        async def fetch(position: int, page_url: str, page: Optional[Page]) -> Optional[Page]:
+            reviews = None
+            if self.http_fetcher:
+                try:
+                    response = await self.fetch_http(page_url)
+                    if response['status'] == 200:
+                        self.metrics.count('pages')
+                        self.archive_page(page_url, response['html'], company_data['companyUrl'], 'http')
+                        with self.metrics.span('parse', page_url):
+                            reviews = parse_company_html(response['html'], page_url)['reviews'] or None
+                except Exception:
+                    reviews = None
+            if reviews is None:
+                # Not server-rendered (or no HTTP client): render it like a profile page
+                try:
+                    if page is None:
+                        page = await self.new_page(context)
+                    await self.throttle(page_url)
+                    await self.navigate(page, page_url)
+                    await self.wait_until_settled(page, 'review-page', selector=REVIEW_CONTAINER_SELECTOR)
+                    with self.metrics.span('evaluate', page_url):
+                        reviews = (await page.evaluate(COMPANY_EXTRACTION_JS))['reviews']
+                    if self.snapshots:
+                        self.archive_page(page_url, await page.content(), company_data['companyUrl'], 'browser')
+                    self.report_blocked(page)
+                except Exception as e:
+                    self.metrics.count('failures')
+                    print(f"   ❌ Review page failed: {page_url} ({str(e)[:60]})")
+                    reviews = []
+            results[position] = reviews
+            return page
+        
+        async def owner():
+            own_page = None
+            try:
+                while pending:
+                    own_page = await fetch(*pending.pop(0), page or own_page)
+            finally:
+                if own_page is not None and own_page is not page:
+                    await self.close_page(own_page)
+        
+        async def helper():
+            if not self.rate_controller.try_acquire():
+                return
+            helper_page = None
+            try:
+                while pending and not self.rate_controller.over_limit:
+                    helper_page = await fetch(*pending.pop(0), helper_page)
+            finally:
+                self.rate_controller.release()
+                if helper_page is not None:
+                    await self.close_page(helper_page)
+        
+        helpers = min(self.rate_controller.limit, len(page_urls)) - 1
+        await asyncio.gather(owner(), *(helper() for _ in range(helpers)))
+        
+        added = sum(len(reviews) for reviews in results)
+        for reviews in results:
+            company_data['reviews'].extend(reviews)
+        print(f"   📄 {company_data['companyUrl'].split('/')[-1][:50]}: +{added} review(s) from {len(page_urls)} more review page(s)")
+    
     def is_duplicate_review(self, company_name: str, reviewer_name: str, review_text: str) -> bool:
         """Check if a review is a duplicate"""
-        # Create a unique key from company, reviewer, and part of review text
-        review_key = (
-            company_name.lower().strip(),
-            reviewer_name.lower().strip(),
-            review_text[:100].lower().strip()  # First 100 chars
-        )
+        return self.seen_reviews.check_and_add(company_name, reviewer_name, review_text)
+    
+    def build_review_row(self, company_data: Dict[str, Any], review: Dict[str, Any]) -> Dict[str, str]:
+        """Map one extracted review onto the export columns"""
+        # FIXED: Proper column mapping to match headers exactly
+        return {
+            'Company': company_data.get('companyName', ''),
+            'Service Provider': company_data.get('companyName', ''),
+            'Service': review.get('service', '') or (', '.join(company_data.get('services', [])[:3]) if company_data.get('services') else ''),
+            'Project Summary': review.get('projectSummary', ''),
+            'Start Date': review.get('startDate', ''),
+            'Budget': review.get('budget', ''),
+            'Rating': review.get('rating', ''),
+            'Review': review.get('reviewText', ''),
+            'Reviewer Name': review.get('reviewerName', ''),
+            'Reviewer Position': review.get('reviewerPosition', ''),
+            'Reviewer Company': review.get('reviewerCompany', ''),
+            'Company Outsourced Industry': review.get('reviewerIndustry', ''),
+            'Person LinkedIn URL': '',
+            'Company URL': company_data.get('companyUrl', ''),
+            'Reviewer Location': review.get('reviewerLocation', '') or company_data.get('location', ''),
+            'Employee Size': company_data.get('employeeSize', ''),
+            'Job Change': '',
+        }
+    
+    def restore_from_journal(self):
+        """Reload finished companies from the journal and rebuild dedupe state from their rows"""
+        completed = self.journal.load()
+        for company_url, rows in completed.items():
+            for row in rows:
+                self.is_duplicate_review(row['Company'], row['Reviewer Name'], row['Review'])
+                self.data.append(row)
+        self.completed_urls = set(completed)
+        print(f"♻️  Resuming: {len(self.completed_urls)} compan(ies) and {len(self.data)} row(s) restored from {self.journal.path}\n")
+    
+    def merge_company_data(self, company_data: Optional[Dict[str, Any]]):
+        """Dedupe a company's reviews, append the surviving rows to self.data and journal them"""
+        if not company_data:
+            return
         
-        if review_key in self.seen_reviews:
-            return True
+        company_url = company_data.get('companyUrl', '')
+        label = company_url.split('/')[-1][:50]
+        reviews = company_data.pop('reviews', [])
+        rows = []
+        self.metrics.count('companies')
+        self.metrics.count('reviews', len(reviews))
         
-        self.seen_reviews.add(review_key)
-        return False
+        # Reviews are already filtered in JavaScript - only named reviews come through
+        if not reviews:
+            print(f"   ⚠️  {label}: Skipped, no named reviews found")
+            if self.journal:
+                self.journal.record(company_url, rows)
+            if self.on_company:
+                self.on_company(company_url, rows)
+            return
+        
+        added_count = 0
+        duplicate_count = 0
+        
+        with self.metrics.span('dedupe', company_url):
+            for review in reviews:
+                # Check for duplicates before adding
+                if self.is_duplicate_review(
+                    company_data.get('companyName', ''),
+                    review.get('reviewerName', ''),
+                    review.get('reviewText', '')
+                ):
+                    duplicate_count += 1
+                    continue
+                
+                rows.append(self.build_review_row(company_data, review))
+                added_count += 1
+        
+        self.metrics.count('duplicates', duplicate_count)
+        self.metrics.count('rows', added_count)
+        self.data.extend(rows)
+        if self.journal:
+            self.journal.record(company_url, rows)
+        if self.on_company:
+            self.on_company(company_url, rows)
+        
+        print(f"   ✅ {label}: Added {added_count} unique review(s)")
+        if duplicate_count > 0:
+            print(f"   🔄 {label}: Skipped {duplicate_count} duplicate(s)")
+    
+    async def extract_all_companies(self, context, company_urls: List[str]):
+        """Extract company details for a known list of URLs"""
+        async def from_list():
+            for company_url in company_urls:
+                yield company_url
+        
+        return await self.extract_company_stream(context, from_list(), total=len(company_urls))
+    
+    async def extract_company_stream(self, context, company_urls: AsyncIterator[str],
+                                     total: Optional[int] = None) -> int:
+        """Feed URLs from an async source through a bounded queue to a pool of detail pages"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        worker_count = self.concurrency if total is None else max(1, min(self.concurrency, total))
+        produced = 0
+        
+        # Results are merged in discovery order, so self.data does not depend on finish order
+        finished: Dict[int, Optional[Dict[str, Any]]] = {}
+        next_to_merge = 1
+        
+        async def producer():
+            nonlocal produced
+            async for company_url in company_urls:
+                if canonicalize_url(company_url) in self.completed_urls:
+                    continue  # Already journaled by an earlier run
+                produced += 1
+                await queue.put((produced, company_url))
+            # On failure the workers are cancelled instead (a full queue would block these puts)
+            for _ in range(worker_count):
+                await queue.put(None)
+        
+        async def worker():
+            nonlocal next_to_merge
+            page = None  # Only opened once a profile actually needs the browser
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    idx, company_url = item
+                    
+                    # Only as many workers as the rate controller currently allows are active
+                    await self.rate_controller.acquire()
+                    try:
+                        company_data = None
+                        try:
+                            with self.metrics.span('company', company_url):
+                                if self.http_fetcher:
+                                    company_data = await self.extract_company_details_http(company_url, idx, total)
+                                if company_data:
+                                    self.http_hits += 1
+                                else:
+                                    if self.http_fetcher:
+                                        self.browser_fallbacks += 1
+                                    if page is None:
+                                        page = await self.new_page(context)
+                                    await self.throttle(company_url)
+                                    company_data = await self.extract_company_details(page, company_url, idx, total)
+                                if company_data:
+                                    with self.metrics.span('review_pages', company_url):
+                                        await self.extract_review_pages(context, company_data, page)
+                        except Exception as e:
+                            # e.g. opening a page failed: goes to the retry queue like any other failure
+                            self.metrics.count('failures')
+                            self.retry_queue.record(company_url, e, idx)
+                            print(f"   ❌ {type(e).__name__}: {str(e)[:80]}")
+                            company_data = None
+                            if page is not None:
+                                try:
+                                    await self.close_page(page)
+                                except Exception:
+                                    pass
+                                page = None
+                        finally:
+                            # Always marked finished, so the ordered merge never waits on a lost index
+                            finished[idx] = company_data
+                        
+                        while next_to_merge in finished:
+                            self.merge_company_data(finished.pop(next_to_merge))
+                            next_to_merge += 1
+                        
+                        page = await self.recycle_page(context, page)
+                        # Human-like pause, adapted to how the site is coping
+                        await asyncio.sleep(self.rate_controller.delay)
+                    finally:
+                        self.rate_controller.release()
+            finally:
+                if page is not None:
+                    await self.close_page(page)
+        
+        tasks = [asyncio.ensure_future(producer())] + [asyncio.ensure_future(worker()) for _ in range(worker_count)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # If one task failed (or we were cancelled), don't leave the producer and other workers running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        print()
+        return produced
+
+    def retry_backoff(self, attempts: int) -> float:
+        """
+        Seconds to wait before the next attempt. Equal jitter: at least half the exponentially
+        growing backoff, plus a random share of the other half, so retries neither come too
+        soon nor land in lockstep.
+        """
+        backoff = self.retry_base_delay * 2 ** (attempts - 1)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+    
+    async def drain_retry_queue(self, context, total: Optional[int] = None) -> int:
+        """Retry failed companies with exponential backoff and jitter, a few at a time; returns how many recovered"""
+        pending = self.retry_queue.retryable()
+        if not pending:
+            return 0
+        print(f"🔁 Retrying {len(pending)} failed compan{'y' if len(pending) == 1 else 'ies'} "
+              f"(up to {self.retry_queue.max_attempts - 1} more attempt(s), {self.retry_concurrency} at a time)")
+        gate = asyncio.Semaphore(self.retry_concurrency)
+        recovered: Dict[int, Dict[str, Any]] = {}
+
+        async def retry(entry: Dict[str, Any]):
+            url, idx = entry['url'], entry['index']
+            while not entry['permanent'] and entry['attempts'] < self.retry_queue.max_attempts:
+                await asyncio.sleep(self.retry_backoff(entry['attempts']))
+                async with gate:
+                    self.metrics.count('retries')
+                    company_data = None
+                    page = None
+                    try:
+                        with self.metrics.span('retry', url):
+                            if self.http_fetcher:
+                                company_data = await self.extract_company_details_http(url, idx, total)
+                            if not company_data:
+                                page = await self.new_page(context)
+                                await self.throttle(url)
+                                company_data = await self.extract_company_details(page, url, idx, total)
+                            if company_data:
+                                await self.extract_review_pages(context, company_data, page)
+                    except Exception as e:
+                        # e.g. opening a page failed: counts as another failed attempt
+                        self.metrics.count('failures')
+                        self.retry_queue.record(url, e, idx)
+                        company_data = None
+                    finally:
+                        if page is not None:
+                            try:
+                                await self.close_page(page)
+                            except Exception:
+                                pass
+                if company_data:
+                    recovered[idx] = company_data
+                    self.retry_queue.resolve(url)
+                    return
+
+        await asyncio.gather(*(retry(entry) for entry in pending))
+        # Merged in discovery order, after everything that succeeded first time
+        for idx in sorted(recovered):
+            self.merge_company_data(recovered[idx])
+        self.metrics.count('recovered', len(recovered))
+        print(f"🔁 Recovered {len(recovered)} of {len(pending)}\n")
+        return len(recovered)
+
+    def report_failures(self):
+        """Print (and optionally write) the companies that failed for good"""
+        failures = self.retry_queue.failures()
+        self.metrics.count('permanent_failures', len(failures))
+        for entry in failures:
+            self.metrics.event('dead_letter', url=entry['url'], error=entry['error'],
+                               attempts=entry['attempts'], permanent=entry['permanent'])
+        listing_failures = self.listing_failures.failures()
+        for entry in listing_failures:
+            self.metrics.event('dead_letter', url=entry['url'], error=entry['error'],
+                               attempts=entry['attempts'], permanent=entry['permanent'])
+            print(f"☠️  Listing page {entry['index']} never loaded: {entry['url']}  {entry['error']}: "
+                  f"{entry['message'][:80]}")
+        if self.dead_letter_path and (failures or listing_failures or self.retry_queue.recovered):
+            self.retry_queue.write(self.dead_letter_path, listing_failures)
+        if not failures:
+            return
+        print(f"☠️  {len(failures)} compan{'y' if len(failures) == 1 else 'ies'} failed permanently:")
+        for entry in failures:
+            print(f"   - {entry['url']}  {entry['error']} after {entry['attempts']} attempt(s): {entry['message'][:80]}")
+        if self.dead_letter_path:
+            print(f"   Dead-letter file: {self.dead_letter_path}")
+        print()
     
-    async def scrape(self, max_companies: int = 10, headless: bool = False):
+    async def scrape(self, max_companies: Optional[int] = 10, headless: bool = False,
+                     max_pages: Optional[int] = None):
         """Main scraping process"""
         print("=" * 80)
         print("  🤖 GoodFirms Human-Like Scraper - FIXED VERSION")
         print("=" * 80)
         print(f"  Target: {self.base_url}")
-        print(f"  Max companies: {max_companies}")
+        print(f"  Max companies: {max_companies or 'all'}")
+        print(f"  Max listing pages: {max_pages or 'all'}")
+        print(f"  Concurrency: {self.concurrency} page(s), {'adaptive' if self.rate_controller.adaptive else 'fixed'} rate")
+        print(f"  Resource blocking: {'on' if self.resource_blocker else 'off'}")
+        print(f"  HTTP-first profiles: {'on' if self.http_first else 'off'}")
         print(f"  Headless: {headless}")
         print("=" * 80)
         print()
         
         start_time = time.time()
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=headless,
-                args=['--start-maximized']
-            )
-            
-            context = await browser.new_context(
+        company_count = await self.crawl(
+            lambda listing_page: self.iter_company_urls(listing_page, max_companies, max_pages), headless
+        )
+        if not company_count:
+            print("❌ No companies found.")
+        
+        self.print_summary(time.time() - start_time)
+    
+    async def launch_browser(self, p, headless: bool):
+        """Start Chromium and the shared context every scraper page is opened from"""
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=['--start-maximized']
+        )
+        return browser, await self.new_context(browser)
+    
+    async def new_context(self, browser):
+        """A browser context, behind a ContextRecycler unless recycling is switched off"""
+        async def factory():
+            return await browser.new_context(
                 viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                user_agent=USER_AGENT
             )
-            
-            page = await context.new_page()
-            
-            # Phase 1: Get company URLs
-            print("📋 PHASE 1: Collecting Company URLs\n")
-            company_urls = await self.extract_company_urls(page, max_companies)
-            
-            if not company_urls:
-                print("❌ No companies found. Exiting.")
-                await browser.close()
-                return
-            
-            print()
-            print("=" * 80)
-            print(f"📊 PHASE 2: Extracting Data from {len(company_urls)} Companies")
-            print("=" * 80)
-            print()
-            
-            # Phase 2: Extract data from each company
-            for idx, company_url in enumerate(company_urls, 1):
-                company_data = await self.extract_company_details(page, company_url, idx, len(company_urls))
-                
-                if company_data:
-                    reviews = company_data.pop('reviews', [])
-                    
-                    # Reviews are already filtered in JavaScript - only named reviews come through
-                    if not reviews:
-                        print(f"   ⚠️  Skipped: No named reviews found")
-                        print()
-                        continue
-                    
-                    added_count = 0
-                    duplicate_count = 0
-                    
-                    for review in reviews:
-                        # Check for duplicates before adding
-                        if self.is_duplicate_review(
-                            company_data.get('companyName', ''),
-                            review.get('reviewerName', ''),
-                            review.get('reviewText', '')
-                        ):
-                            duplicate_count += 1
-                            continue
-                        
-                        # FIXED: Proper column mapping to match headers exactly
-                        row = {
-                            'Company': company_data.get('companyName', ''),
-                            'Service Provider': company_data.get('companyName', ''),
-                            'Service': review.get('service', '') or (', '.join(company_data.get('services', [])[:3]) if company_data.get('services') else ''),
-                            'Project Summary': review.get('projectSummary', ''),
-                            'Start Date': review.get('startDate', ''),
-                            'Budget': review.get('budget', ''),
-                            'Rating': review.get('rating', ''),
-                            'Review': review.get('reviewText', ''),
-                            'Reviewer Name': review.get('reviewerName', ''),
-                            'Reviewer Position': review.get('reviewerPosition', ''),
-                            'Reviewer Company': review.get('reviewerCompany', ''),
-                            'Company Outsourced Industry': review.get('reviewerIndustry', ''),
-                            'Person LinkedIn URL': '',
-                            'Company URL': company_data.get('companyUrl', ''),
-                            'Reviewer Location': review.get('reviewerLocation', '') or company_data.get('location', ''),
-                            'Employee Size': company_data.get('employeeSize', ''),
-                            'Job Change': '',
-                        }
-                        self.data.append(row)
-                        added_count += 1
-                    
-                    print(f"   ✅ Added {added_count} unique review(s)")
-                    if duplicate_count > 0:
-                        print(f"   🔄 Skipped {duplicate_count} duplicate(s)")
-                
-                # Human-like delay
-                await asyncio.sleep(self.delay)
-                print()
-            
-            await browser.close()
         
-        elapsed = time.time() - start_time
+        if self.recycle_limits is None:
+            return await factory()
+        return ContextRecycler(factory, **self.recycle_limits, metrics=self.metrics)
+    
+    async def renew_listing_page(self, page: Page) -> Page:
+        """Swap run_stream's listing page for a fresh one once it (or its retired context) is worn out"""
+        if page is not self.listing_page:
+            return page  # Someone else's page (e.g. extract_company_urls on its own)
+        fresh = await self.recycle_page(self.listing_context, page)
+        if fresh is None:
+            self.listing_page = fresh = await self.new_page(self.listing_context)
+        return fresh
+    
+    async def recycle_page(self, context, page: Optional[Page]) -> Optional[Page]:
+        """Close a worker's page once it (or its context) is worn out; the worker opens a fresh one when next needed"""
+        if page is not None and isinstance(context, ContextRecycler) and context.is_worn(page):
+            self.metrics.count('recycled_pages')
+            await self.close_page(page)
+            return None
+        return page
+    
+    async def run_stream(self, context, source_factory: Callable[[Page], AsyncIterator[str]]) -> int:
+        """Crawl listing pages and extract companies as their URLs stream in"""
+        self.listing_context = context
+        self.listing_page = listing_page = await self.new_page(context)
+        # A fetcher handed in from outside (e.g. the daemon's warm one) is left open for its owner
+        owns_fetcher = self.http_first and self.http_fetcher is None
+        if owns_fetcher:
+            self.http_fetcher = HttpFetcher(
+                max_connections=self.concurrency * 2,
+                cache=self.page_cache,
+                rate_limiter=self.rate_limiter,
+            )
+        
+        if self.memory_limit_mb:
+            self.memory_watchdog = MemoryWatchdog(
+                self.rate_controller, self.memory_limit_mb, metrics=self.metrics,
+                recyclers=[context] if isinstance(context, ContextRecycler) else [],
+            )
+            self.memory_watchdog.start()
+        
+        try:
+            produced = await self.extract_company_stream(context, source_factory(listing_page))
+            await self.drain_retry_queue(context, produced)
+            self.report_failures()
+            return produced
+        finally:
+            if owns_fetcher:
+                await self.http_fetcher.close()
+                self.http_fetcher = None
+            if self.memory_watchdog:
+                await self.memory_watchdog.stop()
+            await self.close_page(self.listing_page)  # The original, or its latest replacement
+            self.listing_page = self.listing_context = None
+    
+    async def crawl(self, source_factory: Callable[[Page], AsyncIterator[str]], headless: bool = False) -> int:
+        """Launch a browser, run one company URL source through the worker pool and journal it"""
+        if self.journal:
+            if self.resume:
+                self.restore_from_journal()
+            self.journal.open(self.resume)
         
+        try:
+            async with async_playwright() as p:
+                browser, context = await self.launch_browser(p, headless)
+                
+                # Phase 1 + 2: Crawl listing pages and extract companies as their URLs stream in
+                print("📋 Crawling listing pages and extracting companies as they are found\n")
+                try:
+                    return await self.run_stream(context, source_factory)
+                finally:
+                    await browser.close()
+        finally:
+            if self.journal:
+                self.journal.close()
+    
+    def print_summary(self, elapsed: float):
         print("=" * 80)
         print(f"✅ SCRAPING COMPLETE!")
         print("=" * 80)
         print(f"  ⏱️  Time: {elapsed:.1f} seconds")
         print(f"  📊 Records: {len(self.data)}")
-        print(f"  🏢 Companies: {len(set(r['Company'] for r in self.data))}")
-        print(f"  ⭐ Reviews: {sum(1 for r in self.data if r['Review'])}")
-        print(f"  👤 Unique reviewers: {len(set(r['Reviewer Name'] for r in self.data if r['Reviewer Name']))}")
+        print(f"  🏢 Companies: {len(set(self.data.column('Company')))}")
+        print(f"  ⭐ Reviews: {sum(1 for review in self.data.column('Review') if review)}")
+        print(f"  👤 Unique reviewers: {len(set(name for name in self.data.column('Reviewer Name') if name))}")
+        self.print_phase_summary()
+        if self.metrics.counters.get('failures'):
+            print(f"  ❌ Failed pages: {self.metrics.counters['failures']}")
+        if self.metrics.counters.get('retries'):
+            print(f"  🔁 Retries: {self.metrics.counters['retries']}, recovered: {len(self.retry_queue.recovered)}")
+        if self.retry_queue:
+            by_error = ', '.join(f"{error} ×{count}" for error, count in sorted(self.retry_queue.by_error().items()))
+            print(f"  ☠️  Permanent failures: {len(self.retry_queue)} ({by_error})")
+        if self.rate_controller.decisions or self.metrics.counters.get('throttled'):
+            print(f"  🚦 Throttling signals: {self.metrics.counters.get('throttled', 0)}, "
+                  f"rate changes: {len(self.rate_controller.decisions)}, "
+                  f"ended at {self.rate_controller.limit} worker(s) / {self.rate_controller.delay:.2f}s pause"
+                  f"{f' / {self.rate_controller.rate:.2f} req/s' if self.rate_controller.rate else ''}")
+        if self.metrics.counters.get('recycled_pages') or self.metrics.counters.get('recycled_contexts'):
+            print(f"  ♻️  Recycled pages: {self.metrics.counters.get('recycled_pages', 0)}, "
+                  f"contexts: {self.metrics.counters.get('recycled_contexts', 0)}")
+        if self.memory_watchdog:
+            print(f"  🧠 Peak RSS: python {self.memory_watchdog.peak_python / 1024 / 1024:.0f} MB, "
+                  f"browser {self.memory_watchdog.peak_browser / 1024 / 1024:.0f} MB")
+        if self.seen_reviews.near_duplicate_count:
+            print(f"  🔁 Near-duplicate reviews skipped: {self.seen_reviews.near_duplicate_count}")
+        if self.page_cache:
+            print(f"  💾 Page cache: {self.page_cache.hits} hit(s), {self.page_cache.revalidated} revalidated, {self.page_cache.misses} miss(es)")
+        if self.http_first:
+            print(f"  ⚡ Profiles via HTTP: {self.http_hits}, browser fallbacks: {self.browser_fallbacks}")
+        if self.resource_blocker:
+            print(f"  🚫 Blocked requests: {self.resource_blocker.total_requests} (~{self.resource_blocker.total_bytes / 1024 / 1024:.1f} MB saved)")
         print("=" * 80)
         print()
     
+    def export(self, filename: str, fmt: Optional[str] = None, rows: Optional[Iterable[Dict[str, str]]] = None,
+               chunk_size: int = 10_000, normalize: bool = True, keep_raw: bool = False) -> Dict[str, Any]:
+        """Stream rows (self.data by default) to XLSX, CSV, JSONL or Parquet in bounded memory, with typed columns"""
+        if rows is None:
+            if not self.data:
+                print("❌ No data to export!")
+                return None
+            rows = self.data
+        
+        with self.metrics.span('export', filename):
+            stats = export_rows(rows, filename, fmt=fmt, chunk_size=chunk_size, normalize=normalize, keep_raw=keep_raw)
+        if rows is self.data:
+            self.seen_reviews.commit()  # Only now are this run's reviews safely delivered
+        self.metrics.count('exported_rows', stats['rows'])
+        if not stats['rows']:
+            print("❌ No data to export!")
+            return stats
+        
+        print(f"✅ {stats['format'].upper()} file created: {filename}")
+        print(f"   📊 Total rows: {stats['rows']}")
+        print(f"   🏢 Unique companies: {stats['companies']}")
+        print(f"   👤 All reviews have named reviewers: {stats['filled']['Reviewer Name'] == stats['rows']}")
+        print(f"   💼 Reviews with position: {stats['filled']['Reviewer Position']}")
+        print(f"   🏢 Reviews with company: {stats['filled']['Reviewer Company']}")
+        print(f"   ⭐ Reviews with rating: {stats['filled']['Rating']}")
+        print(f"   💰 Reviews with budget: {stats['filled']['Budget']}")
+        print(f"   📍 Reviews with location: {stats['filled']['Reviewer Location']}")
+        return stats
+    
     def export_to_excel(self, filename: str = 'GoodFirms_AI_Companies_USA_FIXED.xlsx'):
         """Export data to Excel with proper formatting"""
-        if not self.data:
-            print("❌ No data to export!")
-            return
+        return self.export(self.output_name(filename), fmt='xlsx')
+    
+    def output_name(self, filename: str) -> str:
+        """With a persistent dedupe index the rows are only this run's new reviews: give them their own file"""
+        if not self.seen_reviews.persistent:
+            return filename
+        root, ext = os.path.splitext(filename)
+        return f"{root}.new-{datetime.now():%Y%m%d-%H%M%S}{ext}"
+    
+    def to_dataframe(self, normalize: bool = True) -> pd.DataFrame:
+        """All rows as one DataFrame, with the typed NORMALIZED_COLUMNS for analysis"""
+        frames = [normalize_review_frame(frame) if normalize else frame for frame in self.data.iter_frames()]
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        return pd.DataFrame(columns=EXPORT_COLUMNS + NORMALIZED_COLUMNS if normalize else EXPORT_COLUMNS)
+
+
+class CrawlScheduler:
+    """Run many listing targets through one browser, one worker pool and one company dedupe"""
+
+    def __init__(self, scraper: HumanLikeGoodFirmsScraper, targets: List[Dict[str, Any]]):
+        self.scraper = scraper
+        self.targets = targets
+        self.target_companies: Dict[str, List[str]] = {target['name']: [] for target in targets}
+
+    @staticmethod
+    def load_manifest(path: str) -> List[Dict[str, Any]]:
+        """
+        Read crawl targets from a JSON manifest, either a list or {"targets": [...]}:
         
-        # Define columns in exact order needed
-        columns = [
-            'Company',
-            'Service Provider',
-            'Service',
-            'Project Summary',
-            'Start Date',
-            'Budget',
-            'Rating',
-            'Review',
-            'Reviewer Name',
-            'Reviewer Position',
-            'Reviewer Company',
-            'Company Outsourced Industry',
-            'Person LinkedIn URL',
-            'Company URL',
-            'Reviewer Location',
-            'Employee Size',
-            'Job Change'
-        ]
+            [{"url": "https://www.goodfirms.co/artificial-intelligence/usa",
+              "name": "ai-usa", "max_companies": 50, "max_pages": null,
+              "output": "GoodFirms_ai-usa.xlsx"}]
         
-        # Create DataFrame with explicit column order
-        df = pd.DataFrame(self.data, columns=columns)
+        Only "url" is required.
+        """
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        targets = manifest['targets'] if isinstance(manifest, dict) else manifest
         
-        # Clean data
-        df = df.fillna('')
+        for target in targets:
+            path_parts = [part for part in urlsplit(target['url']).path.split('/') if part]
+            target.setdefault('name', '-'.join(path_parts) or urlsplit(target['url']).netloc)
+            target.setdefault('max_companies', None)
+            target.setdefault('max_pages', None)
+            target.setdefault('output', f"GoodFirms_{target['name']}.xlsx")
+        return targets
+
+    async def iter_all_company_urls(self, listing_page: Page) -> AsyncIterator[str]:
+        """Chain every target's listing frontier, yielding each company only the first time it appears"""
+        seen: Set[str] = set()
+        for target in self.targets:
+            print(f"\n🎯 Target: {target['name']} ({target['url']})")
+            async for company_url in self.scraper.iter_company_urls(
+                listing_page, target['max_companies'], target['max_pages'], base_url=target['url']
+            ):
+                self.target_companies[target['name']].append(company_url)
+                if company_url in seen:
+                    continue  # Already fetched for an earlier target; its rows are shared
+                seen.add(company_url)
+                yield company_url
+
+    async def run(self, headless: bool = False):
+        print("=" * 80)
+        print(f"  🗂️  GoodFirms multi-target crawl: {len(self.targets)} target(s)")
+        print("=" * 80)
         
-        # Remove rows where all fields are empty
-        df = df[df.astype(str).apply(lambda x: x.str.strip().str.len().sum(), axis=1) > 0]
+        start_time = time.time()
+        await self.scraper.crawl(self.iter_all_company_urls, headless)
+        self.scraper.print_summary(time.time() - start_time)
         
-        # Remove exact duplicate rows
-        df = df.drop_duplicates()
+        listed = sum(len(urls) for urls in self.target_companies.values())
+        unique = len({url for urls in self.target_companies.values() for url in urls})
+        print(f"  🎯 {listed} target listing(s) resolved to {unique} unique compan(ies)\n")
+
+    def export(self):
+        """Write one output file per target from the shared rows"""
+        rows_by_company: Dict[str, List[int]] = {}
+        for index, company_url in enumerate(self.scraper.data.column('Company URL')):
+            rows_by_company.setdefault(company_url, []).append(index)
         
-        # Export
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Companies & Reviews')
-            
-            worksheet = writer.sheets['Companies & Reviews']
-            
-            # Set column widths - ALIGNED WITH ACTUAL COLUMNS
-            column_widths = {
-                'A': 25,  # Company
-                'B': 25,  # Service Provider
-                'C': 20,  # Service
-                'D': 40,  # Project Summary
-                'E': 15,  # Start Date
-                'F': 15,  # Budget
-                'G': 10,  # Rating
-                'H': 60,  # Review
-                'I': 25,  # Reviewer Name
-                'J': 30,  # Reviewer Position
-                'K': 30,  # Reviewer Company
-                'L': 20,  # Company Outsourced Industry
-                'M': 30,  # Person LinkedIn URL
-                'N': 50,  # Company URL
-                'O': 25,  # Reviewer Location
-                'P': 15,  # Employee Size
-                'Q': 15,  # Job Change
-            }
-            
-            for col, width in column_widths.items():
-                worksheet.column_dimensions[col].width = width
+        for target in self.targets:
+            print(f"🎯 {target['name']}")
+            indices = [i for url in self.target_companies[target['name']] for i in rows_by_company.get(url, [])]
+            if not indices:
+                print("❌ No data to export!\n")
+                continue
+            self.scraper.export(self.scraper.output_name(target['output']),
+                                rows=(self.scraper.data[i] for i in indices))
+            print()
+        self.scraper.seen_reviews.commit()
+
+
+async def iter_urls(urls: Iterable[str]) -> AsyncIterator[str]:
+    """Async URL source over a fixed list"""
+    for url in urls:
+        yield url
+
+
+def shard_for_url(url: str, shard_count: int) -> int:
+    """Stable shard assignment: the same company always lands in the same shard"""
+    digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+
+def run_shard(shard: int, company_urls: List[str], scraper_options: Dict[str, Any],
+              headless: bool, output_path: str) -> Dict[str, Any]:
+    """Worker-process entry point: crawl one shard with its own browser, journal and partial output"""
+    scraper = HumanLikeGoodFirmsScraper(**scraper_options)
+    print(f"🧩 Shard {shard}: {len(company_urls)} compan(ies)")
+    asyncio.run(scraper.crawl(lambda listing_page: iter_urls(company_urls), headless))
+    export_rows(scraper.data, output_path, fmt='jsonl', normalize=False)  # Raw rows; the merged export normalizes
+    scraper.seen_reviews.close()
+    if scraper.snapshots:
+        scraper.snapshots.close()
+    scraper.write_metrics()
+    return {'shard': shard, 'companies': len(company_urls), 'rows': len(scraper.data), 'output': output_path}
+
+
+class ShardedCrawl:
+    """Split the company set across worker processes by URL hash, then merge with global dedupe"""
+
+    def __init__(self, scraper_options: Dict[str, Any], shard_count: int = 0, workdir: str = 'goodfirms_shards'):
+        self.scraper_options = scraper_options
+        self.shard_count = shard_count or os.cpu_count() or 1
+        self.workdir = workdir
+
+    def shard_options(self, shard: int) -> Dict[str, Any]:
+        """Per-shard scraper settings: own journal, in-memory dedupe, a share of the rate and memory limits"""
+        options = dict(self.scraper_options)
+        options['requests_per_second'] = options.get('requests_per_second', 1.0) / self.shard_count
+        if options.get('memory_limit_mb'):
+            options['memory_limit_mb'] = options['memory_limit_mb'] / self.shard_count
+        options['journal_path'] = os.path.join(self.workdir, f'journal.shard{shard}.jsonl')
+        options['dedupe_index_path'] = None  # Global dedupe happens once, at merge time
+        for key in ('metrics_path', 'prometheus_path', 'dead_letter_path'):
+            if options.get(key):
+                root, ext = os.path.splitext(os.path.basename(options[key]))
+                options[key] = os.path.join(self.workdir, f'{root}.shard{shard}{ext}')
+        return options
+
+    async def collect_company_urls(self, max_companies: Optional[int], max_pages: Optional[int],
+                                   headless: bool) -> List[str]:
+        scraper = HumanLikeGoodFirmsScraper(**dict(self.scraper_options, journal_path=None, dedupe_index_path=None,
+                                                   metrics_path=None, prometheus_path=None, snapshot_path=None))
+        async with async_playwright() as p:
+            browser, context = await scraper.launch_browser(p, headless)
+            try:
+                return await scraper.extract_company_urls(await scraper.new_page(context), max_companies, max_pages)
+            finally:
+                await browser.close()
+
+    async def run(self, max_companies: Optional[int] = None, max_pages: Optional[int] = None,
+                  headless: bool = True) -> HumanLikeGoodFirmsScraper:
+        """Collect URLs, crawl every shard in its own process and return a scraper holding the merged rows"""
+        start_time = time.time()
+        os.makedirs(self.workdir, exist_ok=True)
+        
+        company_urls = await self.collect_company_urls(max_companies, max_pages, headless)
+        partitions: List[List[str]] = [[] for _ in range(self.shard_count)]
+        for company_url in company_urls:
+            partitions[shard_for_url(company_url, self.shard_count)].append(company_url)
+        
+        print(f"🧩 Crawling {len(company_urls)} compan(ies) in {self.shard_count} shard process(es)\n")
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=self.shard_count, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, run_shard, shard, urls, self.shard_options(shard), headless,
+                    os.path.join(self.workdir, f'rows.shard{shard}.jsonl'),
+                )
+                for shard, urls in enumerate(partitions) if urls
+            ))
+        
+        merged = self.merge(company_urls, [result['output'] for result in results])
+        merged.print_summary(time.time() - start_time)
+        return merged
+
+    def merge(self, company_urls: List[str], outputs: List[str]) -> HumanLikeGoodFirmsScraper:
+        """Combine shard outputs in listing order, applying the global (persistent) review dedupe"""
+        rows_by_company: Dict[str, List[Dict[str, str]]] = {}
+        for output in outputs:
+            if not os.path.exists(output):
+                continue
+            with open(output, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        rows_by_company.setdefault(row['Company URL'], []).append(row)
+        
+        merged = HumanLikeGoodFirmsScraper(
+            self.scraper_options.get('base_url', ''),
+            dedupe_index_path=self.scraper_options.get('dedupe_index_path'),
+            near_duplicates=self.scraper_options.get('near_duplicates', False),
+            metrics_path=self.scraper_options.get('metrics_path'),
+            prometheus_path=self.scraper_options.get('prometheus_path'),
+        )
+        duplicates = 0
+        for company_url in company_urls:
+            with merged.metrics.span('dedupe', company_url):
+                for row in rows_by_company.get(company_url, []):
+                    if merged.is_duplicate_review(row['Company'], row['Reviewer Name'], row['Review']):
+                        duplicates += 1
+                        continue
+                    merged.data.append(row)
+        merged.metrics.count('duplicates', duplicates)
+        merged.metrics.count('rows', len(merged.data))
+        
+        print(f"🧩 Merged {len(outputs)} shard(s): {len(merged.data)} row(s), {duplicates} cross-shard duplicate(s) dropped")
+        return merged
+
+
+class ScraperDaemon:
+    """
+    Keep one warm browser with a pool of contexts and run crawl jobs as they are submitted.
+    
+    Jobs are one JSON object, either written as a line to the Unix socket or dropped
+    as <name>.json into the drop directory:
+    
+        {"url": "https://www.goodfirms.co/artificial-intelligence/usa",
+         "max_companies": 20, "max_pages": null, "output": "ai-usa.xlsx", "format": null}
+    
+    Only "url" is required. Progress comes back as JSON lines (on the socket, or in
+    <name>.events.jsonl): accepted, started, one "company" event with its rows per
+    company, then done or error. {"command": "status"} and {"command": "shutdown"}
+    are also accepted.
+    """
+
+    def __init__(self, scraper_options: Dict[str, Any], socket_path: Optional[str] = 'goodfirms.sock',
+                 drop_dir: Optional[str] = None, contexts: int = 2, headless: bool = True):
+        self.scraper_options = scraper_options
+        self.socket_path = socket_path
+        self.drop_dir = drop_dir
+        self.context_count = max(1, contexts)
+        self.headless = headless
+        # Shared by every job, so concurrent jobs stay polite and reuse cached pages and open connections
+        self.rate_limiter = HostRateLimiter(scraper_options.get('requests_per_second', 1.0))
+        # One AIMD controller drives that limiter for all jobs, so a backoff in one job holds for the others
+        self.rate_controller = AdaptiveRateController(
+            max(1, scraper_options.get('concurrency', 4)), scraper_options.get('delay', 2.0),
+            adaptive=scraper_options.get('adaptive_rate', True), rate_limiter=self.rate_limiter,
+        )
+        cache_path = scraper_options.get('cache_path')
+        self.page_cache = PageCache(cache_path, scraper_options.get('cache_ttl_seconds', 24 * 3600)) if cache_path else None
+        snapshot_path = scraper_options.get('snapshot_path')
+        self.snapshots = SnapshotArchive(snapshot_path) if snapshot_path else None
+        self.http_fetcher: Optional[HttpFetcher] = None
+        self.contexts: Optional[asyncio.Queue] = None
+        self.stopping: Optional[asyncio.Event] = None
+        self.jobs_started = 0
+        self.running: Dict[int, Dict[str, Any]] = {}
+        self.drop_tasks: Set[asyncio.Task] = set()
+
+    def job_scraper(self, job: Dict[str, Any]) -> HumanLikeGoodFirmsScraper:
+        """A fresh scraper for one job, wired to the daemon's shared rate control, cache and HTTP client"""
+        options = dict(self.scraper_options, base_url=job['url'], cache_path=None, journal_path=None, resume=False,
+                       dedupe_index_path=job.get('dedupe_index_path'), metrics_path=None, prometheus_path=None,
+                       snapshot_path=None, dead_letter_path=None)
+        for key in ('concurrency', 'near_duplicates', 'max_review_pages'):
+            if key in job:
+                options[key] = job[key]
+        
+        scraper = HumanLikeGoodFirmsScraper(**options)
+        scraper.rate_limiter = self.rate_limiter
+        scraper.rate_controller = self.rate_controller
+        scraper.page_cache = self.page_cache
+        scraper.snapshots = self.snapshots
+        if scraper.http_first:
+            scraper.http_fetcher = self.http_fetcher
+        return scraper
+
+    async def run_job(self, job: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Run one crawl job on the next free context, reporting progress through send"""
+        self.jobs_started += 1
+        job_id = self.jobs_started
+        accepted = time.perf_counter()
+        send({'event': 'accepted', 'job': job_id, 'queued': self.contexts.empty()})
+        
+        context = await self.contexts.get()
+        self.running[job_id] = job
+        started = time.perf_counter()
+        try:
+            send({'event': 'started', 'job': job_id, 'startup_ms': round((started - accepted) * 1000, 1)})
+            scraper = self.job_scraper(job)
+            scraper.on_company = lambda url, rows: send({'event': 'company', 'job': job_id, 'url': url, 'rows': rows})
+            try:
+                companies = await scraper.run_stream(context, lambda listing_page: scraper.iter_company_urls(
+                    listing_page, job.get('max_companies'), job.get('max_pages')
+                ))
+                output = None
+                if job.get('output') and scraper.data:
+                    output = scraper.output_name(job['output'])
+                    scraper.export(output, fmt=job.get('format'))
+                else:
+                    scraper.seen_reviews.commit()  # The rows went to the client as company events
+            finally:
+                scraper.seen_reviews.close()
+            result = {'event': 'done', 'job': job_id, 'companies': companies, 'rows': len(scraper.data),
+                      'output': output, 'seconds': round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            result = {'event': 'error', 'job': job_id, 'error': str(e)[:200]}
+        finally:
+            self.running.pop(job_id, None)
+            self.contexts.put_nowait(context)
+        
+        print(f"🛰️  Job {job_id} {result['event']}: {job['url']}")
+        send(result)
+        return result
+
+    async def handle(self, job: Dict[str, Any], send: Callable[[Dict[str, Any]], None]):
+        """Dispatch one submitted message: a crawl job or a daemon command"""
+        command = job.get('command', 'crawl')
+        if command == 'status':
+            send({'event': 'status', 'running': [dict(running, job=job_id) for job_id, running in self.running.items()],
+                  'idle_contexts': self.contexts.qsize(), 'jobs_started': self.jobs_started})
+        elif command == 'shutdown':
+            send({'event': 'shutdown'})
+            self.stopping.set()
+        elif command == 'crawl' and job.get('url'):
+            await self.run_job(job, send)
+        else:
+            send({'event': 'error', 'error': 'expected {"url": ...} or {"command": "status" | "shutdown"}'})
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def send(event: Dict[str, Any]):
+            writer.write((json.dumps(event) + '\n').encode('utf-8'))
+        
+        try:
+            try:
+                job = json.loads(await reader.readline())
+            except ValueError:
+                send({'event': 'error', 'error': 'expected one JSON object per line'})
+            else:
+                await self.handle(job, send)
+            await writer.drain()
+        except ConnectionError:
+            pass  # Client went away; the job (if any) still ran to completion
+        finally:
+            writer.close()
+
+    async def watch_drop_dir(self, poll_seconds: float = 1.0):
+        """Pick up <name>.json jobs from the drop directory; progress goes to <name>.events.jsonl"""
+        os.makedirs(self.drop_dir, exist_ok=True)
+        while True:
+            for name in sorted(os.listdir(self.drop_dir)):
+                if not name.endswith('.json'):
+                    continue
+                stem = os.path.join(self.drop_dir, name[:-len('.json')])
+                try:
+                    os.replace(f'{stem}.json', f'{stem}.running')  # Claim it so it only runs once
+                    with open(f'{stem}.running', encoding='utf-8') as f:
+                        job = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Skipping dropped job {name}: {e}")
+                    continue
+                
+                def send(event: Dict[str, Any], events_path: str = f'{stem}.events.jsonl'):
+                    with open(events_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(event) + '\n')
+                
+                async def run(job=job, send=send, stem=stem):
+                    await self.handle(job, send)
+                    os.replace(f'{stem}.running', f'{stem}.done')
+                
+                task = asyncio.ensure_future(run())
+                self.drop_tasks.add(task)
+                task.add_done_callback(self.drop_tasks.discard)
+            await asyncio.sleep(poll_seconds)
+
+    async def serve(self):
+        """Start the browser and context pool, then accept jobs until shutdown or Ctrl+C"""
+        self.stopping = asyncio.Event()
+        template = HumanLikeGoodFirmsScraper(**dict(self.scraper_options, cache_path=None, journal_path=None,
+                                                   dedupe_index_path=None, metrics_path=None, prometheus_path=None,
+                                                   snapshot_path=None))
+        server = None
+        watcher = None
         
-        print(f"✅ Excel file created: {filename}")
-        print(f"   📊 Total rows: {len(df)}")
-        print(f"   🏢 Unique companies: {df['Company'].nunique()}")
-        print(f"   👤 All reviews have named reviewers: {(df['Reviewer Name'] != '').all()}")
-        print(f"   💼 Reviews with position: {(df['Reviewer Position'] != '').sum()}")
-        print(f"   🏢 Reviews with company: {(df['Reviewer Company'] != '').sum()}")
-        print(f"   ⭐ Reviews with rating: {(df['Rating'] != '').sum()}")
-        print(f"   💰 Reviews with budget: {(df['Budget'] != '').sum()}")
-        print(f"   📍 Reviews with location: {(df['Reviewer Location'] != '').sum()}")
+        async with async_playwright() as p:
+            browser, context = await template.launch_browser(p, self.headless)
+            self.contexts = asyncio.Queue()
+            self.contexts.put_nowait(context)
+            for _ in range(self.context_count - 1):
+                self.contexts.put_nowait(await template.new_context(browser))
+            if template.http_first:
+                self.http_fetcher = HttpFetcher(
+                    max_connections=template.concurrency * 2 * self.context_count,
+                    cache=self.page_cache,
+                    rate_limiter=self.rate_limiter,
+                )
+            
+            try:
+                if self.socket_path:
+                    if not hasattr(asyncio, 'start_unix_server'):
+                        print("⚠️  Unix sockets are not available here - use the drop directory instead")
+                    else:
+                        if os.path.exists(self.socket_path):
+                            os.remove(self.socket_path)  # Left behind by a daemon that didn't shut down cleanly
+                        server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+                if self.drop_dir:
+                    watcher = asyncio.ensure_future(self.watch_drop_dir())
+                
+                print(f"🛰️  Daemon ready: {self.context_count} warm context(s)"
+                      f"{f', socket {self.socket_path}' if server else ''}"
+                      f"{f', drop dir {self.drop_dir}' if self.drop_dir else ''}")
+                await self.stopping.wait()
+            finally:
+                if watcher:
+                    watcher.cancel()
+                if server:
+                    server.close()
+                    await server.wait_closed()  # Lets jobs already running on the socket finish
+                if self.drop_tasks:
+                    await asyncio.gather(*self.drop_tasks, return_exceptions=True)
+                if self.http_fetcher:
+                    await self.http_fetcher.close()
+                    self.http_fetcher = None
+                if self.page_cache:
+                    self.page_cache.close()
+                if self.snapshots:
+                    self.snapshots.close()
+                await browser.close()
+                if server and os.path.exists(self.socket_path):
+                    os.remove(self.socket_path)
+                print("🛰️  Daemon stopped")
+
+
+async def submit_job(job: Dict[str, Any], socket_path: str = 'goodfirms.sock') -> Dict[str, Any]:
+    """Send one job to a running daemon, print its progress and return the final event"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write((json.dumps(job) + '\n').encode('utf-8'))
+    await writer.drain()
+    
+    event: Dict[str, Any] = {}
+    async for line in reader:
+        event = json.loads(line)
+        if event['event'] == 'company':
+            print(f"   ✅ {event['url'].split('/')[-1][:50]}: {len(event['rows'])} row(s)")
+        elif event['event'] == 'started':
+            print(f"🛰️  Job {event['job']} started after {event['startup_ms']:.0f} ms")
+        else:
+            print(f"🛰️  {json.dumps(event)}")
+    writer.close()
+    return event
+
+
+def reextract_batch(archive_path: str, ids: List[int]) -> List[Tuple[int, str, str, Optional[Dict[str, Any]]]]:
+    """Worker-process entry point: run the HTML parser over a batch of archived snapshots"""
+    archive = SnapshotArchive(archive_path)
+    results = []
+    try:
+        for snapshot_id, url, company_url, html in archive.load(ids):
+            data = None
+            if HTMLParser is not None:
+                try:
+                    data = parse_company_html(html, url)
+                except Exception:
+                    data = None
+            results.append((snapshot_id, url, company_url, data))
+    finally:
+        archive.close()
+    return results
+
+
+async def reextract_in_browser(archive: SnapshotArchive, ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+    """Run the page JS over snapshots the HTML parser couldn't handle, serving them offline to one page"""
+    results: Dict[int, Optional[Dict[str, Any]]] = {}
+    current = {'html': ''}
+    
+    async def serve(route):
+        if route.request.is_navigation_request():
+            await route.fulfill(status=200, content_type='text/html; charset=utf-8', body=current['html'])
+        else:
+            await route.abort()  # Offline: nothing is fetched from the live site
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page(user_agent=USER_AGENT)
+            await page.route('**/*', serve)
+            for snapshot_id, url, company_url, html in archive.load(ids):
+                current['html'] = html
+                try:
+                    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                    results[snapshot_id] = await page.evaluate(COMPANY_EXTRACTION_JS)
+                except Exception as e:
+                    print(f"   ❌ Browser re-extract failed: {url} ({str(e)[:60]})")
+                    results[snapshot_id] = None
+        finally:
+            await browser.close()
+    return results
+
+
+def review_page_number(url: str) -> int:
+    page = dict(parse_qsl(urlsplit(url).query)).get('page', '')
+    return int(page) if page.isdigit() else 1
+
+
+async def reextract_archive(archive_path: str, workers: int = 0, batch_size: int = 200,
+                            browser_fallback: bool = True) -> HumanLikeGoodFirmsScraper:
+    """Re-run extraction over the newest snapshot of every archived page and return a scraper holding the rows"""
+    start_time = time.time()
+    archive = SnapshotArchive(archive_path)
+    ids = archive.latest_ids()
+    batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+    workers = workers or os.cpu_count() or 1
+    print(f"🗄️  Re-extracting {len(ids)} snapshot(s) from {archive_path} with {workers} process(es)")
+    
+    # Parse in worker processes: the HTML parser is CPU-bound and each process opens the archive itself
+    snapshots: Dict[int, Tuple[str, str, Optional[Dict[str, Any]]]] = {}
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        for batch in await asyncio.gather(*(
+            loop.run_in_executor(pool, reextract_batch, archive_path, batch) for batch in batches
+        )):
+            for snapshot_id, url, company_url, data in batch:
+                snapshots[snapshot_id] = (url, company_url, data)
+    
+    def parsed(url: str, company_url: str, data: Optional[Dict[str, Any]]) -> bool:
+        if url == company_url:
+            return is_complete_company_data(data)
+        return bool(data and data.get('reviews'))
+    
+    missing = [snapshot_id for snapshot_id in ids if not parsed(*snapshots[snapshot_id])]
+    via_browser = 0
+    if missing and browser_fallback:
+        print(f"🌐 {len(missing)} snapshot(s) need the page JS, rendering them offline")
+        for snapshot_id, data in (await reextract_in_browser(archive, missing)).items():
+            url, company_url, _ = snapshots[snapshot_id]
+            if data:
+                snapshots[snapshot_id] = (url, company_url, data)
+                via_browser += 1
+    archive.close()
+    
+    # Reassemble companies: the profile first, then review pages in page order
+    pages_by_company: Dict[str, List[Tuple[str, Optional[Dict[str, Any]]]]] = {}
+    for snapshot_id in ids:
+        url, company_url, data = snapshots[snapshot_id]
+        pages_by_company.setdefault(company_url, []).append((url, data))
+    
+    scraper = HumanLikeGoodFirmsScraper('')
+    skipped = 0
+    for company_url, pages in pages_by_company.items():
+        profile = next((data for url, data in pages if url == company_url), None)
+        if not profile:
+            skipped += 1
+            continue
+        company_data = dict(profile, companyUrl=company_url, reviews=list(profile.get('reviews') or []))
+        for url, data in sorted(pages, key=lambda page: review_page_number(page[0])):
+            if url != company_url and data:
+                company_data['reviews'].extend(data.get('reviews') or [])
+        scraper.merge_company_data(company_data)
+    
+    print(f"\n🗄️  {len(ids)} snapshot(s): {len(ids) - len(missing)} parsed in Python, {via_browser} via page JS, "
+          f"{len(missing) - via_browser} failed")
+    print(f"   🏢 {len(pages_by_company) - skipped} compan(ies), {len(scraper.data)} row(s) in {time.time() - start_time:.1f}s"
+          f"{f' ({skipped} without a usable profile)' if skipped else ''}")
+    return scraper
 
 
 async def main():
@@ -658,13 +3681,105 @@ async def main():
     
     # ============ CONFIGURATION ============
     BASE_URL = "https://www.goodfirms.co/artificial-intelligence/usa"
-    MAX_COMPANIES = 15      # Number of companies to scrape
+    MAX_COMPANIES = 15      # Number of companies to scrape (None for the whole category)
+    MAX_PAGES = None        # Number of listing pages to walk (None for all)
     HEADLESS = False        # Set True to hide browser
+    CONCURRENCY = 4         # Pages scraping companies in parallel
+    REQUESTS_PER_SECOND = 1.0  # Per-host navigation rate limit (starting value when adaptive, up to 4x)
+    DELAY_SECONDS = 2.0     # Per-worker pause after each company (starting value when adaptive)
+    ADAPTIVE_RATE = True    # Grow workers/shrink pauses while the site is healthy, back off on 429/503/challenges
+    BLOCK_RESOURCES = False # Skip images, fonts, CSS and trackers while scraping
+    HTTP_FIRST = False      # Set True to parse server-rendered profiles without the browser when possible
+    CACHE_PATH = None       # e.g. 'goodfirms_cache.sqlite': on-disk page cache, reused across runs
+    CACHE_TTL_HOURS = 24    # Cached pages younger than this are reused without revalidation
+    JOURNAL_PATH = None     # e.g. 'goodfirms_journal.jsonl': finished companies are appended here as they complete
+    RESUME = False          # Set True to continue a crashed/interrupted run from the journal
+    DEDUPE_INDEX_PATH = None  # e.g. 'goodfirms_reviews.sqlite': export only reviews not seen in earlier runs, to a dated file
+    NEAR_DUPLICATES = False # Also skip reviews that differ from a known one by small edits
+    MAX_REVIEW_PAGES = 50   # Review pages to follow per company
+    MANIFEST_PATH = None    # JSON list of listing targets to crawl together (see CrawlScheduler)
+    SHARDS = 0              # >1 splits the companies across this many browser processes
+    DAEMON_SOCKET = 'goodfirms.sock'  # `python goodfirms.py daemon` listens here for jobs
+    DAEMON_DROP_DIR = None  # Also pick up <name>.json jobs dropped in this folder
+    DAEMON_CONTEXTS = 2     # Warm browser contexts, i.e. jobs the daemon runs at once
+    SNAPSHOT_PATH = None    # e.g. 'goodfirms_snapshots.sqlite': raw HTML of every company page, for `reextract`
+    METRICS_PATH = None     # e.g. 'goodfirms_metrics.json': per-phase timing report
+    PROMETHEUS_PATH = None  # e.g. 'goodfirms_metrics.prom': same metrics in Prometheus text format
+    MAX_RETRIES = 3         # Extra attempts per failed company, after the main pass, with exponential backoff
+    RETRY_CONCURRENCY = 1   # Failed companies retried at once
+    DEAD_LETTER_PATH = None # e.g. 'goodfirms_failed.json': companies that never succeeded, with their errors
+    RECYCLE_PAGE_AFTER = 50     # Navigations before a worker page is replaced (None to keep pages)
+    RECYCLE_CONTEXT_AFTER = 400 # Navigations before the browser context is replaced (None to keep it)
+    MEMORY_LIMIT_MB = None  # e.g. 4096: Python + browser RSS above which workers are shed
     # =======================================
     
-    scraper = HumanLikeGoodFirmsScraper(BASE_URL)
-    await scraper.scrape(max_companies=MAX_COMPANIES, headless=HEADLESS)
-    scraper.export_to_excel()
+    scraper_options = dict(
+        base_url=BASE_URL,
+        concurrency=CONCURRENCY,
+        requests_per_second=REQUESTS_PER_SECOND,
+        delay=DELAY_SECONDS,
+        adaptive_rate=ADAPTIVE_RATE,
+        block_resources=BLOCK_RESOURCES,
+        http_first=HTTP_FIRST,
+        cache_path=CACHE_PATH,
+        cache_ttl_seconds=CACHE_TTL_HOURS * 3600,
+        journal_path=JOURNAL_PATH,
+        resume=RESUME,
+        dedupe_index_path=DEDUPE_INDEX_PATH,
+        near_duplicates=NEAR_DUPLICATES,
+        max_review_pages=MAX_REVIEW_PAGES,
+        metrics_path=METRICS_PATH,
+        prometheus_path=PROMETHEUS_PATH,
+        snapshot_path=SNAPSHOT_PATH,
+        max_retries=MAX_RETRIES,
+        retry_concurrency=RETRY_CONCURRENCY,
+        dead_letter_path=DEAD_LETTER_PATH,
+        recycle_page_after=RECYCLE_PAGE_AFTER,
+        recycle_context_after=RECYCLE_CONTEXT_AFTER,
+        memory_limit_mb=MEMORY_LIMIT_MB,
+    )
+    
+    # `python goodfirms.py daemon` keeps a warm browser and serves jobs;
+    # `python goodfirms.py submit <listing url> [max companies] [output file]` sends one to it
+    if len(sys.argv) > 1 and sys.argv[1] == 'daemon':
+        await ScraperDaemon(scraper_options, DAEMON_SOCKET, DAEMON_DROP_DIR, DAEMON_CONTEXTS, HEADLESS).serve()
+        return
+    # `python goodfirms.py reextract [output file]` re-runs extraction over SNAPSHOT_PATH without re-crawling
+    if len(sys.argv) > 1 and sys.argv[1] == 'reextract':
+        if not SNAPSHOT_PATH:
+            print("❌ Set SNAPSHOT_PATH to the archive a crawl wrote before re-extracting")
+            return
+        scraper = await reextract_archive(SNAPSHOT_PATH)
+        if len(sys.argv) > 2:
+            scraper.export(sys.argv[2])
+        else:
+            scraper.export_to_excel()
+        return
+    if len(sys.argv) > 2 and sys.argv[1] == 'submit':
+        await submit_job({
+            'url': sys.argv[2],
+            'max_companies': int(sys.argv[3]) if len(sys.argv) > 3 else MAX_COMPANIES,
+            'max_pages': MAX_PAGES,
+            'output': sys.argv[4] if len(sys.argv) > 4 else None,
+        }, DAEMON_SOCKET)
+        return
+    
+    if SHARDS > 1:
+        scraper = await ShardedCrawl(scraper_options, SHARDS).run(MAX_COMPANIES, MAX_PAGES, HEADLESS)
+        scraper.export_to_excel()
+        scraper.write_metrics()
+        print("\n✅ ALL DONE! Check your Excel file.\n")
+        return
+    
+    scraper = HumanLikeGoodFirmsScraper(**scraper_options)
+    if MANIFEST_PATH:
+        scheduler = CrawlScheduler(scraper, CrawlScheduler.load_manifest(MANIFEST_PATH))
+        await scheduler.run(headless=HEADLESS)
+        scheduler.export()
+    else:
+        await scraper.scrape(max_companies=MAX_COMPANIES, headless=HEADLESS, max_pages=MAX_PAGES)
+        scraper.export_to_excel()
+    scraper.write_metrics()
     
     print("\n✅ ALL DONE! Check your Excel file.\n")
 
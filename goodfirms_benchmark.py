@@ -0,0 +1,534 @@
+"""
+GoodFirms Scraper Benchmark - offline fixture site
+
+Serves saved listing and company pages from a local HTTP server and runs the
+scraper's real pipeline against it: run_stream (listing pages streamed into the
+worker pool, rate controller, ordered merge and review dedupe, retry queue) and
+export_to_excel. Nothing touches the live site, so runs are repeatable and can
+be compared across commits.
+
+Each run writes a JSON result with pages/min, per-phase latency percentiles,
+peak RSS and output row counts.
+
+Usage:
+    # Benchmark against generated fixtures (no recording needed)
+    python goodfirms_benchmark.py --output bench.json
+
+    # Save real pages from a scraper run's page cache as fixtures, then benchmark them
+    python goodfirms_benchmark.py --record goodfirms_cache.sqlite --fixtures fixtures/goodfirms \\
+        --listing-url https://www.goodfirms.co/artificial-intelligence/usa
+    python goodfirms_benchmark.py --fixtures fixtures/goodfirms --output bench.json
+
+    # Compare two results
+    python goodfirms_benchmark.py --compare before.json after.json
+
+Requirements: same as goodfirms.py. psutil is optional and adds browser RSS.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+from playwright.async_api import async_playwright
+
+from goodfirms import (
+    HumanLikeGoodFirmsScraper,
+    PageCache,
+    canonicalize_url,
+    httpx,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+FIXTURE_INDEX = 'index.json'
+PERCENTILES = (50, 90, 95, 99)
+
+
+def fixture_key(url: str) -> str:
+    """Path and query of the canonical URL; fixtures are looked up by this, whatever the host"""
+    parts = urlsplit(canonicalize_url(url))
+    return parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+def write_fixture_index(fixtures_dir: str, listing_path: str, origin: str, pages: Dict[str, str]):
+    with open(os.path.join(fixtures_dir, FIXTURE_INDEX), 'w', encoding='utf-8') as f:
+        json.dump({'listing': listing_path, 'origin': origin, 'pages': pages}, f, indent=2, sort_keys=True)
+
+
+def record_fixtures(cache_path: str, fixtures_dir: str, listing_url: str) -> int:
+    """Copy every page in a scraper page cache into a fixture directory"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    cache = PageCache(cache_path, ttl_seconds=float('inf'))
+    pages = {}
+    try:
+        for (url,) in cache.conn.execute("SELECT url FROM pages ORDER BY url").fetchall():
+            cached = cache.get(url)
+            if not cached:
+                continue
+            filename = f'page-{len(pages):05d}.html'
+            with open(os.path.join(fixtures_dir, filename), 'wb') as f:
+                f.write(cached['body'])
+            pages[fixture_key(url)] = filename
+    finally:
+        cache.close()
+
+    parts = urlsplit(canonicalize_url(listing_url))
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    write_fixture_index(fixtures_dir, fixture_key(listing_url), f'{parts.scheme}://{host}', pages)
+    print(f"💾 Recorded {len(pages)} page(s) from {cache_path} into {fixtures_dir}")
+    return len(pages)
+
+
+SYNTHETIC_SERVICES = ['Artificial Intelligence', 'Machine Learning', 'Chatbot Development',
+                      'Computer Vision', 'Data Science', 'Natural Language Processing']
+SYNTHETIC_INDUSTRIES = ['Healthcare', 'Retail', 'Finance', 'Education', 'Logistics', 'Media']
+SYNTHETIC_BUDGETS = ['$5,000 - $9,999', '$10,000 - $49,999', '$50,000 - $199,999', '$200,000+']
+
+
+def synthetic_company_html(rng: random.Random, slug: str, name: str, reviews: List[Dict[str, str]],
+                           review_pages: int, review_count: int) -> str:
+    cards = []
+    for review in reviews:
+        cards.append(
+            f'<div class="review-card">'
+            f'<h3 class="reviewer-name">{review["name"]}, {review["position"]} at {review["company"]}</h3>'
+            f'<span class="reviewer-location">{review["location"]}</span>'
+            f'<span class="reviewer-industry">{review["industry"]}</span>'
+            f'<p class="review-text">{review["text"]}</p>'
+            f'<span class="rating">{review["rating"]}</span>'
+            f'<span class="service-name">{review["service"]}</span>'
+            f'<div class="project-summary">{review["summary"]}</div>'
+            f'<span class="start-date">{review["date"]}</span>'
+            f'<span class="budget">{review["budget"]}</span>'
+            f'</div>'
+        )
+    pagination = ''.join(f'<a href="/company/{slug}?page={n}">{n}</a>' for n in range(2, review_pages + 1))
+    services = ''.join(f'<li class="service-item">{service}</li>'
+                       for service in rng.sample(SYNTHETIC_SERVICES, 3))
+    return (
+        f'<html><head><title>{name}</title></head><body>'
+        f'<div class="company-profile"><h1 class="profile-header__title">{name}</h1>'
+        f'<a class="website" href="https://{slug}.example.com" target="_blank">Visit website</a>'
+        f'<span class="location-text">{rng.choice(["Austin", "Boston", "Denver", "Seattle"])}, USA</span>'
+        f'<div class="employee-count">{rng.choice(["10 - 49", "50 - 249", "250 - 999"])} Employees</div>'
+        f'<ul>{services}</ul>'
+        f'<h2 class="review-count-title">{review_count} Reviews</h2>'
+        f'<section class="reviews-list">{"".join(cards)}</section>'
+        f'<nav class="pagination">{pagination}</nav>'
+        f'</div></body></html>'
+    )
+
+
+def generate_synthetic_fixtures(fixtures_dir: str, companies: int = 60, per_listing_page: int = 20,
+                                reviews_per_page: int = 8, review_pages: int = 2, seed: int = 7) -> int:
+    """Write a deterministic fake listing + company site shaped like GoodFirms' markup"""
+    rng = random.Random(seed)
+    os.makedirs(fixtures_dir, exist_ok=True)
+    listing_path = '/artificial-intelligence/usa'
+    pages = {}
+
+    def save(key: str, html: str):
+        filename = f'page-{len(pages):05d}.html'
+        with open(os.path.join(fixtures_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+        pages[key] = filename
+
+    slugs = [f'synthetic-ai-company-{i:04d}' for i in range(companies)]
+    listing_pages = max(1, -(-companies // per_listing_page))
+    for page_number in range(1, listing_pages + 1):
+        chunk = slugs[(page_number - 1) * per_listing_page:page_number * per_listing_page]
+        links = ''.join(f'<div class="firm-wrapper"><a href="/company/{slug}">{slug.replace("-", " ").title()}</a></div>'
+                        for slug in chunk)
+        next_link = (f'<a rel="next" href="{listing_path}?page={page_number + 1}">Next</a>'
+                     if page_number < listing_pages else '')
+        key = listing_path if page_number == 1 else f'{listing_path}?page={page_number}'
+        save(key, f'<html><body><h1>AI Companies in USA</h1>{links}{next_link}</body></html>')
+
+    for slug in slugs:
+        name = slug.replace('-', ' ').title()
+        all_reviews = []
+        for i in range(reviews_per_page * review_pages):
+            all_reviews.append({
+                'name': f'Reviewer {rng.randint(1000, 9999)} {chr(65 + i % 26)}',
+                'position': rng.choice(['CEO', 'CTO', 'Head of Data', 'Product Manager']),
+                'company': f'Client {rng.randint(100, 999)} Ltd',
+                'location': rng.choice(['New York, USA', 'London, UK', 'Toronto, Canada']),
+                'industry': rng.choice(SYNTHETIC_INDUSTRIES),
+                'text': ' '.join(rng.choice(['delivered', 'model', 'accurate', 'team', 'on time', 'pipeline',
+                                             'great', 'communication', 'budget', 'results', 'scalable'])
+                                 for _ in range(rng.randint(15, 40))),
+                'rating': f'{rng.choice([4.0, 4.5, 5.0])}',
+                'service': rng.choice(SYNTHETIC_SERVICES),
+                'summary': f'Project {rng.randint(1, 500)} for an AI roll-out',
+                'date': f'{rng.choice(["Jan", "Mar", "Jun", "Oct"])} {rng.randint(2019, 2024)}',
+                'budget': rng.choice(SYNTHETIC_BUDGETS),
+            })
+        # Repeat a review on a later page so the dedupe phase has work to do
+        if review_pages > 1 and reviews_per_page > 1:
+            all_reviews[reviews_per_page] = dict(all_reviews[0])
+
+        for page_number in range(1, review_pages + 1):
+            chunk = all_reviews[(page_number - 1) * reviews_per_page:page_number * reviews_per_page]
+            key = f'/company/{slug}' if page_number == 1 else f'/company/{slug}?page={page_number}'
+            save(key, synthetic_company_html(rng, slug, name, chunk, review_pages, len(all_reviews)))
+
+    write_fixture_index(fixtures_dir, listing_path, '', pages)
+    print(f"🧪 Generated {len(pages)} synthetic page(s) in {fixtures_dir}")
+    return len(pages)
+
+
+class FixtureServer:
+    """Serve a fixture directory on localhost, rewriting the recorded origin to its own"""
+
+    def __init__(self, fixtures_dir: str, latency_ms: float = 0.0):
+        with open(os.path.join(fixtures_dir, FIXTURE_INDEX), encoding='utf-8') as f:
+            index = json.load(f)
+        self.listing_path = index['listing']
+        self.origin = index.get('origin') or ''
+        self.latency = latency_ms / 1000
+        self.pages: Dict[str, bytes] = {}
+        for key, filename in index['pages'].items():
+            with open(os.path.join(fixtures_dir, filename), 'rb') as f:
+                self.pages[key] = f.read()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.lock = threading.Lock()
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def listing_url(self) -> str:
+        return self.base_url + self.listing_path
+
+    def start(self) -> 'FixtureServer':
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                body = fixture.pages.get(fixture_key(fixture.base_url + self.path))
+                with fixture.lock:
+                    if body is None:
+                        fixture.misses += 1
+                    else:
+                        fixture.hits += 1
+
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if fixture.origin:
+                    # Absolute links in recorded pages point at the live site (with or without www.)
+                    local = fixture.base_url.encode('utf-8')
+                    www = fixture.origin.replace('://', '://www.', 1)
+                    body = body.replace(www.encode('utf-8'), local).replace(fixture.origin.encode('utf-8'), local)
+                with fixture.lock:
+                    fixture.bytes_served += len(body)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+class RssSampler:
+    """Track peak resident memory of this process and (with psutil) the browser processes it spawns"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.peak_total = 0
+        self.peak_browser = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def sample(self):
+        if psutil is None:
+            return
+        me = psutil.Process()
+        browser = 0
+        for child in me.children(recursive=True):
+            try:
+                browser += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak_browser = max(self.peak_browser, browser)
+        self.peak_total = max(self.peak_total, me.memory_info().rss + browser)
+
+    async def run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.sample()
+
+    def report(self) -> Dict[str, Optional[float]]:
+        python_peak = None
+        if resource is not None:
+            # ru_maxrss is KB on Linux and bytes on macOS
+            scale = 1 if sys.platform == 'darwin' else 1024
+            python_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 / 1024
+        return {
+            'peak_python_rss_mb': round(python_peak, 1) if python_peak is not None else None,
+            'peak_browser_rss_mb': round(self.peak_browser / 1024 / 1024, 1) if psutil else None,
+            'peak_total_rss_mb': round(self.peak_total / 1024 / 1024, 1) if psutil else None,
+        }
+
+
+def summarize_latencies(samples: List[float]) -> Dict[str, Any]:
+    """Count, total and percentile latencies (ms) for one phase"""
+    if not samples:
+        return {'count': 0, 'total_s': 0.0}
+    values = np.array(samples) * 1000
+    summary = {
+        'count': len(samples),
+        'total_s': round(float(values.sum()) / 1000, 3),
+        'mean_ms': round(float(values.mean()), 2),
+        'max_ms': round(float(values.max()), 2),
+    }
+    for percentile in PERCENTILES:
+        summary[f'p{percentile}_ms'] = round(float(np.percentile(values, percentile)), 2)
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+async def run_benchmark(server: FixtureServer, concurrency: int = 4, http_first: bool = False,
+                        block_resources: bool = True, max_companies: Optional[int] = None,
+                        max_pages: Optional[int] = None, adaptive_rate: bool = True) -> Dict[str, Any]:
+    """Drive the scraper's real pipeline (run_stream: workers, rate controller, ordered merge, retries) and export"""
+    scraper = HumanLikeGoodFirmsScraper(
+        server.listing_url,
+        concurrency=concurrency,
+        requests_per_second=0,  # Localhost: measure the scraper, not the politeness delay
+        block_resources=block_resources,
+        http_first=http_first,
+        delay=0,
+        adaptive_rate=adaptive_rate,
+    )
+    timings: Dict[str, List[float]] = {'launch': [], 'crawl': [], 'export': []}
+    sampler = RssSampler()
+    sampler.start()
+    produced = 0
+
+    crawl_start = time.perf_counter()
+    try:
+        async with async_playwright() as p:
+            start = time.perf_counter()
+            browser, context = await scraper.launch_browser(p, headless=True)
+            timings['launch'].append(time.perf_counter() - start)
+            try:
+                start = time.perf_counter()
+                produced = await scraper.run_stream(context, lambda listing_page: scraper.iter_company_urls(
+                    listing_page, max_companies, max_pages
+                ))
+                timings['crawl'].append(time.perf_counter() - start)
+            finally:
+                await browser.close()
+        crawl_seconds = time.perf_counter() - crawl_start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            stats = scraper.export_to_excel(os.path.join(tmp, 'benchmark.xlsx'))
+            timings['export'].append(time.perf_counter() - start)
+    finally:
+        await sampler.stop()
+
+    counters = scraper.metrics.counters
+    pages_fetched = server.hits
+    return {
+        'timings': {phase: summarize_latencies(samples) for phase, samples in timings.items()},
+        'throughput': {
+            'crawl_seconds': round(crawl_seconds, 3),
+            'pages_fetched': pages_fetched,
+            'pages_per_min': round(pages_fetched / crawl_seconds * 60, 1) if crawl_seconds else None,
+            'companies_per_min': round(counters.get('companies', 0) / crawl_seconds * 60, 1) if crawl_seconds else None,
+            'bytes_served': server.bytes_served,
+            'not_found': server.misses,
+        },
+        'phases': scraper.metrics.histograms(),
+        'counters': counters,
+        'rate_decisions': len(scraper.rate_controller.decisions),
+        'memory': sampler.report(),
+        'output': {
+            'company_urls': produced,
+            'companies_extracted': counters.get('companies', 0),
+            'reviews_extracted': counters.get('reviews', 0),
+            'duplicates_skipped': counters.get('duplicates', 0),
+            'permanent_failures': len(scraper.retry_queue),
+            'rows': len(scraper.data),
+            'exported_rows': (stats or {}).get('rows', 0),
+            'exported_companies': (stats or {}).get('companies', 0),
+        },
+    }
+
+
+def compare_results(before_path: str, after_path: str):
+    """Print every numeric metric of two benchmark results side by side"""
+    with open(before_path, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, encoding='utf-8') as f:
+        after = json.load(f)
+
+    def flatten(result: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+        flat = {}
+        for key, value in result.items():
+            name = f'{prefix}{key}'
+            if isinstance(value, dict):
+                flat.update(flatten(value, f'{name}.'))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                flat[name] = value
+        return flat
+
+    old, new = flatten(before), flatten(after)
+    print(f"{'metric':<40} {before.get('git_commit') or 'before':>12} {after.get('git_commit') or 'after':>12} {'change':>9}")
+    for name in sorted(set(old) | set(new)):
+        if name.startswith('config.'):
+            continue
+        a, b = old.get(name), new.get(name)
+        change = f'{(b - a) / a * 100:+.1f}%' if a and b is not None else ''
+        print(f"{name:<40} {'' if a is None else a:>12} {'' if b is None else b:>12} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the GoodFirms scraper against an offline fixture site')
+    parser.add_argument('--fixtures', help='Fixture directory (default: generate synthetic fixtures)')
+    parser.add_argument('--record', metavar='CACHE_PATH', help='Save pages from a scraper page cache into --fixtures and exit')
+    parser.add_argument('--listing-url', default='https://www.goodfirms.co/artificial-intelligence/usa',
+                        help='Listing URL the recorded run started from')
+    parser.add_argument('--companies', type=int, default=60, help='Synthetic fixture size')
+    parser.add_argument('--review-pages', type=int, default=2, help='Synthetic review pages per company')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--http-first', action='store_true', help='Fetch profiles over HTTP before the browser')
+    parser.add_argument('--no-block-resources', action='store_true')
+    parser.add_argument('--fixed-rate', action='store_true', help='Run the rate controller at full concurrency (no AIMD)')
+    parser.add_argument('--max-companies', type=int)
+    parser.add_argument('--max-pages', type=int)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Artificial per-request server latency')
+    parser.add_argument('--output', help='Write the JSON result here (default: print it)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two JSON results and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    if args.record:
+        if not args.fixtures:
+            parser.error('--record needs --fixtures')
+        record_fixtures(args.record, args.fixtures, args.listing_url)
+        return
+
+    if args.http_first and httpx is None:
+        print("⚠️  httpx/selectolax not installed - benchmarking the browser path only")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures_dir = args.fixtures
+        if not fixtures_dir:
+            fixtures_dir = os.path.join(tmp, 'fixtures')
+            generate_synthetic_fixtures(fixtures_dir, companies=args.companies, review_pages=args.review_pages)
+
+        server = FixtureServer(fixtures_dir, latency_ms=args.latency_ms).start()
+        print(f"🌐 Serving {len(server.pages)} fixture page(s) at {server.base_url}\n")
+        try:
+            result = asyncio.run(run_benchmark(
+                server,
+                concurrency=args.concurrency,
+                http_first=args.http_first,
+                block_resources=not args.no_block_resources,
+                max_companies=args.max_companies,
+                max_pages=args.max_pages,
+                adaptive_rate=not args.fixed_rate,
+            ))
+        finally:
+            server.stop()
+
+    result = {
+        'benchmark': 'goodfirms',
+        'git_commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'fixtures': args.fixtures or f'synthetic:{args.companies}x{args.review_pages}',
+            'concurrency': args.concurrency,
+            'http_first': args.http_first and httpx is not None,
+            'block_resources': not args.no_block_resources,
+            'max_companies': args.max_companies,
+            'max_pages': args.max_pages,
+            'adaptive_rate': not args.fixed_rate,
+            'latency_ms': args.latency_ms,
+        },
+        **result,
+    }
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"\n📊 Benchmark result written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import time
 import random
+import atexit
+import hashlib
+import sqlite3
+import threading
 import gspread
 import pyperclip
 from datetime import datetime, timedelta
@@ -13,14 +17,331 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
+class SheetWriteBehind:
+    """
+    Buffer post updates and write them to the sheet in batches from a background thread.
+    Each row is coalesced into one D:F range (a later update to the same row replaces the
+    earlier one), and pending rows go out as a single batch_update every `batch_rows` rows
+    or `flush_seconds` seconds, whichever comes first, and once more on close/exit.
+    With `locate`, rows queued by profile URL are looked up again just before each write,
+    so rows inserted or deleted in the sheet meanwhile don't shift the updates.
+    `on_written` is called with the keys of each batch once its batch_update has gone through.
+    """
+    
+    def __init__(self, sheet, first_column='D', last_column='F', batch_rows=10, flush_seconds=30, locate=None,
+                 on_written=None):
+        self.sheet = sheet
+        self.locate = locate  # keys -> {key: [row numbers]}; plain row numbers map to themselves
+        self.on_written = on_written
+        self.first_column = first_column
+        self.last_column = last_column
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.pending = {}  # row index or profile URL -> [Post Content, Post URL, Relative Date]
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # One batch_update in flight at a time
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.api_calls = 0
+        self.rows_written = 0
+        self.thread = threading.Thread(target=self.run, name='sheet-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+    
+    def put(self, key, values):
+        """Queue one row's values, by row number or (with locate) profile URL; returns immediately"""
+        with self.lock:
+            self.pending[key] = list(values)
+            full = len(self.pending) >= self.batch_rows
+        if full:
+            self.wake.set()
+    
+    def run(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"   ⚠️ Sheet write failed, will retry: {str(e)[:100]}")
+    
+    def flush(self):
+        """Write everything pending in one batch_update; on failure the rows stay queued"""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+            if not batch:
+                return 0
+            try:
+                rows = self.locate(list(batch)) if self.locate else {row: [row] for row in batch}
+                data = []
+                for key, values in batch.items():
+                    if not rows.get(key):
+                        print(f"   ⚠️ {key} is no longer in the sheet - update dropped")
+                    for row in rows.get(key, []):
+                        data.append({'range': f'{self.first_column}{row}:{self.last_column}{row}', 'values': [values]})
+                data.sort(key=lambda update: int(update['range'][len(self.first_column):].split(':')[0]))
+                if data:
+                    self.sheet.batch_update(data)
+            except Exception:
+                with self.lock:
+                    for row, values in batch.items():
+                        self.pending.setdefault(row, values)  # Keep any newer update made meanwhile
+                raise
+            if not data:
+                return 0  # Every row was dropped: no request was made
+            self.api_calls += 1
+            self.rows_written += len(data)
+            print(f"   📝 Wrote {len(data)} row(s) to the sheet in one batch")
+            if self.on_written:
+                self.on_written([key for key in batch if rows.get(key)])
+            return len(data)
+    
+    def close(self, retries=3):
+        """Stop the background thread and flush what is left, retrying a few times"""
+        if not self.stopped.is_set():
+            self.stopped.set()
+            self.wake.set()
+            self.thread.join()
+        for attempt in range(retries):
+            try:
+                self.flush()
+                return True
+            except Exception as e:
+                print(f"   ⚠️ Final sheet write failed (attempt {attempt + 1}/{retries}): {str(e)[:100]}")
+                time.sleep(2 ** attempt * 5)
+        with self.lock:
+            lost = sorted(self.pending)
+        if lost:
+            print(f"   ❌ Rows not written to the sheet: {lost}")
+        return False
+
+
+def profile_key(url):
+    """Compare LinkedIn URLs regardless of scheme, www., query string or trailing slash"""
+    url = str(url or '').strip().split('?')[0].split('#')[0].lower()
+    url = re.sub(r'^https?://', '', url)
+    url = re.sub(r'^www\.', '', url)
+    return url.rstrip('/')
+
+
+class SheetSync:
+    """
+    Read the contact sheet once in bulk, remember which row each profile URL is on and
+    what its post columns already hold, so a run only scrapes rows that need work and
+    only writes values that changed.
+    """
+    
+    URL_COLUMN = 'Linkedin Url'
+    POST_COLUMNS = ['Post Content', 'Post URL', 'Relative Date']
+    REQUIRED_COLUMNS = ['Post Content', 'Relative Date']
+    
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.header = []
+        self.records = []
+        self.rows_by_url = {}  # profile key -> [row numbers] (the same profile can be listed twice)
+        self.values_by_url = {}  # profile key -> post column values as last read or written
+        self.skipped_fresh = 0  # Profiles left out by the last pending() for being checked within the TTL
+    
+    def read(self):
+        """One get_all_values call; each record carries its sheet row number as '_row'"""
+        values = self.sheet.get_all_values()
+        self.header = values[0] if values else []
+        self.records = []
+        self.rows_by_url = {}
+        self.values_by_url = {}
+        for row_number, row in enumerate(values[1:], start=2):
+            record = dict(zip(self.header, row + [''] * (len(self.header) - len(row))))
+            record['_row'] = row_number
+            self.records.append(record)
+            key = profile_key(record.get(self.URL_COLUMN))
+            if key:
+                self.rows_by_url.setdefault(key, []).append(row_number)
+                self.values_by_url.setdefault(key, [record.get(column, '') for column in self.POST_COLUMNS])
+        return self.records
+    
+    def needs_work(self, record):
+        """Missing post content or date, or the last attempt failed"""
+        if any(not str(record.get(column, '')).strip() for column in self.REQUIRED_COLUMNS):
+            return True
+        return str(record.get('Post Content', '')).startswith('Error') or record.get('Relative Date') == 'Error'
+    
+    def pending(self, refresh_all=False, is_fresh=None, is_stale=None):
+        """
+        Records with a profile URL that need scraping (or, per is_stale, re-checking), one per profile.
+        Unless refresh_all, profiles that is_fresh says were checked within the TTL are left out,
+        even when their row still needs work; how many is kept in skipped_fresh.
+        """
+        seen = set()
+        selected = []
+        self.skipped_fresh = 0
+        for record in self.records:
+            url = record.get(self.URL_COLUMN)
+            key = profile_key(url)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if refresh_all:
+                selected.append(record)
+            elif is_fresh and is_fresh(url):
+                self.skipped_fresh += 1
+            elif self.needs_work(record) or (is_stale and is_stale(url)):
+                selected.append(record)
+        return selected
+    
+    def unchanged(self, url, values):
+        return self.values_by_url.get(profile_key(url)) == [str(value) for value in values]
+    
+    def remember(self, url, values):
+        self.values_by_url[profile_key(url)] = [str(value) for value in values]
+    
+    def locate(self, keys):
+        """Current row numbers for queued keys; re-reads just the URL column when profiles are involved"""
+        if any(isinstance(key, str) for key in keys) and self.URL_COLUMN in self.header:
+            urls = self.sheet.col_values(self.header.index(self.URL_COLUMN) + 1)
+            self.rows_by_url = {}
+            for row_number, url in enumerate(urls[1:], start=2):
+                if profile_key(url):
+                    self.rows_by_url.setdefault(profile_key(url), []).append(row_number)
+        return {key: [key] if isinstance(key, int) else self.rows_by_url.get(key, []) for key in keys}
+
+
+# Seconds per unit of LinkedIn's relative dates ('5m', '3h', '2d', '1w', '2mo', '1yr')
+RELATIVE_DATE_UNITS = [('mo', 30 * 86400), ('y', 365 * 86400), ('w', 7 * 86400), ('d', 86400), ('h', 3600), ('m', 60)]
+
+
+def relative_date_to_timestamp(relative_date, fetched_at):
+    """Approximate posting time (epoch seconds) of a relative date seen at fetched_at; None if unparseable"""
+    match = re.match(r'\s*(\d+)\s*([a-z]+)', str(relative_date or '').lower())
+    if not match:
+        return fetched_at if 'now' in str(relative_date or '').lower() else None
+    value, unit = int(match.group(1)), match.group(2)
+    for prefix, seconds in RELATIVE_DATE_UNITS:
+        if unit.startswith(prefix):
+            return fetched_at - value * seconds
+    return None
+
+
+def post_outcome(post_data):
+    """Classify a scrape result for the state store"""
+    content = str(post_data.get('content', ''))
+    if content.startswith('Error'):
+        return 'error'
+    if post_data.get('within_30_days') == False:
+        return 'old'
+    if content in ('No posts found on this profile', 'Post found but content is private or unavailable',
+                   'Could not extract post content'):
+        return 'no_post'
+    return 'post'
+
+
+class ProfileStateStore:
+    """
+    Local SQLite memory of every profile checked, keyed by canonical profile URL:
+    last post URL, a hash of its content, the parsed post time, when it was fetched
+    and how that went. Profiles checked within the TTL can be skipped without a page load.
+    """
+    
+    def __init__(self, path='linkedin_profiles.sqlite'):
+        # Results are recorded from the sheet writer's thread once their rows are written
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                profile TEXT PRIMARY KEY,
+                profile_url TEXT,
+                post_url TEXT,
+                content_hash TEXT,
+                relative_date TEXT,
+                post_timestamp REAL,
+                fetched_at REAL,
+                changed_at REAL,
+                outcome TEXT
+            )
+        """)
+        self.conn.commit()
+    
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT profile_url, post_url, content_hash, relative_date, post_timestamp, fetched_at, changed_at, "
+                "outcome FROM profiles WHERE profile = ?", (profile_key(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ['profile_url', 'post_url', 'content_hash', 'relative_date', 'post_timestamp', 'fetched_at',
+                'changed_at', 'outcome']
+        return dict(zip(keys, row))
+    
+    def age(self, url):
+        """Seconds since the profile was last checked successfully; None if never (or only errors)"""
+        state = self.get(url)
+        if state is None or state['outcome'] == 'error':
+            return None
+        return time.time() - state['fetched_at']
+    
+    def is_fresh(self, url, ttl_seconds):
+        age = self.age(url)
+        return age is not None and age < ttl_seconds
+    
+    def is_stale(self, url, ttl_seconds):
+        """Known to the store, but not checked successfully within the TTL"""
+        state = self.get(url)
+        return state is not None and not self.is_fresh(url, ttl_seconds)
+    
+    def record(self, url, post_data):
+        """Store one scrape result; returns True when the post differs from the last one seen"""
+        now = time.time()
+        outcome = post_outcome(post_data)
+        with self.lock:
+            previous = self.get(url)
+            if outcome == 'error' and previous is not None:
+                # Keep what we knew about the post; only the failed check is new
+                self.conn.execute("UPDATE profiles SET fetched_at = ?, outcome = ? WHERE profile = ?",
+                                  (now, outcome, profile_key(url)))
+                self.conn.commit()
+                return False
+            
+            content_hash = hashlib.sha256(str(post_data.get('content', '')).encode('utf-8')).hexdigest()
+            changed = previous is None or previous['content_hash'] != content_hash
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (profile_key(url), url, post_data.get('url'), content_hash, post_data.get('relative_date'),
+                 relative_date_to_timestamp(post_data.get('relative_date'), now), now,
+                 now if changed else previous['changed_at'], outcome),
+            )
+            self.conn.commit()
+            return changed
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
 class LinkedInScraper:
-    def __init__(self, google_sheets_key_file, sheet_name):
+    def __init__(self, google_sheets_key_file, sheet_name, sheet_batch_rows=10, sheet_flush_seconds=30,
+                 state_path='linkedin_profiles.sqlite', state_ttl_hours=24):
         print("🚀 Initializing Enhanced LinkedIn Scraper...")
         
+        # What each profile looked like when last checked; profiles checked within the TTL are skipped
+        self.profile_state = ProfileStateStore(state_path)
+        self.state_ttl_seconds = state_ttl_hours * 3600
+        # Results waiting for their row to be written before they are recorded: writer key -> (url, post_data)
+        self.unrecorded = {}
+        self.unrecorded_lock = threading.Lock()
+        
         # Initialize Google Sheets
         try:
             self.gc = gspread.service_account(filename=google_sheets_key_file)
             self.sheet = self.gc.open(sheet_name).sheet1
+            # Rows are read once in bulk and found again by profile URL when written
+            self.sheet_sync = SheetSync(self.sheet)
+            # Post updates are buffered and written in batches instead of three calls per profile
+            self.sheet_writer = SheetWriteBehind(self.sheet, batch_rows=sheet_batch_rows,
+                                                 flush_seconds=sheet_flush_seconds, locate=self.sheet_sync.locate,
+                                                 on_written=self.record_written)
             print("✅ Google Sheets connected successfully")
         except Exception as e:
             print(f"❌ Error connecting to Google Sheets: {e}")
@@ -268,13 +589,21 @@ class LinkedInScraper:
             print("❌ Login may have failed. Please try again.")
             return False
     
-    def get_linkedin_urls_from_sheet(self):
-        """Get all LinkedIn URLs from the sheet with enhanced error handling"""
+    def get_linkedin_urls_from_sheet(self, refresh_all=False):
+        """Get the LinkedIn URLs whose rows still need post data, from one bulk read of the sheet"""
         print("\n📊 Reading data from Google Sheet...")
         try:
-            records = self.sheet.get_all_records()
-            valid_records = [r for r in records if r.get('Linkedin Url', '').strip()]
-            print(f"✅ Found {len(valid_records)} profiles to scrape")
+            records = self.sheet_sync.read()
+            with_url = sum(1 for r in records if r.get('Linkedin Url', '').strip())
+            # Profiles checked within the TTL are left out; filled rows come back once it has passed
+            valid_records = self.sheet_sync.pending(
+                refresh_all,
+                is_fresh=lambda url: self.profile_state.is_fresh(url, self.state_ttl_seconds),
+                is_stale=lambda url: self.profile_state.is_stale(url, self.state_ttl_seconds))
+            skipped_fresh = self.sheet_sync.skipped_fresh
+            print(f"✅ Found {with_url} profiles, {len(valid_records)} to scrape "
+                  f"({skipped_fresh} checked within the last {self.state_ttl_seconds / 3600:.0f}h, "
+                  f"{with_url - len(valid_records) - skipped_fresh} already filled or duplicated)")
             return valid_records
         except Exception as e:
             print(f"❌ Error reading sheet: {e}")
@@ -667,28 +996,50 @@ class LinkedInScraper:
         except Exception as e:
             print(f"⚠️ Error setting up columns: {e}")
     
-    def update_sheet_with_enhanced_data(self, row_index, post_data):
-        """Update Google Sheet with all extracted data including relative date"""
+    def update_sheet_with_enhanced_data(self, row_index, post_data, linkedin_url=None):
+        """Queue all extracted data including relative date for the batched sheet writer"""
         try:
             content = str(post_data.get('content', 'No content found'))[:2000]
             url = str(post_data.get('url', 'No URL available'))
             relative_date = post_data.get('relative_date', 'No date found')
-            
-            print(f"   📝 Updating sheet row {row_index}...")
-            
-            # Update columns D, E, and F (Post Content, Post URL, Relative Date)
-            self.sheet.update(f'D{row_index}', [[content]])
-            time.sleep(1)  # Reduced from 1.5
-            self.sheet.update(f'E{row_index}', [[url]])
-            time.sleep(1)  # Reduced from 1.5
-            self.sheet.update(f'F{row_index}', [[relative_date]])
-            
-            print(f"   ✅ Updated row {row_index} with content, URL, and relative date")
-            time.sleep(1)  # Reduced from 2 - API rate limit protection
+            values = [content, url, relative_date]
+            
+            # Rows read from the sheet are written by profile URL, so they land on the right row
+            key = row_index
+            if linkedin_url and profile_key(linkedin_url) in self.sheet_sync.rows_by_url:
+                if self.sheet_sync.unchanged(linkedin_url, values):
+                    print(f"   ⏭️ Row {row_index} unchanged - no write needed")
+                    self.record_state(linkedin_url, post_data)  # Nothing to wait for
+                    return
+                self.sheet_sync.remember(linkedin_url, values)
+                key = profile_key(linkedin_url)
+            
+            # The check is recorded once the row is written (see record_written)
+            if linkedin_url:
+                with self.unrecorded_lock:
+                    self.unrecorded[key] = (linkedin_url, post_data)
+            # Columns D, E, and F (Post Content, Post URL, Relative Date) as one range
+            self.sheet_writer.put(key, values)
+            print(f"   ✅ Queued row {row_index} with content, URL, and relative date")
             
         except Exception as e:
             print(f"   ❌ Error updating sheet: {str(e)}")
     
+    def record_state(self, linkedin_url, post_data):
+        """Remember this check in the profile state store"""
+        try:
+            if self.profile_state.record(linkedin_url, post_data):
+                print(f"   🆕 New post since the last check: {linkedin_url}")
+        except Exception as e:
+            print(f"   ⚠️ Could not record profile state: {str(e)[:100]}")
+    
+    def record_written(self, keys):
+        """Called by the sheet writer after a batch_update: record the checks whose rows are now in the sheet"""
+        with self.unrecorded_lock:
+            written = [self.unrecorded.pop(key) for key in keys if key in self.unrecorded]
+        for linkedin_url, post_data in written:
+            self.record_state(linkedin_url, post_data)
+    
     def scrape_all_profiles_optimized(self):
         """Optimized scraping with reduced delays"""
         # Setup sheet columns
@@ -720,7 +1071,7 @@ class LinkedInScraper:
                 post_data = self.scrape_recent_post_enhanced(linkedin_url)
                 
                 # Update sheet
-                self.update_sheet_with_enhanced_data(index + 2, post_data)
+                self.update_sheet_with_enhanced_data(record['_row'], post_data, linkedin_url)
                 
                 # Track statistics
                 if post_data.get("within_30_days") == False:
@@ -756,6 +1107,12 @@ class LinkedInScraper:
                 print(f"   ❌ Unexpected error: {e}")
                 errors += 1
         
+        # Write whatever is still buffered before reporting (also covers Ctrl+C above)
+        try:
+            self.sheet_writer.flush()
+        except Exception as e:
+            print(f"   ⚠️ Sheet write failed, will retry on close: {str(e)[:100]}")
+        
         # Final statistics
         total_time = (time.time() - start_time) / 60
         print(f"\n🎉 Scraping completed!")
@@ -763,12 +1120,18 @@ class LinkedInScraper:
         print(f"   Total profiles processed: {index + 1}")
         print(f"   Successful: {successful}")
         print(f"   Skipped (older than 30 days): {skipped_old}")
+        print(f"   Skipped (checked within TTL): {self.sheet_sync.skipped_fresh}")
         print(f"   Errors: {errors}")
         print(f"   Total time: {total_time:.1f} minutes")
         print(f"   Average time per profile: {(total_time * 60) / (index + 1):.1f} seconds")
+        print(f"   Sheet API calls for post data: {self.sheet_writer.api_calls}")
     
     def close(self):
         """Enhanced cleanup"""
+        if hasattr(self, 'sheet_writer'):
+            self.sheet_writer.close()
+        if hasattr(self, 'profile_state'):
+            self.profile_state.close()
         if hasattr(self, 'driver'):
             try:
                 self.driver.quit()
@@ -788,12 +1151,16 @@ if __name__ == "__main__":
     # Configuration - UPDATE THESE PATHS!
     CREDENTIALS_FILE = "C:/Users/aditi/OneDrive/Desktop/credentials.json"
     SHEET_NAME = "linkedin_contacts"
+    STATE_PATH = "linkedin_profiles.sqlite"  # Local memory of profiles already checked
+    STATE_TTL_HOURS = 24  # Profiles checked more recently than this are not reloaded
     
     try:
         # Initialize enhanced scraper
         scraper = LinkedInScraper(
             google_sheets_key_file=CREDENTIALS_FILE,
-            sheet_name=SHEET_NAME
+            sheet_name=SHEET_NAME,
+            state_path=STATE_PATH,
+            state_ttl_hours=STATE_TTL_HOURS
         )
         
         print("\n📋 Pre-scraping checklist:")
@@ -803,6 +1170,7 @@ if __name__ == "__main__":
         print("   ✓ Only posts within 1 MONTH will be processed (strict filter)")
         print("   ✓ Extracts relative dates like '3d', '1w', '25d' from LinkedIn")
         print("   ✓ Full post content will be extracted (expanding 'see more')")
+        print(f"   ✓ Profiles checked in the last {STATE_TTL_HOURS}h are skipped")
         
         # Login to LinkedIn
         if scraper.login_to_linkedin():
@@ -861,28 +1229,30 @@ def batch_process_urls(url_list, credentials_file, sheet_name, start_index=0):
         if scraper:
             scraper.close()
 
-def validate_linkedin_urls(sheet_path):
+def validate_linkedin_urls(sheet_path, records=None):
     """
     Validate LinkedIn URLs in the sheet before scraping
     
     Args:
         sheet_path: Path to Google credentials JSON
+        records: Records already read by SheetSync.read() (e.g. scraper.sheet_sync.records),
+                 so the sheet isn't read a second time
     """
     try:
-        gc = gspread.service_account(filename=sheet_path)
-        sheet = gc.open("linkedin_contacts").sheet1
-        records = sheet.get_all_records()
+        if records is None:
+            gc = gspread.service_account(filename=sheet_path)
+            records = SheetSync(gc.open("linkedin_contacts").sheet1).read()
         
         valid_urls = []
         invalid_urls = []
         
-        for i, record in enumerate(records):
-            url = record.get('Linkedin Url', '').strip()
+        for record in records:
+            url = str(record.get('Linkedin Url', '')).strip()
             if url:
                 if 'linkedin.com/in/' in url:
-                    valid_urls.append((i+2, url))  # +2 for header row
+                    valid_urls.append((record['_row'], url))
                 else:
-                    invalid_urls.append((i+2, url))
+                    invalid_urls.append((record['_row'], url))
         
         print(f"✅ Valid URLs: {len(valid_urls)}")
         print(f"❌ Invalid URLs: {len(invalid_urls)}")
@@ -0,0 +1,108 @@
+import asyncio
+
+from goodfirms import AdaptiveRateController, HostRateLimiter
+
+URL = 'https://www.goodfirms.co/company/acme'
+
+
+def controller(**options):
+    options.setdefault('rate_limiter', HostRateLimiter(1.0))
+    return AdaptiveRateController(max_concurrency=8, delay=2.0, **options)
+
+
+def test_starts_at_half_concurrency_and_earns_the_rest():
+    rates = controller()
+    assert rates.limit == 4
+    for _ in range(2 * 4):
+        rates.observe(URL, 200, 0.1)
+    assert rates.limit == 5
+    assert rates.delay == 1.75
+    assert rates.rate == 1.25 and rates.rate_limiter.min_interval == 0.8
+
+
+def test_throttle_halves_workers_and_rate_and_doubles_the_pause():
+    rates = controller()
+    rates.observe(URL, 429, 0.1)
+    assert (rates.limit, rates.delay, rates.rate) == (2, 4.0, 0.5)
+    assert rates.rate_limiter.min_interval == 2.0
+    assert rates.decisions[-1]['action'] == 'decrease'
+
+
+def test_cooldown_ignores_throttles_from_requests_already_in_flight():
+    rates = controller(cooldown=60.0)
+    rates.observe(URL, 503, 0.1)
+    rates.observe(URL, 503, 0.1)
+    assert rates.limit == 2 and len(rates.decisions) == 1
+
+
+def test_challenge_page_and_retry_after_hold_the_host():
+    rates = controller()
+    rates.observe(URL, 200, 0.1, challenge=True, retry_after=30.0)
+    assert rates.limit == 2
+    assert rates.rate_limiter.next_slot['www.goodfirms.co'] > 0
+
+
+def test_failed_requests_never_count_as_healthy():
+    rates = controller(cooldown=0.0, error_limit=3)
+    for _ in range(2):
+        rates.observe(URL, 0, 0.01)
+    assert rates.limit == 4 and rates.healthy_streak == 0
+    rates.observe(URL, 0, 0.01)
+    assert rates.limit == 2 and rates.decisions[-1]['reason'] == '3 failed requests in a row'
+
+
+def test_a_healthy_response_resets_the_failure_streak():
+    rates = controller(cooldown=0.0, error_limit=3)
+    for status in (0, 500, 200, 0, 0):
+        rates.observe(URL, status, 0.01)
+    assert rates.limit == 4 and rates.decisions == []
+
+
+def test_latency_spike_is_a_throttle_signal():
+    rates = controller()
+    for _ in range(5):
+        rates.observe(URL, 200, 0.5)
+    for _ in range(10):
+        rates.observe(URL, 200, 10.0)
+    assert rates.decisions[-1]['action'] == 'decrease'
+    assert rates.decisions[-1]['reason'].startswith('latency')
+
+
+def test_rate_stays_within_its_bounds():
+    rates = controller(cooldown=0.0)
+    for _ in range(20):
+        rates.observe(URL, 429, 0.1)
+    assert rates.rate == rates.min_rate and rates.limit == 1 and rates.delay == 60.0
+    for _ in range(5000):  # Additive increase: one step per 2 * limit healthy responses
+        rates.observe(URL, 200, 0.1)
+    assert rates.rate == rates.max_rate == 4.0 and rates.limit == 8 and rates.delay == 0.25
+
+
+def test_fixed_controller_never_changes():
+    rates = controller(adaptive=False)
+    rates.observe(URL, 429, 0.1)
+    for _ in range(100):
+        rates.observe(URL, 200, 0.1)
+    assert (rates.limit, rates.delay, rates.rate) == (8, 2.0, 1.0)
+
+
+def test_slots_follow_the_limit():
+    async def scenario():
+        rates = controller()
+        for _ in range(4):
+            await rates.acquire()
+        assert not rates.try_acquire()
+        waiter = asyncio.ensure_future(rates.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        rates.release()
+        await asyncio.sleep(0)
+        assert waiter.done() and rates.active == 4
+
+        rates.observe(URL, 429, 0.1)  # Limit halves to 2 while 4 slots are held
+        assert rates.over_limit
+        rates.release()
+        rates.release()
+        assert not rates.over_limit and not rates.try_acquire()
+
+    asyncio.run(scenario())
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from goodfirms import EXPORT_COLUMNS, NORMALIZED_COLUMNS, export_columns, normalize_review_frame
+
+
+def frame(**columns):
+    rows = len(next(iter(columns.values())))
+    df = pd.DataFrame({column: [''] * rows for column in EXPORT_COLUMNS})
+    for column, values in columns.items():
+        df[column] = values
+    return normalize_review_frame(df)
+
+
+def test_budget_range():
+    df = frame(Budget=['$10,000 - $49,999'])
+    assert (df['Budget Min'][0], df['Budget Max'][0]) == (10000, 49999)
+
+
+def test_open_ended_budget_has_no_max():
+    df = frame(Budget=['$200,000+'])
+    assert df['Budget Min'][0] == 200000
+    assert pd.isna(df['Budget Max'][0])
+
+
+def test_single_budget_amount_is_both_bounds():
+    df = frame(Budget=['$5,000'])
+    assert (df['Budget Min'][0], df['Budget Max'][0]) == (5000, 5000)
+
+
+def test_unparseable_budget_is_missing():
+    df = frame(Budget=['Not Disclosed'])
+    assert pd.isna(df['Budget Min'][0]) and pd.isna(df['Budget Max'][0])
+
+
+def test_rating_is_float():
+    df = frame(Rating=['4.5', '', 'n/a'])
+    assert df['Rating Value'][0] == 4.5
+    assert df['Rating Value'][1:].isna().all()
+
+
+def test_mixed_start_date_formats():
+    df = frame(**{'Start Date': ['Mar 2023', 'March 2023', '03/15/2023', '3/15/23', '2021', 'soon']})
+    assert df['Start Date Value'].tolist()[:5] == [
+        pd.Timestamp('2023-03-01'), pd.Timestamp('2023-03-01'), pd.Timestamp('2023-03-15'),
+        pd.Timestamp('2023-03-15'), pd.Timestamp('2021-01-01'),
+    ]
+    assert pd.isna(df['Start Date Value'][5])
+
+
+def test_employee_size_bounds():
+    df = frame(**{'Employee Size': ['50 - 249', '1000+', '> 500', '< 10', '']})
+    assert df['Employee Size Min'].tolist() == [50, 1000, 500, 1, pd.NA]
+    assert df['Employee Size Max'].tolist() == [249, pd.NA, pd.NA, 10, pd.NA]
+
+
+def test_typed_columns_replace_raw_strings_in_exports():
+    columns = export_columns()
+    assert 'Budget' not in columns and 'Rating' not in columns
+    assert columns.index('Budget Min') == columns.index('Start Date Value') + 1
+    assert set(NORMALIZED_COLUMNS) <= set(columns)
+    assert len(columns) == len(EXPORT_COLUMNS) + len(NORMALIZED_COLUMNS) - 4
+
+
+def test_keep_raw_puts_raw_text_before_its_typed_columns():
+    columns = export_columns(keep_raw=True)
+    assert columns[columns.index('Budget'):columns.index('Budget') + 3] == ['Budget', 'Budget Min', 'Budget Max']
+    assert export_columns(normalize=False) == EXPORT_COLUMNS
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import zlib
+
+import httpx
+import pytest
+
+from goodfirms import HttpFetcher, PageCache
+
+URL = 'https://www.goodfirms.co/company/acme'
+HTML = b'<html><head><title>Acme</title></head><body><h1>Acme</h1></body></html>'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / 'cache.sqlite'), ttl_seconds=3600)
+    yield cache
+    cache.close()
+
+
+def test_cached_page_is_fresh_within_the_ttl(cache):
+    assert cache.get(URL) is None and not cache.is_fresh(URL)
+    cache.put(URL, HTML, {'Content-Type': 'text/html', 'ETag': '"v1"'})
+    entry = cache.get(URL + '/')  # Keyed by canonical URL
+    assert entry['fresh'] and entry['body'] == HTML and entry['etag'] == '"v1"'
+    assert cache.is_fresh(URL)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_page_is_revalidated_with_its_validators(cache):
+    cache.put(URL, HTML, {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+    cache.ttl_seconds = 0
+    entry = cache.get(URL)
+    assert not entry['fresh']
+    assert PageCache.conditional_headers(entry) == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT',
+    }
+    assert PageCache.conditional_headers(None) == {}
+
+
+def test_refresh_restarts_the_ttl(cache):
+    cache.put(URL, HTML, {})
+    cache.conn.execute("UPDATE pages SET fetched_at = ?", (time.time() - 7200,))
+    assert not cache.is_fresh(URL)
+    cache.refresh(URL)
+    assert cache.is_fresh(URL) and cache.revalidated == 1
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    cache = PageCache(str(tmp_path / 'cache.sqlite'), max_bytes=3 * len(zlib.compress(HTML, 6)))
+    for n in range(3):
+        cache.put(f'{URL}-{n}', HTML, {})
+    for order, n in enumerate((1, 0, 2)):  # Least recently used first
+        cache.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (order, PageCache.key(f'{URL}-{n}')))
+    cache.put(f'{URL}-3', HTML, {})  # Over the cap: evict down to 90% of it
+    assert cache.total_bytes <= cache.max_bytes * 0.9
+    assert [n for n in range(4) if cache.is_fresh(f'{URL}-{n}')] == [2, 3]
+    cache.close()
+
+
+def fetch_with(cache, handler):
+    async def run():
+        fetcher = HttpFetcher(cache=cache)
+        await fetcher.client.aclose()
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await fetcher.fetch(URL)
+        finally:
+            await fetcher.close()
+    return asyncio.run(run())
+
+
+def test_fetcher_serves_fresh_pages_without_a_request(cache):
+    cache.put(URL, HTML, {})
+    requests = []
+    response = fetch_with(cache, lambda request: requests.append(request) or httpx.Response(500))
+    assert response['cached'] and response['status'] == 200 and requests == []
+
+
+def test_fetcher_uses_the_cached_body_on_304(cache):
+    cache.put(URL, HTML, {'ETag': '"v1"'})
+    cache.ttl_seconds = 0
+    seen = {}
+
+    def handler(request):
+        seen['if-none-match'] = request.headers.get('if-none-match')
+        return httpx.Response(304)
+
+    response = fetch_with(cache, handler)
+    assert seen['if-none-match'] == '"v1"'
+    assert response['cached'] and response['html'] == HTML.decode()
+    assert cache.revalidated == 1
+
+
+def test_fetcher_caches_only_successful_pages(cache):
+    fetch_with(cache, lambda request: httpx.Response(429, text='slow down'))
+    assert cache.get(URL) is None
+    response = fetch_with(cache, lambda request: httpx.Response(200, content=HTML, headers={'ETag': '"v2"'}))
+    assert not response['cached'] and cache.get(URL)['etag'] == '"v2"'
@@ -0,0 +1,38 @@
+from goodfirms import is_complete_company_data, parse_company_html
+
+
+def reviewers(body):
+    html = f'<html><body><h1>Acme</h1>{body}</body></html>'
+    return [review['reviewerName'] for review in parse_company_html(html, 'https://x/company/acme')['reviews']]
+
+
+def test_wrapper_of_cards_yields_each_card_once():
+    assert reviewers('''
+        <div class="reviews-list">
+          <div class="review-card"><h3>Jane Doe</h3><p>Great work on our app, very happy indeed.</p></div>
+          <div class="review-card"><h3>Bob Roe</h3><p>Solid delivery and communication throughout.</p></div>
+        </div>
+    ''') == ['Jane Doe', 'Bob Roe']
+
+
+def test_wrapper_without_inner_cards_is_one_card():
+    assert reviewers('''
+        <div class="testimonials">
+          <h4>Ann Lee</h4><p>They shipped on time and on budget, thanks.</p>
+          <h4>Tom Kay</h4><p>Would work with them again on the next project.</p>
+        </div>
+    ''') == ['Ann Lee']
+
+
+def test_candidate_without_reviewer_is_skipped():
+    assert reviewers('<div class="review-summary"><p>4.8 average from 12 reviews</p></div>') == []
+
+
+def test_profile_that_says_it_has_no_reviews_is_complete():
+    html = '<html><body><h1>Acme</h1><h2>0 Reviews</h2></body></html>'
+    assert is_complete_company_data(parse_company_html(html, 'https://x/company/acme'))
+
+
+def test_profile_without_reviews_or_a_count_needs_the_browser():
+    html = '<html><body><h1>Acme</h1></body></html>'
+    assert not is_complete_company_data(parse_company_html(html, 'https://x/company/acme'))
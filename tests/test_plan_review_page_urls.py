@@ -0,0 +1,51 @@
+from goodfirms import plan_review_page_urls
+
+
+def company(url='https://www.goodfirms.co/company/acme', links=(), reviews=10, review_count=None):
+    return {
+        'companyUrl': url,
+        'reviewPageUrls': list(links),
+        'reviews': [{}] * reviews,
+        'reviewCount': review_count,
+    }
+
+
+def test_no_pagination_links_means_no_extra_pages():
+    assert plan_review_page_urls(company()) == []
+
+
+def test_visible_pagination_links_in_page_order():
+    links = ['https://www.goodfirms.co/company/acme?page=3', 'https://www.goodfirms.co/company/acme?page=2']
+    assert plan_review_page_urls(company(links=links)) == [
+        'https://www.goodfirms.co/company/acme?page=2',
+        'https://www.goodfirms.co/company/acme?page=3',
+    ]
+
+
+def test_pages_beyond_visible_links_follow_review_count():
+    links = ['https://www.goodfirms.co/company/acme?page=2']
+    assert plan_review_page_urls(company(links=links, reviews=10, review_count=35)) == [
+        'https://www.goodfirms.co/company/acme?page=2',
+        'https://www.goodfirms.co/company/acme?page=3',
+        'https://www.goodfirms.co/company/acme?page=4',
+    ]
+
+
+def test_max_pages_caps_the_plan():
+    links = ['https://www.goodfirms.co/company/acme?page=2']
+    assert len(plan_review_page_urls(company(links=links, review_count=1000), max_pages=5)) == 4
+
+
+def test_company_with_shared_slug_prefix_is_not_matched():
+    links = ['https://www.goodfirms.co/company/acme-two?page=2', 'https://www.goodfirms.co/company/acme-two?page=3']
+    assert plan_review_page_urls(company(links=links)) == []
+
+
+def test_sub_paths_of_the_company_are_matched():
+    links = ['https://www.goodfirms.co/company/acme/reviews?page=2']
+    assert plan_review_page_urls(company(links=links)) == ['https://www.goodfirms.co/company/acme/reviews?page=2']
+
+
+def test_site_wide_listing_pagination_is_ignored():
+    links = ['https://www.goodfirms.co/artificial-intelligence/usa?page=2']
+    assert plan_review_page_urls(company(links=links)) == []
@@ -0,0 +1,100 @@
+import pytest
+
+for module in ('gspread', 'pyperclip', 'selenium'):
+    pytest.importorskip(module)
+
+from mainlinkedinscraper import ProfileStateStore, SheetSync, relative_date_to_timestamp
+
+HEADER = ['First Name', 'Last Name', 'Linkedin Url', 'Post Content', 'Post URL', 'Relative Date']
+POST = {'content': 'Hello world', 'url': 'https://www.linkedin.com/feed/update/1', 'relative_date': '2d'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProfileStateStore(str(tmp_path / 'profiles.sqlite'))
+    yield store
+    store.close()
+
+
+class FakeSheet:
+    def __init__(self, rows):
+        self.values = [HEADER] + rows
+
+    def get_all_values(self):
+        return self.values
+
+
+def pending_urls(store, rows, refresh_all=False, ttl=3600):
+    sync = SheetSync(FakeSheet(rows))
+    sync.read()
+    records = sync.pending(refresh_all,
+                           is_fresh=lambda url: store.is_fresh(url, ttl),
+                           is_stale=lambda url: store.is_stale(url, ttl))
+    return [record['Linkedin Url'] for record in records], sync.skipped_fresh
+
+
+@pytest.mark.parametrize('relative_date, seconds_ago', [
+    ('5m', 5 * 60), ('3h', 3 * 3600), ('2d', 2 * 86400), ('1w', 7 * 86400),
+    ('2mo', 60 * 86400), ('1yr', 365 * 86400), ('Just now', 0),
+])
+def test_relative_dates(relative_date, seconds_ago):
+    assert relative_date_to_timestamp(relative_date, 1_000_000_000) == 1_000_000_000 - seconds_ago
+
+
+@pytest.mark.parametrize('relative_date', ['', None, 'No date found', 'Error', '3 fortnights'])
+def test_unparseable_relative_dates(relative_date):
+    assert relative_date_to_timestamp(relative_date, 1_000_000_000) is None
+
+
+def test_record_reports_a_changed_post(store):
+    assert store.record('https://www.linkedin.com/in/jane/', POST)
+    assert not store.record('linkedin.com/in/jane', POST)  # Same profile, same post
+    assert store.record('linkedin.com/in/jane', dict(POST, content='Something new'))
+
+
+def test_checked_profile_is_fresh_until_the_ttl_passes(store):
+    url = 'https://www.linkedin.com/in/jane'
+    assert not store.is_fresh(url, 3600) and not store.is_stale(url, 3600)
+    store.record(url, POST)
+    assert store.is_fresh(url, 3600) and not store.is_stale(url, 3600)
+    assert store.is_stale(url, 0) and not store.is_fresh(url, 0)
+
+
+def test_failed_check_keeps_the_last_post_and_is_not_fresh(store):
+    url = 'https://www.linkedin.com/in/jane'
+    store.record(url, POST)
+    assert not store.record(url, {'content': 'Error: timed out'})
+    state = store.get(url)
+    assert state['outcome'] == 'error' and state['post_url'] == POST['url']
+    assert store.age(url) is None and not store.is_fresh(url, 3600)
+
+
+def test_pending_picks_rows_that_need_work_once_per_profile(store):
+    urls, skipped = pending_urls(store, [
+        ['a', 'b', 'https://www.linkedin.com/in/empty', '', '', ''],
+        ['a', 'b', 'https://linkedin.com/in/empty/', '', '', ''],
+        ['c', 'd', 'https://www.linkedin.com/in/failed', 'Error: timeout', '', 'Error'],
+        ['e', 'f', 'https://www.linkedin.com/in/filled', 'Post', 'url', '1d'],
+        ['g', 'h', '', '', '', ''],
+    ])
+    assert urls == ['https://www.linkedin.com/in/empty', 'https://www.linkedin.com/in/failed']
+    assert skipped == 0
+
+
+def test_pending_skips_profiles_checked_within_the_ttl_even_if_their_row_needs_work(store):
+    store.record('https://www.linkedin.com/in/recent', POST)
+    urls, skipped = pending_urls(store, [['a', 'b', 'https://www.linkedin.com/in/recent', '', '', '']])
+    assert urls == [] and skipped == 1
+
+
+def test_pending_rechecks_filled_rows_once_the_ttl_has_passed(store):
+    store.record('https://www.linkedin.com/in/filled', POST)
+    urls, _ = pending_urls(store, [['e', 'f', 'https://www.linkedin.com/in/filled', 'Post', 'url', '1d']], ttl=0)
+    assert urls == ['https://www.linkedin.com/in/filled']
+
+
+def test_refresh_all_ignores_the_ttl(store):
+    store.record('https://www.linkedin.com/in/recent', POST)
+    urls, skipped = pending_urls(store, [['a', 'b', 'https://www.linkedin.com/in/recent', 'Post', 'url', '1d']],
+                                 refresh_all=True)
+    assert urls == ['https://www.linkedin.com/in/recent'] and skipped == 0
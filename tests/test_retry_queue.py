@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from goodfirms import ChallengePageError, HumanLikeGoodFirmsScraper, PageStatusError, RetryQueue
+
+
+def test_permanent_statuses_are_not_retried():
+    queue = RetryQueue(max_attempts=4)
+    queue.record('https://x/company/gone', PageStatusError(404), 1)
+    queue.record('https://x/company/busy', PageStatusError(429), 2)
+    queue.record('https://x/company/blocked', ChallengePageError('challenge page'), 3)
+    queue.record('https://x/company/slow', TimeoutError('timed out'), 4)
+    assert [entry['url'] for entry in queue.retryable()] == [
+        'https://x/company/busy', 'https://x/company/blocked', 'https://x/company/slow',
+    ]
+    assert [entry['url'] for entry in queue.failures()][0] == 'https://x/company/gone'
+
+
+def test_attempts_are_counted_per_canonical_url_up_to_the_limit():
+    queue = RetryQueue(max_attempts=2)
+    queue.record('https://x/company/slow/', TimeoutError('timed out'), 1)
+    assert len(queue.retryable()) == 1
+    queue.record('https://X/company/slow', TimeoutError('timed out again'), 1)
+    assert len(queue) == 1
+    entry = queue.failures()[0]
+    assert entry['attempts'] == 2 and len(entry['errors']) == 2
+    assert queue.retryable() == []
+
+
+def test_resolved_companies_leave_the_queue():
+    queue = RetryQueue()
+    queue.record('https://x/company/a', TimeoutError('timed out'), 1)
+    queue.resolve('https://x/company/a/')
+    assert len(queue) == 0 and queue.recovered == ['https://x/company/a/']
+
+
+def test_dead_letter_file(tmp_path):
+    queue = RetryQueue()
+    queue.record('https://x/company/gone', PageStatusError(410), 1)
+    queue.record('https://x/company/busy', PageStatusError(503), 2)
+    path = tmp_path / 'failed.json'
+    queue.write(str(path), listing_pages=[{'url': 'https://x/list?page=3'}])
+    report = json.loads(path.read_text())
+    assert [entry['error'] for entry in report['failed']] == ['PageStatusError', 'PageStatusError']
+    assert report['failed'][0]['permanent'] and not report['failed'][1]['permanent']
+    assert report['failed_listing_pages'] == [{'url': 'https://x/list?page=3'}]
+    assert queue.by_error() == {'PageStatusError': 2}
+
+
+@pytest.mark.parametrize('attempts', [1, 2, 3, 4])
+def test_backoff_is_equal_jitter(attempts):
+    scraper = HumanLikeGoodFirmsScraper('https://x', retry_base_delay=4.0)
+    backoff = 4.0 * 2 ** (attempts - 1)
+    delays = [scraper.retry_backoff(attempts) for _ in range(200)]
+    assert all(backoff / 2 <= delay <= backoff for delay in delays)
+    assert max(delays) - min(delays) > backoff / 10  # Jittered, not a fixed delay
+
+
+def test_drain_retries_transient_failures_and_skips_permanent_ones():
+    scraper = HumanLikeGoodFirmsScraper('https://x', retry_base_delay=0.0, max_retries=3)
+    calls = []
+
+    async def new_page(context):
+        return object()
+
+    async def close_page(page):
+        pass
+
+    async def throttle(url):
+        pass
+
+    async def extract(page, url, index, total):
+        calls.append(url)
+        if len([call for call in calls if call == url]) < 2:
+            scraper.retry_queue.record(url, TimeoutError('timed out'), index)
+            return None
+        return {'companyUrl': url, 'reviews': []}
+
+    scraper.new_page, scraper.close_page, scraper.throttle = new_page, close_page, throttle
+    scraper.extract_company_details = extract
+    merged = []
+    scraper.merge_company_data = lambda company_data: merged.append(company_data['companyUrl'])
+    scraper.retry_queue.record('https://x/company/slow', TimeoutError('timed out'), 1)
+    scraper.retry_queue.record('https://x/company/gone', PageStatusError(404), 2)
+
+    assert asyncio.run(scraper.drain_retry_queue(None)) == 1
+    assert calls == ['https://x/company/slow', 'https://x/company/slow']
+    assert merged == ['https://x/company/slow']
+    assert [entry['url'] for entry in scraper.retry_queue.failures()] == ['https://x/company/gone']
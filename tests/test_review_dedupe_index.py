@@ -0,0 +1,66 @@
+from goodfirms import ReviewDedupeIndex, simhash64
+
+REVIEW = 'They rebuilt our data pipeline in six weeks and cut our cloud bill by a third.'
+
+
+def test_same_review_is_a_duplicate_despite_case_and_whitespace():
+    index = ReviewDedupeIndex()
+    assert not index.check_and_add('Acme', 'Jane Doe', REVIEW)
+    assert index.check_and_add('ACME ', 'jane  doe', REVIEW.upper())
+    assert not index.check_and_add('Other Co', 'Jane Doe', REVIEW)
+    assert not index.persistent
+    index.close()
+
+
+def test_committed_reviews_are_remembered_across_runs(tmp_path):
+    path = str(tmp_path / 'reviews.sqlite')
+    first = ReviewDedupeIndex(path)
+    assert first.persistent
+    first.check_and_add('Acme', 'Jane Doe', REVIEW)
+    first.commit()
+    first.close()
+
+    second = ReviewDedupeIndex(path)
+    assert second.check_and_add('Acme', 'Jane Doe', REVIEW)
+    assert not second.check_and_add('Acme', 'Bob Roe', REVIEW)
+    second.close()
+
+
+def test_reviews_not_committed_are_seen_again_by_the_next_run(tmp_path):
+    path = str(tmp_path / 'reviews.sqlite')
+    crashed = ReviewDedupeIndex(path)
+    crashed.check_and_add('Acme', 'Jane Doe', REVIEW)
+    assert crashed.check_and_add('Acme', 'Jane Doe', REVIEW)  # Still a duplicate within the run
+    crashed.close()  # e.g. the export failed: nothing was committed
+
+    rerun = ReviewDedupeIndex(path)
+    assert not rerun.check_and_add('Acme', 'Jane Doe', REVIEW)
+    rerun.close()
+
+
+def test_simhash_of_a_small_edit_is_close():
+    edited = REVIEW.replace('six', '6')
+    unrelated = 'Communication was slow and the project ran three months over schedule.'
+    assert bin(simhash64(REVIEW) ^ simhash64(edited)).count('1') <= 12
+    assert bin(simhash64(REVIEW) ^ simhash64(unrelated)).count('1') > 12
+
+
+def test_near_duplicates_only_when_enabled(tmp_path):
+    edited = REVIEW.replace('cut our', 'cut the')
+    exact = ReviewDedupeIndex()
+    exact.check_and_add('Acme', 'Jane Doe', REVIEW)
+    assert not exact.check_and_add('Acme', 'J. Doe', edited)
+    exact.close()
+
+    path = str(tmp_path / 'reviews.sqlite')
+    near = ReviewDedupeIndex(path, near_duplicates=True)
+    near.check_and_add('Acme', 'Jane Doe', REVIEW)
+    assert near.check_and_add('Acme', 'J. Doe', edited)  # Staged in this run
+    assert not near.check_and_add('Other Co', 'J. Doe', edited)  # Near duplicates are per company
+    assert near.near_duplicate_count == 1
+    near.commit()
+    near.close()
+
+    reopened = ReviewDedupeIndex(path, near_duplicates=True)
+    assert reopened.check_and_add('Acme', 'Someone', edited)  # Persisted SimHash bands
+    reopened.close()
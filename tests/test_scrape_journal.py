@@ -0,0 +1,40 @@
+from goodfirms import ScrapeJournal
+
+ROWS = [{'Company Name': 'Acme', 'Review Content': 'Great team'}]
+
+
+def test_resume_reads_back_finished_companies(tmp_path):
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    assert journal.load() == {}
+    journal.open(resume=False)
+    journal.record('https://www.goodfirms.co/company/acme/', ROWS)
+    journal.close()
+
+    resumed = ScrapeJournal(journal.path)
+    resumed.open(resume=True)
+    resumed.record('https://www.goodfirms.co/company/other', [])
+    resumed.close()
+    assert resumed.load() == {
+        'https://www.goodfirms.co/company/acme': ROWS,
+        'https://www.goodfirms.co/company/other': [],
+    }
+
+
+def test_line_torn_by_a_crash_is_ignored(tmp_path):
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    journal.open(resume=False)
+    journal.record('https://www.goodfirms.co/company/acme', ROWS)
+    journal.file.write('{"url": "https://www.goodfirms.co/company/half", "ro')
+    journal.close()
+    assert list(journal.load()) == ['https://www.goodfirms.co/company/acme']
+
+
+def test_fresh_run_starts_a_new_journal(tmp_path):
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    journal.open(resume=False)
+    journal.record('https://www.goodfirms.co/company/acme', ROWS)
+    journal.close()
+
+    journal.open(resume=False)
+    journal.close()
+    assert journal.load() == {}
@@ -0,0 +1,114 @@
+import pytest
+
+for module in ('gspread', 'pyperclip', 'selenium'):
+    pytest.importorskip(module)
+
+from mainlinkedinscraper import SheetSync, SheetWriteBehind
+
+
+class FakeSheet:
+    def __init__(self, values=None, fail=0):
+        self.values = values or []
+        self.fail = fail
+        self.batches = []
+
+    def get_all_values(self):
+        return self.values
+
+    def col_values(self, column):
+        return [row[column - 1] if len(row) >= column else '' for row in self.values]
+
+    def batch_update(self, data):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError('429 quota exceeded')
+        self.batches.append(data)
+
+
+@pytest.fixture
+def writers():
+    made = []
+
+    def make(sheet, **options):
+        # Nothing flushes on its own during a test: flush() and close() are called explicitly
+        writer = SheetWriteBehind(sheet, batch_rows=100, flush_seconds=3600, **options)
+        made.append(writer)
+        return writer
+
+    yield make
+    for writer in made:
+        writer.close(retries=1)
+
+
+def test_updates_to_one_row_are_coalesced_into_one_batch(writers):
+    sheet = FakeSheet()
+    writer = writers(sheet)
+    writer.put(3, ['b', 'u', '2d'])
+    writer.put(2, ['a', 'u', '1d'])
+    writer.put(2, ['a2', 'u', '1d'])
+    assert writer.flush() == 2
+    assert sheet.batches == [[
+        {'range': 'D2:F2', 'values': [['a2', 'u', '1d']]},
+        {'range': 'D3:F3', 'values': [['b', 'u', '2d']]},
+    ]]
+    assert (writer.api_calls, writer.rows_written) == (1, 2)
+
+
+def test_nothing_pending_makes_no_request(writers):
+    sheet = FakeSheet()
+    writer = writers(sheet)
+    assert writer.flush() == 0
+    assert sheet.batches == [] and writer.api_calls == 0
+
+
+def test_failed_write_keeps_rows_queued_without_overwriting_newer_values(writers):
+    sheet = FakeSheet(fail=1)
+    writer = writers(sheet)
+    writer.put(2, ['old', 'u', '1d'])
+    original_locate = writer.locate
+
+    def locate_then_update(keys):
+        writer.put(2, ['new', 'u', '1d'])  # Queued while the failing batch is in flight
+        return {key: [key] for key in keys}
+
+    writer.locate = locate_then_update
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    writer.locate = original_locate
+    assert writer.api_calls == 0
+    assert writer.flush() == 1
+    assert sheet.batches == [[{'range': 'D2:F2', 'values': [['new', 'u', '1d']]}]]
+
+
+def test_profile_keys_are_located_again_before_writing(writers):
+    header = ['First Name', 'Last Name', 'Linkedin Url', 'Post Content', 'Post URL', 'Relative Date']
+    sheet = FakeSheet([header, ['a', 'b', 'https://www.linkedin.com/in/jane/', '', '', '']])
+    sync = SheetSync(sheet)
+    sync.read()
+    written = []
+    writer = writers(sheet, locate=sync.locate, on_written=written.extend)
+    writer.put('linkedin.com/in/jane', ['post', 'url', '1d'])
+    sheet.values.insert(1, ['x', 'y', 'https://www.linkedin.com/in/new-row', '', '', ''])  # Row added above
+    writer.flush()
+    assert sheet.batches == [[{'range': 'D3:F3', 'values': [['post', 'url', '1d']]}]]
+    assert written == ['linkedin.com/in/jane']
+
+
+def test_rows_gone_from_the_sheet_are_dropped_without_a_request(writers):
+    header = ['First Name', 'Last Name', 'Linkedin Url', 'Post Content', 'Post URL', 'Relative Date']
+    sheet = FakeSheet([header])
+    sync = SheetSync(sheet)
+    sync.read()
+    written = []
+    writer = writers(sheet, locate=sync.locate, on_written=written.extend)
+    writer.put('linkedin.com/in/gone', ['post', 'url', '1d'])
+    assert writer.flush() == 0
+    assert sheet.batches == [] and writer.api_calls == 0 and written == []
+
+
+def test_close_writes_what_is_left(writers):
+    sheet = FakeSheet()
+    writer = writers(sheet)
+    writer.put(5, ['e', 'u', '3d'])
+    assert writer.close(retries=1)
+    assert sheet.batches == [[{'range': 'D5:F5', 'values': [['e', 'u', '3d']]}]]